@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin, GroupAdmin
 from django.contrib.auth.models import User, Group
+from django.db.models import QuerySet
+from django.http import HttpRequest
 from treebeard.admin import TreeAdmin
 from treebeard.forms import movenodeform_factory
 
+from .display_names import asset_lookups, node_lookups, prefix_lookups
 from .models import (
     Asset,
     AssetCode,
@@ -25,6 +28,11 @@ class AssetEventAdmin(admin.ModelAdmin):
     list_display = ["asset", "changeset"]
     list_filter = ["changeset__user"]
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[AssetEvent]:
+        return super().get_queryset(request).select_related("changeset__user").prefetch_related(
+            "asset", *prefix_lookups("asset", asset_lookups()),
+        )
+
 
 class ChangeSetAdmin(admin.ModelAdmin):
     list_display = ["timestamp", "user", "comment"]
@@ -36,6 +44,9 @@ class AssetAdmin(admin.ModelAdmin):
     list_display = ["__str__", "asset_model", "node"]
     list_filter = ["asset_model"]
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Asset]:
+        return super().get_queryset(request).prefetch_related(*asset_lookups())
+
 
 class AssetModelAdmin(admin.ModelAdmin):
     list_display = ["name", "slug", "manufacturer", "is_container"]
@@ -54,6 +65,9 @@ class NodeAdmin(TreeAdmin):
     list_display = ["display_name", "node_type", "asset"]
     list_filter = ["node_type"]
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Node]:
+        return super().get_queryset(request).prefetch_related(*node_lookups())
+
 
 class PyInvAdminSite(admin.AdminSite):
     site_header = 'PyInv Administration'
@@ -9,8 +9,15 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 
 
+class AssetCodeSpaceExhausted(ValueError):
+    """There are not enough unused asset codes left to allocate."""
+
+
 class AssetCodeStrategy(ABC):
 
+    # Number of distinct codes that can be allocated for each prefix, if the strategy can allocate codes.
+    code_space = 0
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -24,6 +31,37 @@ class AssetCodeStrategy(ABC):
         """
         return None  # pragma: nocover
 
+    @property
+    def default_prefix(self) -> str:
+        """Prefix of allocated asset codes, unless another is requested."""
+        return ""
+
+    def validate_prefix(self, prefix: str) -> None:
+        """
+        Validate a prefix for allocated asset codes.
+        :param prefix: Prefix to validate.
+        :raises django.core.exceptions.ValidationError: The prefix was invalid.
+        """
+
+    def code_at(self, prefix: str, position: int) -> str:
+        """
+        Get the asset code at a position in the allocation order of a prefix.
+
+        Each position in range(code_space) gives a different code.
+        :param prefix: Prefix of the asset code.
+        :param position: Position in the allocation order.
+        :returns: The asset code.
+        """
+        raise NotImplementedError  # pragma: nocover
+
+    def normalise(self, asset_code: str) -> str:
+        """
+        Normalise an asset code, so that variations of the same code are equal.
+        :param asset_code: Asset Code to normalise.
+        :returns: The normalised asset code.
+        """
+        return asset_code.strip()
+
     @abstractmethod
     def validate(self, asset_code: str) -> None:
         """
@@ -54,6 +92,11 @@ class Damm32AssetCodeStrategy(AssetCodeStrategy):
 
     ASSET_CODE_REGEX = compile(r"^([A-Za-z0-9]{3})-([A-Za-z0-9]{3})-([A-Za-z0-9]{3})$")
 
+    # Five characters of 32 symbols between the prefix and the check digit
+    PAYLOAD_LENGTH = 5
+    PAYLOAD_BITS = 25
+    code_space = 2 ** PAYLOAD_BITS
+
     def __init__(self) -> None:
         self._d32 = Damm32()
         self._alphabet = self._d32._alphabet
@@ -70,6 +113,53 @@ class Damm32AssetCodeStrategy(AssetCodeStrategy):
 
         return f"{code[:3]}-{code[3:6]}-{code[6:9]}"
 
+    @property
+    def default_prefix(self) -> str:
+        return self._default_prefix
+
+    def validate_prefix(self, prefix: str) -> None:
+        if prefix not in self._allowed_prefixes:
+            raise ValidationError(f"Invalid asset code prefix: {prefix}")
+
+    def code_at(self, prefix: str, position: int) -> str:
+        """
+        Get the asset code at a position in the allocation order of a prefix.
+
+        Positions are scrambled by a bijection on the payload space, so that
+        consecutively allocated codes do not differ only in the last character.
+        :param prefix: Prefix of the asset code.
+        :param position: Position in the allocation order.
+        :returns: The asset code.
+        """
+        value = self._permute(position)
+        payload = ""
+        for _ in range(self.PAYLOAD_LENGTH):
+            value, digit = divmod(value, len(self._alphabet))
+            payload += self._alphabet[digit]
+        code = prefix + payload
+        code += self._d32.calculate(code)
+
+        return f"{code[:3]}-{code[3:6]}-{code[6:9]}"
+
+    def _permute(self, value: int) -> int:
+        # Multiplying by an odd number, adding, and xor with a right shift are
+        # each invertible modulo a power of two, so the composition is a permutation.
+        mask = self.code_space - 1
+        for multiplier, increment in ((0x1B873593, 0x2F0D9A7), (0x0CC9E2D5, 0x11D3A4B)):
+            value = (value * multiplier + increment) & mask
+            value ^= value >> 13
+        return value
+
+    def normalise(self, asset_code: str) -> str:
+        """
+        Normalise an asset code, so that variations of the same code are equal.
+
+        The check digit is case insensitive, and scanners may omit the separators.
+        :param asset_code: Asset Code to normalise.
+        :returns: The normalised asset code.
+        """
+        return "".join(asset_code.split()).replace("-", "").upper()
+
     def validate(self, asset_code: str) -> None:
         """
         Validate an asset code.
@@ -165,6 +255,9 @@ class AssetCodeType(str, Enum):
     def get_strategy(self) -> AssetCodeStrategy:
         return self.strategy_mapping()[self]
 
+    def normalise(self, asset_code: str) -> str:
+        return self.get_strategy().normalise(asset_code)
+
 
 ASSET_CODE_TYPE_CHOICES: List[Tuple[str, str]] = [
     (key.value, code_type.name)
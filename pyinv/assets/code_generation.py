@@ -0,0 +1,61 @@
+"""Generation of asset codes in bulk, for printing labels."""
+
+from typing import List, Optional, Sequence
+
+from django.db import transaction
+
+from assets import code_resolution, fuzzy, search
+from assets.asset_codes import AssetCodeType
+from assets.models import Asset, AssetCode, AssetCodeSequence, InventoryVersion
+
+
+def reserve_codes(code_type: AssetCodeType, count: int, *, prefix: Optional[str] = None) -> List[str]:
+    """
+    Reserve unused asset codes without assigning them to assets.
+
+    Reserved codes are never generated again, so they can be printed on labels
+    and added to assets later.
+
+    :raises ValueError: Unable to generate codes of that type, or the prefix is not valid.
+    :raises assets.asset_codes.AssetCodeSpaceExhausted: Not enough unused codes remain.
+    """
+    strategy = code_type.get_strategy()
+    codes = AssetCodeSequence.allocate(code_type, count, prefix=prefix)
+    for code in codes:
+        strategy.validate(code)
+    return codes
+
+
+def assign_new_codes(
+    code_type: AssetCodeType,
+    assets: Sequence[Asset],
+    *,
+    prefix: Optional[str] = None,
+) -> List[AssetCode]:
+    """
+    Generate a new asset code for each asset, in a single transaction.
+
+    :raises ValueError: Unable to generate codes of that type, or the prefix is not valid.
+    :raises assets.asset_codes.AssetCodeSpaceExhausted: Not enough unused codes remain.
+    """
+    with transaction.atomic():
+        codes = reserve_codes(code_type, len(assets), prefix=prefix)
+        asset_codes = AssetCode.objects.bulk_create(
+            [
+                AssetCode(
+                    asset=asset,
+                    code=code,
+                    normalised_code=code_type.normalise(code),
+                    code_type=code_type.value,
+                )
+                for asset, code in zip(assets, codes)
+            ],
+            batch_size=500,
+        )
+
+        # Signals are not sent for bulk creation.
+        search.refresh_assets(Asset.objects.filter(pk__in=[asset.pk for asset in assets]))
+        InventoryVersion.bump()
+        transaction.on_commit(fuzzy.clear_indexes)
+        transaction.on_commit(code_resolution.cache.clear)
+    return asset_codes
@@ -0,0 +1,178 @@
+"""
+Resolution of scanned asset codes to assets.
+
+Codes are compared after normalisation by the strategy of each code type, so a
+scanned code matches however its case or separators were read, where the code
+type allows. Asset IDs are also accepted as codes.
+
+The rendered asset for each scanned code and selection of fields is kept in a
+bounded LRU cache. The cache is local to each process, and is cleared by the
+signal handlers in assets.signals when any data that it contains changes. The
+cache records the InventoryVersion it was filled at, and is cleared when the
+current version differs, so changes made by other processes are also seen.
+"""
+
+from collections import OrderedDict, defaultdict
+from threading import Lock
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import Q
+
+from assets.asset_codes import AssetCodeType
+from assets.models import Asset, AssetCode, InventoryVersion
+from assets.serializers import AssetWithNodeSerializer
+from assets.serializers.sparse import (
+    ALL_FIELDS,
+    SELECTION_CONTEXT_KEY,
+    FieldSelection,
+)
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    """A thread safe mapping that discards the least recently used items beyond its maximum size."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[K, V]' = OrderedDict()
+        self._lock = Lock()
+        # The version of the inventory that the cached values were read at.
+        self.version: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_many(self, keys: Sequence[K]) -> Dict[K, V]:
+        """Get the cached values of those keys that are in the cache."""
+        with self._lock:
+            found = {}
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = self._data[key]
+            return found
+
+    def set_many(self, items: Dict[K, V], version: Optional[int] = None) -> None:
+        """
+        Cache values, discarding the least recently used beyond the maximum size.
+
+        :param version: The version of the inventory that the values were read at.
+            They are not cached if the cache has since been checked against another version.
+        """
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            for key, value in items.items():
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def check(self, version: int) -> None:
+        """Clear the cache if its values were read at another version of the inventory."""
+        with self._lock:
+            if version != self.version:
+                self._data.clear()
+                self.version = version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.version = None
+
+
+# Rendered assets by code and selection, or None for codes with no asset.
+cache: LRUCache[Tuple[str, FieldSelection], Optional[Dict[str, Any]]] = LRUCache(settings.ASSET_CODE_CACHE_SIZE)
+
+
+def find_assets(codes: Sequence[str]) -> Dict[str, Asset]:
+    """
+    Find the assets with each of the codes, in at most two indexed queries.
+
+    A code that matches exactly is preferred over one that only matches once normalised.
+
+    :returns: The asset for each code that was found.
+    """
+    normalised = {
+        code_type: {code: code_type.normalise(code) for code in codes}
+        for code_type in AssetCodeType
+    }
+    condition = Q()
+    for code_type, normalised_codes in normalised.items():
+        condition |= Q(code_type=code_type.value, normalised_code__in=set(normalised_codes.values()))
+    asset_codes = defaultdict(list)
+    for asset_code in AssetCode.objects.filter(condition).select_related('asset'):
+        asset_codes[asset_code.code_type, asset_code.normalised_code].append(asset_code)
+
+    found: Dict[str, Asset] = {}
+    for code in codes:
+        matches = [
+            asset_code
+            for code_type, normalised_codes in normalised.items()
+            for asset_code in asset_codes[code_type.value, normalised_codes[code]]
+        ]
+        exact = [asset_code for asset_code in matches if asset_code.code == code]
+        if matches:
+            found[code] = (exact or matches)[0].asset
+
+    ids = {}
+    for code in codes:
+        if code not in found:
+            try:
+                ids[code] = UUID(code)
+            except ValueError:
+                pass
+    if ids:
+        assets = Asset.objects.in_bulk(set(ids.values()))
+        found.update({code: assets[id_] for code, id_ in ids.items() if id_ in assets})
+    return found
+
+
+def resolve_codes(
+    codes: Sequence[str],
+    selection: FieldSelection = ALL_FIELDS,
+    version: Optional[int] = None,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Resolve scanned codes to rendered assets, using the cache where possible.
+
+    :param selection: The fields of the assets to render, and the nested objects to expand.
+    :param version: The current version of the inventory, if it has already been read.
+    :raises rest_framework.exceptions.ValidationError: The selection names a field that does not exist.
+    :returns: The rendered asset for each code, or None if no asset has that code.
+    """
+    # The selection is checked even if every code is cached.
+    AssetWithNodeSerializer().select(selection)
+
+    if version is None:
+        version = InventoryVersion.current()
+    cache.check(version)
+
+    codes = [code.strip() for code in codes]
+    resolved = {code: data for (code, _), data in cache.get_many([(code, selection) for code in codes]).items()}
+
+    missing = [code for code in dict.fromkeys(codes) if code not in resolved]
+    if missing:
+        found = find_assets(missing)
+        assets: List[Asset] = list({asset.pk: asset for asset in found.values()}.values())
+        serializer = AssetWithNodeSerializer(assets, many=True, context={SELECTION_CONTEXT_KEY: selection})
+        rendered = {asset.pk: data for asset, data in zip(assets, serializer.data)}
+        results = {code: rendered[found[code].pk] if code in found else None for code in missing}
+        cache.set_many({(code, selection): data for code, data in results.items()}, version)
+        resolved.update(results)
+
+    return {code: resolved[code] for code in codes}
@@ -0,0 +1,42 @@
+"""
+Batch resolution of display names.
+
+The display name of an asset depends on its node, its first asset code and on
+the stored display name of its asset model. Resolving these one object at a
+time costs several queries per object, so the lookups
+here let the display names of a whole queryset or page be resolved in a
+constant number of queries, either with ``QuerySet.prefetch_related`` or with
+``prefetch_related_objects`` on an already fetched page.
+"""
+
+from copy import copy
+from typing import Iterable, List, Union
+
+from django.db.models import Prefetch
+from django.db.models.constants import LOOKUP_SEP
+
+Lookup = Union[str, Prefetch]
+
+
+def prefix_lookups(prefix: str, lookups: Iterable[Lookup]) -> List[Lookup]:
+    """Make prefetch lookups relative to a related object."""
+    prefixed: List[Lookup] = []
+    for lookup in lookups:
+        if isinstance(lookup, Prefetch):
+            lookup = copy(lookup)
+            lookup.add_prefix(prefix)
+            prefixed.append(lookup)
+        else:
+            prefixed.append(f"{prefix}{LOOKUP_SEP}{lookup}")
+    return prefixed
+
+
+def asset_lookups() -> List[Lookup]:
+    """Lookups to resolve the display names of assets."""
+    return ['node', 'assetcode_set', 'asset_model']
+
+
+def node_lookups() -> List[Lookup]:
+    """Lookups to resolve the display names of nodes."""
+    lookups: List[Lookup] = ['asset']
+    return lookups + prefix_lookups('asset', asset_lookups())
@@ -0,0 +1,76 @@
+"""
+Conditional requests, using the version of the inventory.
+
+Every change to the inventory increases InventoryVersion, so a response to
+a GET request is the same for as long as the version stays the same. The
+ETag of a response is derived from the version and the request, and a
+request with a matching If-None-Match header is answered with 304 Not
+Modified after only reading the version, without running the view.
+
+The signal handlers in assets.signals increase the version when models are
+saved or deleted, and code that changes the inventory in bulk must call
+InventoryVersion.bump in the same transaction.
+
+The reference version is read in the same query, and passed on to the
+reference data cache so that it does not need to read it again.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status, views
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from assets import reference_data
+from assets.models import InventoryVersion
+
+CONDITIONAL_METHODS = ('GET', 'HEAD')
+
+
+def inventory_etag(request: Request, version: int) -> str:
+    """The ETag of the response to a request, at a version of the inventory."""
+    key = f"{request.build_absolute_uri()}\n{request.accepted_media_type}"
+    return quote_etag(f"{version}-{hashlib.sha1(key.encode()).hexdigest()}")
+
+
+class EarlyResponse(Exception):
+    """The request is answered without running the view, such as with 304 Not Modified."""
+
+    def __init__(self, response: Response) -> None:
+        super().__init__(response.status_code)
+        self.response = response
+
+
+class InventoryETagMixin(views.APIView):
+    """Tag GET responses with the version of the inventory, and answer conditional GET requests."""
+
+    # The version of the inventory when a GET request was received.
+    inventory_version: Optional[int] = None
+    etag: Optional[str] = None
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        # Authentication, permissions and content negotiation come first, as the response depends on them.
+        super().initial(request, *args, **kwargs)
+        self.inventory_version = self.etag = None
+        if request.method in CONDITIONAL_METHODS:
+            versions = InventoryVersion.get()
+            reference_data.check(versions.reference_version)
+            self.inventory_version = versions.version
+            self.etag = inventory_etag(request, self.inventory_version)
+            conditional = get_conditional_response(request, etag=self.etag)
+            if conditional is not None:
+                raise EarlyResponse(Response(status=conditional.status_code))
+
+    def handle_exception(self, exc: Exception) -> Response:
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request: Request, response: Response, *args: Any, **kwargs: Any) -> Response:
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.etag is not None and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = self.etag
+        return response
@@ -0,0 +1,115 @@
+"""
+Export of the inventory in Student Robotics JSON format.
+
+The inventory is written as a JSON object, one item per location and asset,
+in the format read by the srobo_import command. The items are generated
+from two streams of rows: the nodes of the tree in path order, and the
+assets that are not in the tree. As the ancestors of a node come before it
+in path order, its location is known from a stack of the nodes above it,
+so memory use does not grow with the size of the inventory.
+
+Only Student Robotics asset codes can be imported again, so the Student
+Robotics code of each asset is exported where it has one. Location names
+are exported as they are, and a location inside an asset is exported in
+the nearest location above it.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.db.models import Case, IntegerField, OuterRef, Subquery, When
+
+from assets.asset_codes import AssetCodeType
+from assets.models import Asset, AssetCode, Node, NodeType
+from pyinv.renderers import dumps
+
+CHUNK_SIZE = 2000
+# Roughly the number of characters in each piece of the output.
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+ROOT = "."
+# Assets that are not in the tree are exported here, as srobo_import leaves them out of the tree.
+UNKNOWN_LOCATION = "unknown-location"
+
+
+def _export_code(asset: Any) -> Subquery:
+    """The code to export for an asset: a Student Robotics code if it has one, or else its first code."""
+    return Subquery(
+        AssetCode.objects.filter(asset=asset).order_by(
+            Case(When(code_type=AssetCodeType.SROBO.value, then=0), default=1, output_field=IntegerField()),
+            'pk',
+        ).values('code')[:1],
+    )
+
+
+def _asset_item(
+    code: Optional[str],
+    asset_id: Any,
+    asset_type: str,
+    location: str,
+    extra_data: Any,
+) -> Dict[str, Any]:
+    return {
+        "type": "asset",
+        "data": {
+            "asset_code": code or str(asset_id),
+            "asset_type": asset_type,
+            "data": extra_data,
+            "location": location,
+        },
+    }
+
+
+def srobo_items() -> Iterator[Dict[str, Any]]:
+    """Generate the items of the inventory, with locations and containers before their contents."""
+    yield {"type": "location", "data": [UNKNOWN_LOCATION, ROOT]}
+
+    nodes = Node.objects.order_by('path').values_list(
+        'path',
+        'node_type',
+        'name',
+        'asset_id',
+        'asset__asset_model__name',
+        'asset__extra_data',
+        _export_code(OuterRef('asset')),
+    )
+    # The path, type and exported name of the node above the current node, and the nodes above that.
+    ancestors: List[Tuple[str, str, str]] = []
+    for path, node_type, name, asset_id, asset_type, extra_data, code in nodes.iterator(chunk_size=CHUNK_SIZE):
+        while ancestors and not path.startswith(ancestors[-1][0]):
+            ancestors.pop()
+
+        if node_type == NodeType.LOCATION:
+            parent = next((label for _, kind, label in reversed(ancestors) if kind == NodeType.LOCATION), ROOT)
+            yield {"type": "location", "data": [name, parent]}
+            label = name
+        else:
+            # Assets cannot be at the top of a Student Robotics inventory.
+            location = ancestors[-1][2] if ancestors else UNKNOWN_LOCATION
+            yield _asset_item(code, asset_id, asset_type, location, extra_data)
+            label = code or str(asset_id)
+        ancestors.append((path, node_type, label))
+
+    unplaced = Asset.objects.filter(node__isnull=True).order_by('created_at', 'id').values_list(
+        'id',
+        'asset_model__name',
+        'extra_data',
+        _export_code(OuterRef('pk')),
+    )
+    for asset_id, asset_type, extra_data, code in unplaced.iterator(chunk_size=CHUNK_SIZE):
+        yield _asset_item(code, asset_id, asset_type, UNKNOWN_LOCATION, extra_data)
+
+
+def srobo_export() -> Iterator[str]:
+    """Generate the inventory as JSON text, in pieces of roughly OUTPUT_CHUNK_SIZE characters."""
+    parts = ["{"]
+    size = 1
+    for index, item in enumerate(srobo_items()):
+        part = f'{"," if index else ""}"{index}":{dumps(item).decode()}'
+        parts.append(part)
+        size += len(part)
+        if size >= OUTPUT_CHUNK_SIZE:
+            yield "".join(parts)
+            parts = []
+            size = 0
+    parts.append("}")
+    yield "".join(parts)
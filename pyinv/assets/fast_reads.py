@@ -0,0 +1,496 @@
+"""
+A fast read path for the lists of assets, nodes and asset events.
+
+Rendering a list through the serializers builds a model instance for every
+row and every related object, and runs each of them through the fields of
+the serializer. With FAST_READS set, the views using FastListMixin instead
+read each page with values(), joining the related rows that it needs in the
+same query, and build the same representation from plain dicts.
+
+The serializer for the request is still built once, to check the chosen
+fields and to find which fields are rendered and which nested objects are
+expanded, so the output has the same shape. The asset codes, and the
+ancestors of nodes, are each fetched for a whole page in one query when they
+are first needed, and asset models come from the reference data cache.
+
+The readers here must be kept in step with the serializers, which the tests
+in assets.tests.api.test_fast_reads check for each endpoint.
+"""
+
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime, tzinfo
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import Field
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from assets import reference_data
+from assets.models import AssetCode, AssetModel, Node
+from assets.serializers.sparse import nested_serializer
+from pyinv.renderers import StreamingRenderer
+from pyinv.streaming import BATCH_SIZE, StreamingListMixin
+
+# A row from values(), or an object built from one.
+Row = Dict[str, Any]
+Getter = Callable[[Any], Any]
+
+ASSET_COLUMNS = ('id', 'asset_model', 'created_at', 'updated_at', 'extra_data')
+NODE_COLUMNS = ('id', 'name', 'node_type', 'numchild', 'depth', 'path', 'asset')
+
+
+def _take(row: Row, prefix: str, columns: Iterable[str]) -> Row:
+    return {column: row[f"{prefix}{column}"] for column in columns}
+
+
+class Page:
+    """
+    The related data needed to render a page of objects.
+
+    Asset codes and ancestors are fetched for every asset and node added to
+    the page, in one query each, when they are first needed.
+    """
+
+    def __init__(self) -> None:
+        self._datetime_field = serializers.DateTimeField()
+        # The time zone to render ISO 8601 datetimes in, looked up once rather than for each datetime.
+        self._timezone: Optional[tzinfo] = None
+        if settings.USE_TZ and str(api_settings.DATETIME_FORMAT).lower() == ISO_8601:
+            self._timezone = timezone.get_current_timezone()
+        self._asset_models: Dict[UUID, AssetModel] = {}
+        self._asset_ids: List[UUID] = []
+        self._codes: Dict[UUID, List[Tuple[Any, str]]] = {}
+        self._nodes: List[Row] = []
+        self._nodes_by_path: Dict[str, Row] = {}
+
+    def add_asset(self, asset: Row) -> None:
+        self._asset_ids.append(asset['id'])
+
+    def add_node(self, node: Row) -> None:
+        self._nodes.append(node)
+
+    def datetime(self, value: Optional[datetime]) -> Optional[str]:
+        """Render a datetime as DateTimeField does."""
+        if value is None:
+            return None
+        if self._timezone is None or timezone.is_naive(value):
+            rendered: str = self._datetime_field.to_representation(value)
+            return rendered
+        rendered = value.astimezone(self._timezone).isoformat()
+        return f"{rendered[:-6]}Z" if rendered.endswith('+00:00') else rendered
+
+    def asset_model(self, pk: UUID) -> AssetModel:
+        if pk not in self._asset_models:
+            self._asset_models[pk] = reference_data.get_asset_model(pk)
+        return self._asset_models[pk]
+
+    def codes(self, asset: Row) -> List[Tuple[Any, str]]:
+        """The IDs and codes of the asset codes of an asset."""
+        if asset['id'] not in self._codes:
+            missing = {pk for pk in self._asset_ids if pk not in self._codes}
+            missing.add(asset['id'])
+            codes = defaultdict(list)
+            for asset_id, code_id, code in AssetCode.objects.filter(asset__in=missing).values_list(
+                'asset_id', 'id', 'code',
+            ):
+                codes[asset_id].append((code_id, code))
+            for pk in missing:
+                self._codes[pk] = codes[pk]
+        return self._codes[asset['id']]
+
+    def first_asset_code(self, asset: Row) -> str:
+        # Match Asset.first_asset_code, which takes the code with the lowest ID.
+        codes = self.codes(asset)
+        return min(codes)[1] if codes else str(asset['id'])
+
+    def asset_display_name(self, asset: Row) -> str:
+        node = asset['node']
+        if node is not None and node['name'] is not None:
+            name = node['name']
+        else:
+            name = self.asset_model(asset['asset_model']).display_name
+        return f"{name} ({self.first_asset_code(asset)})"
+
+    def node_display_name(self, node: Row) -> str:
+        if node['asset'] is not None:
+            return self.asset_display_name(node['asset'])
+        return node['name'] or ""
+
+    def ancestors(self, node: Row) -> List[Row]:
+        """The ancestors of a node, from the root."""
+        if 'ancestors' not in node:
+            self._fetch_ancestors()
+        ancestors: List[Row] = node['ancestors']
+        return ancestors
+
+    def _fetch_ancestors(self) -> None:
+        steplen = Node.steplen
+        nodes = [node for node in self._nodes if 'ancestors' not in node]
+        paths = {
+            node['path'][:end]
+            for node in nodes
+            for end in range(steplen, len(node['path']), steplen)
+        } - self._nodes_by_path.keys()
+        for row in Node.objects.filter(path__in=paths).values(*NODE_COLUMNS, 'asset__asset_model'):
+            ancestor = _take(row, '', NODE_COLUMNS)
+            if ancestor['asset'] is not None:
+                ancestor['asset'] = {'id': row['asset'], 'asset_model': row['asset__asset_model'], 'node': ancestor}
+                self.add_asset(ancestor['asset'])
+            self._nodes_by_path[ancestor['path']] = ancestor
+
+        for node in nodes:
+            node['ancestors'] = [
+                self._nodes_by_path[node['path'][:end]]
+                for end in range(steplen, len(node['path']), steplen)
+            ]
+
+
+class ObjectReader:
+    """
+    Render objects built from rows with the fields that a serializer renders.
+
+    Each field is rendered by the ``get_<name>`` method of the reader. A field
+    that is rendered by a nested serializer instead renders the object from
+    ``related_<name>``, with the reader from ``get_nested_reader``.
+    """
+
+    def __init__(self, serializer: serializers.BaseSerializer, page: Page) -> None:
+        assert isinstance(serializer, serializers.Serializer)  # Readers render objects with fields
+        self.page = page
+        self.fields: List[Tuple[str, Getter]] = [
+            (str(field.field_name), self._getter(field))
+            for field in serializer._readable_fields
+        ]
+
+    def _getter(self, field: Field) -> Getter:
+        name = str(field.field_name)
+        nested = nested_serializer(field)
+        if nested is None:
+            getter: Getter = getattr(self, f"get_{name}")
+            return getter
+
+        related: Getter = getattr(self, f"related_{name}")
+        reader = self.get_nested_reader(name)(nested, self.page)
+
+        def render_related(obj: Any) -> Any:
+            value = related(obj)
+            if value is None:
+                return None
+            if isinstance(value, list):
+                return [reader.render(item) for item in value]
+            return reader.render(value)
+        return render_related
+
+    def get_nested_reader(self, name: str) -> Type['ObjectReader']:
+        """The reader for the objects of a field that is rendered by a nested serializer."""
+        raise KeyError(name)  # pragma: nocover
+
+    def render(self, obj: Any) -> Dict[str, Any]:
+        return {name: getter(obj) for name, getter in self.fields}
+
+
+class AssetModelLinkReader(ObjectReader):
+    """Render asset models from the reference data cache, like AssetModelLinkSerializer."""
+
+    def get_name(self, asset_model: AssetModel) -> str:
+        return asset_model.name
+
+    def get_slug(self, asset_model: AssetModel) -> Optional[str]:
+        return None if asset_model.slug is None else str(asset_model.slug)
+
+
+class NodeReader(ObjectReader):
+    """Render nodes like NodeSerializer, NodeLinkSerializer and NodeLinkWithParentSerializer."""
+
+    def get_nested_reader(self, name: str) -> Type[ObjectReader]:
+        return {'parent': NodeReader, 'asset': AssetReader, 'ancestors': NodeReader}[name]
+
+    def get_id(self, node: Row) -> str:
+        return str(node['id'])
+
+    def get_display_name(self, node: Row) -> str:
+        return self.page.node_display_name(node)
+
+    def get_node_type(self, node: Row) -> str:
+        node_type: str = node['node_type']
+        return node_type
+
+    def get_numchild(self, node: Row) -> int:
+        return int(node['numchild'])
+
+    def get_is_container(self, node: Row) -> bool:
+        asset = node['asset']
+        return asset is None or self.page.asset_model(asset['asset_model']).is_container
+
+    def related_parent(self, node: Row) -> Optional[Row]:
+        ancestors = self.page.ancestors(node)
+        return ancestors[-1] if ancestors else None
+
+    def get_parent(self, node: Row) -> Optional[str]:
+        parent = self.related_parent(node)
+        return None if parent is None else str(parent['id'])
+
+    def get_name(self, node: Row) -> Optional[str]:
+        return None if node['name'] is None else str(node['name'])
+
+    def related_asset(self, node: Row) -> Optional[Row]:
+        asset: Optional[Row] = node['asset']
+        return asset
+
+    def get_asset(self, node: Row) -> Optional[str]:
+        return None if node['asset'] is None else str(node['asset']['id'])
+
+    def get_depth(self, node: Row) -> int:
+        return int(node['depth'])
+
+    def related_ancestors(self, node: Row) -> List[Row]:
+        return self.page.ancestors(node)
+
+    def get_ancestors(self, node: Row) -> List[str]:
+        return [str(ancestor['id']) for ancestor in self.page.ancestors(node)]
+
+
+class AssetReader(ObjectReader):
+    """Render assets like AssetSerializer, AssetWithNodeSerializer and AssetLinkSerializer."""
+
+    def get_nested_reader(self, name: str) -> Type[ObjectReader]:
+        return {'asset_model': AssetModelLinkReader, 'node': NodeReader}[name]
+
+    def get_id(self, asset: Row) -> str:
+        return str(asset['id'])
+
+    def get_display_name(self, asset: Row) -> str:
+        return self.page.asset_display_name(asset)
+
+    def related_asset_model(self, asset: Row) -> AssetModel:
+        return self.page.asset_model(asset['asset_model'])
+
+    def get_asset_codes(self, asset: Row) -> List[str]:
+        return [str(asset['id'])] + [code for _, code in self.page.codes(asset)]
+
+    def get_first_asset_code(self, asset: Row) -> str:
+        return self.page.first_asset_code(asset)
+
+    def get_created_at(self, asset: Row) -> Optional[str]:
+        return self.page.datetime(asset['created_at'])
+
+    def get_updated_at(self, asset: Row) -> Optional[str]:
+        return self.page.datetime(asset['updated_at'])
+
+    def get_extra_data(self, asset: Row) -> Any:
+        return asset['extra_data']
+
+    def related_node(self, asset: Row) -> Optional[Row]:
+        node: Optional[Row] = asset['node']
+        return node
+
+
+class UserLinkReader(ObjectReader):
+    """Render users like UserLinkSerializer."""
+
+    def get_username(self, user: Row) -> str:
+        return str(user['username'])
+
+    def get_display_name(self, user: Row) -> str:
+        # Match User.get_full_name.
+        return f"{user['first_name']} {user['last_name']}".strip() or str(user['username'])
+
+
+class ChangeSetReader(ObjectReader):
+    """Render changesets like ChangeSetSerializer."""
+
+    def get_nested_reader(self, name: str) -> Type[ObjectReader]:
+        return {'user': UserLinkReader}[name]
+
+    def get_id(self, changeset: Row) -> str:
+        return str(changeset['id'])
+
+    def get_timestamp(self, changeset: Row) -> Optional[str]:
+        return self.page.datetime(changeset['timestamp'])
+
+    def get_display_name(self, changeset: Row) -> str:
+        # Match ChangeSet.display_name, as the string of a user is their username.
+        return f"{changeset['timestamp']} by {changeset['user']['username']}"
+
+    def related_user(self, changeset: Row) -> Row:
+        user: Row = changeset['user']
+        return user
+
+    def get_comment(self, changeset: Row) -> str:
+        return str(changeset['comment'])
+
+
+class AssetEventReader(ObjectReader):
+    """Render asset events like AssetEventWithAssetSerializer and the other asset event serializers."""
+
+    def get_nested_reader(self, name: str) -> Type[ObjectReader]:
+        return {'changeset': ChangeSetReader, 'asset': AssetReader}[name]
+
+    def get_id(self, event: Row) -> str:
+        return str(event['id'])
+
+    def related_changeset(self, event: Row) -> Row:
+        changeset: Row = event['changeset']
+        return changeset
+
+    def get_event_type(self, event: Row) -> str:
+        event_type: str = event['event_type']
+        return event_type
+
+    def related_asset(self, event: Row) -> Row:
+        asset: Row = event['asset']
+        return asset
+
+    def get_event_data(self, event: Row) -> Any:
+        return event['data']
+
+
+class FastList(ABC):
+    """
+    Read a list of objects with values(), and render them like the serializer of the request.
+
+    Subclasses give the columns to read, including those of joined related
+    rows, and build an object from each row for their reader.
+    """
+
+    reader_class: Type[ObjectReader]
+    columns: Sequence[str]
+
+    def __init__(self, serializer: serializers.BaseSerializer) -> None:
+        self.serializer = serializer
+
+    def rows(self, queryset: QuerySet[Any]) -> QuerySet[Any]:
+        """The rows to read from a filtered queryset, in the same order."""
+        return queryset.values(*self.columns)
+
+    def render(self, rows: Iterable[Row]) -> List[Dict[str, Any]]:
+        """Render a page of rows."""
+        page = Page()
+        objects = [self.build(row, page) for row in rows]
+        reader = self.reader_class(self.serializer, page)
+        return [reader.render(obj) for obj in objects]
+
+    @abstractmethod
+    def build(self, row: Row, page: Page) -> Row:
+        """Build the object to render from a row, adding its assets and nodes to the page."""
+        raise NotImplementedError  # pragma: nocover
+
+
+class AssetList(FastList):
+
+    reader_class = AssetReader
+    columns = (*ASSET_COLUMNS, *(f"node__{column}" for column in NODE_COLUMNS))
+
+    def build(self, row: Row, page: Page) -> Row:
+        asset = _take(row, '', ASSET_COLUMNS)
+        asset['node'] = None
+        if row['node__id'] is not None:
+            asset['node'] = _take(row, 'node__', NODE_COLUMNS)
+            asset['node']['asset'] = asset
+            page.add_node(asset['node'])
+        page.add_asset(asset)
+        return asset
+
+
+class NodeList(FastList):
+
+    reader_class = NodeReader
+    columns = (*NODE_COLUMNS, *(f"asset__{column}" for column in ASSET_COLUMNS[1:]))
+
+    def build(self, row: Row, page: Page) -> Row:
+        node = _take(row, '', NODE_COLUMNS)
+        if node['asset'] is not None:
+            node['asset'] = {'id': row['asset'], **_take(row, 'asset__', ASSET_COLUMNS[1:]), 'node': node}
+            page.add_asset(node['asset'])
+        page.add_node(node)
+        return node
+
+
+class AssetEventList(FastList):
+
+    reader_class = AssetEventReader
+    columns = (
+        'id',
+        'event_type',
+        'data',
+        'asset',
+        'asset__asset_model',
+        'asset__node__name',
+        'changeset',
+        'changeset__timestamp',
+        'changeset__comment',
+        'changeset__user__username',
+        'changeset__user__first_name',
+        'changeset__user__last_name',
+    )
+
+    def build(self, row: Row, page: Page) -> Row:
+        asset = {
+            'id': row['asset'],
+            'asset_model': row['asset__asset_model'],
+            # Only the name of the node is needed, for the display name of the asset.
+            'node': {'name': row['asset__node__name']},
+        }
+        page.add_asset(asset)
+        return {
+            'id': row['id'],
+            'event_type': row['event_type'],
+            'data': row['data'],
+            'asset': asset,
+            'changeset': {
+                'id': row['changeset'],
+                'timestamp': row['changeset__timestamp'],
+                'comment': row['changeset__comment'],
+                'user': _take(row, 'changeset__user__', ('username', 'first_name', 'last_name')),
+            },
+        }
+
+
+class FastListMixin(StreamingListMixin):
+    """List objects with the fast list class of the view, if FAST_READS is set."""
+
+    fast_list_class: Type[FastList]
+
+    def get_fast_list(self) -> FastList:
+        return self.fast_list_class(self.get_serializer())
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:  # noqa: A003
+        if not settings.FAST_READS or isinstance(request.accepted_renderer, StreamingRenderer):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        fast_list = self.get_fast_list()
+        rows = fast_list.rows(queryset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast_list.render(page))
+        return Response(fast_list.render(rows))
+
+    def _serialize_batches(self, queryset: QuerySet[Any]) -> Iterator[List[Dict[str, Any]]]:
+        if not settings.FAST_READS:
+            yield from super()._serialize_batches(queryset)
+            return
+
+        fast_list = self.get_fast_list()
+        rows = fast_list.rows(queryset).iterator(chunk_size=BATCH_SIZE)
+        while batch := list(islice(rows, BATCH_SIZE)):
+            yield fast_list.render(batch)
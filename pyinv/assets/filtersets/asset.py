@@ -2,21 +2,27 @@ import django_filters
 from django.core.exceptions import ValidationError
 from django.db.models import QuerySet
 
+from assets.fuzzy import fuzzy_search
 from assets.models import Asset, AssetModel
 
+from .reference import ReferenceChoiceFilter
+
 
 class AssetFilterSet(django_filters.FilterSet):
 
     asset_code = django_filters.CharFilter(label="Asset Code", method='filter_asset_code')
+    fuzzy = django_filters.CharFilter(
+        label="Fuzzy match of asset code, node name or asset model name, ordered by similarity",
+        method='filter_fuzzy',
+    )
     has_node = django_filters.BooleanFilter(
         field_name='node',
         lookup_expr='isnull',
         exclude=True,
         label="Has Node",
     )
-    asset_model = django_filters.ModelChoiceFilter(
+    asset_model = ReferenceChoiceFilter(
         field_name="asset_model",
-        to_field_name='slug',
         queryset=AssetModel.objects.all(),
         label="Asset Model",
     )
@@ -32,6 +38,9 @@ class AssetFilterSet(django_filters.FilterSet):
             pass
         return qs
 
+    def filter_fuzzy(self, queryset: QuerySet[Asset], name: str, value: str) -> QuerySet[Asset]:
+        return fuzzy_search(queryset, value)
+
     class Meta:
         model = Asset
         fields = [
@@ -2,12 +2,13 @@ import django_filters
 
 from assets.models import AssetModel, Manufacturer
 
+from .reference import ReferenceChoiceFilter
+
 
 class AssetModelFilterSet(django_filters.FilterSet):
 
-    manufacturer = django_filters.ModelChoiceFilter(
+    manufacturer = ReferenceChoiceFilter(
         field_name="manufacturer",
-        to_field_name='slug',
         queryset=Manufacturer.objects.all(),
         label="Manufacturer",
     )
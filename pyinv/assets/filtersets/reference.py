@@ -0,0 +1,39 @@
+from typing import Any, Optional
+
+import django_filters
+from django.core.exceptions import ValidationError
+from django.db import models
+from django_filters.fields import ModelChoiceField
+
+from assets import reference_data
+
+
+class ReferenceChoiceField(ModelChoiceField):
+    """Choose a manufacturer or asset model by its slug, from the reference data cache."""
+
+    def to_python(self, value: Any) -> Optional[models.Model]:
+        if value in self.empty_values:
+            return None
+        obj = reference_data.get_by_slug(self.queryset.model, str(value))
+        if obj is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
+
+
+class ReferenceChoiceFilter(django_filters.ModelChoiceFilter):
+    """
+    Filter by a manufacturer or asset model, given by its slug.
+
+    The queryset is only used to describe the choices, as the slug is resolved
+    from the reference data cache without a query.
+    """
+
+    field_class = ReferenceChoiceField
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault('to_field_name', 'slug')
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,189 @@
+"""
+Fuzzy matching of assets by their codes and names.
+
+Candidates are ranked by trigram similarity, as computed by pg_trgm: the
+proportion of the three-character sequences of the words in two strings that
+they share. This tolerates mistyped or misread codes, such as SRABC for SR-ABC
+or INV-I2A for INV-12A.
+
+On PostgreSQL, matches are found by pg_trgm indexes on AssetCode.code,
+Node.name and AssetModel.name. Other databases use an in-memory trigram index
+of the same columns, which is rebuilt after any of them change in this process,
+or when InventoryVersion changes, such as after a change in another process.
+Only the MAX_CANDIDATES best matches from each index are queried, to keep the
+query within the limits of the database.
+"""
+
+import heapq
+import re
+from collections import defaultdict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from django.db import connections, models
+from django.db.models.functions import Greatest
+
+from assets.models import AssetCode, AssetModel, InventoryVersion, Node
+
+# The default similarity threshold of pg_trgm.
+SIMILARITY_THRESHOLD = 0.3
+# The most matches taken from each in-memory index.
+MAX_CANDIDATES = 100
+
+WORD_REGEX = re.compile(r'[^\W_]+')
+
+
+def trigrams(text: str) -> Set[str]:
+    """The trigrams of a string, as computed by pg_trgm."""
+    result: Set[str] = set()
+    for word in WORD_REGEX.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(a: str, b: str) -> float:
+    """The trigram similarity of two strings, between 0 and 1."""
+    return _similarity(trigrams(a), trigrams(b))
+
+
+def _similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TrigramIndex:
+    """An in-memory index of strings by their trigrams, for databases without pg_trgm."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Hashable]]) -> None:
+        self._keys: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._values: Dict[Hashable, List[Set[str]]] = defaultdict(list)
+        for value, key in entries:
+            value_trigrams = trigrams(value)
+            self._values[key].append(value_trigrams)
+            for trigram in value_trigrams:
+                self._keys[trigram].add(key)
+
+    def search(self, query: str, threshold: float = SIMILARITY_THRESHOLD) -> Dict[Hashable, float]:
+        """
+        Find the keys of values similar to the query.
+
+        :returns: The best similarity of a value for each matching key.
+        """
+        query_trigrams = trigrams(query)
+        candidates = set().union(*(self._keys.get(trigram, set()) for trigram in query_trigrams))
+        results = {}
+        for key in candidates:
+            best = max(_similarity(query_trigrams, value_trigrams) for value_trigrams in self._values[key])
+            if best >= threshold:
+                results[key] = best
+        return results
+
+
+# The values to index for each source of matches, with the key of the matching asset or asset model.
+INDEX_SOURCES: Dict[str, Callable[[], Iterable[Tuple[str, Hashable]]]] = {
+    'codes': lambda: AssetCode.objects.values_list('code', 'asset_id'),
+    'node_names': lambda: Node.objects.filter(asset__isnull=False, name__isnull=False).values_list('name', 'asset_id'),
+    'asset_models': lambda: AssetModel.objects.values_list('name', 'pk'),
+}
+
+_indexes: Dict[str, TrigramIndex] = {}
+# The version of the inventory that the indexes were built at.
+_version: Optional[int] = None
+
+
+def clear_indexes() -> None:
+    """Discard the in-memory indexes, so that they are rebuilt on the next search."""
+    global _version
+    _indexes.clear()
+    _version = None
+
+
+def _get_index(name: str, version: int) -> TrigramIndex:
+    global _version
+    if version != _version:
+        _indexes.clear()
+        _version = version
+    if name not in _indexes:
+        _indexes[name] = TrigramIndex(INDEX_SOURCES[name]())
+    return _indexes[name]
+
+
+def fuzzy_search(queryset: 'models.QuerySet[Any]', query: str) -> 'models.QuerySet[Any]':
+    """
+    Filter an asset queryset to assets with a code, node name or model name similar to the query.
+
+    The assets are annotated with their best similarity, and ordered by it.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        queryset = _postgresql_search(queryset, query)
+    else:
+        queryset = _index_search(queryset, query)
+    return queryset.order_by('-similarity', 'pk')
+
+
+def _postgresql_search(queryset: 'models.QuerySet[Any]', query: str) -> 'models.QuerySet[Any]':
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    # The % operator of trigram_similar is the one that can use the indexes.
+    codes = AssetCode.objects.filter(code__trigram_similar=query)
+    code_similarity = models.Subquery(
+        codes.filter(asset=models.OuterRef('pk')).annotate(
+            similarity=TrigramSimilarity('code', query),
+        ).order_by('-similarity').values('similarity')[:1],
+    )
+    return queryset.filter(
+        models.Q(pk__in=codes.values('asset'))
+        | models.Q(node__name__trigram_similar=query)
+        | models.Q(asset_model__name__trigram_similar=query),
+    ).annotate(
+        # GREATEST ignores nulls on PostgreSQL.
+        similarity=Greatest(
+            code_similarity,
+            TrigramSimilarity('node__name', query),
+            TrigramSimilarity('asset_model__name', query),
+        ),
+    )
+
+
+def _index_search(queryset: 'models.QuerySet[Any]', query: str) -> 'models.QuerySet[Any]':
+    version = InventoryVersion.current()
+    code_matches = _best(_get_index('codes', version).search(query))
+    node_matches = _best(_get_index('node_names', version).search(query))
+    model_matches = _best(_get_index('asset_models', version).search(query))
+    return queryset.filter(
+        models.Q(pk__in=code_matches)
+        | models.Q(pk__in=node_matches)
+        | models.Q(asset_model__in=model_matches),
+    ).annotate(
+        similarity=Greatest(
+            _case('pk', code_matches),
+            _case('pk', node_matches),
+            _case('asset_model', model_matches),
+        ),
+    )
+
+
+def _best(similarities: Dict[Hashable, float]) -> Dict[Hashable, float]:
+    """The MAX_CANDIDATES most similar matches."""
+    if len(similarities) <= MAX_CANDIDATES:
+        return similarities
+    return dict(heapq.nlargest(MAX_CANDIDATES, similarities.items(), key=lambda item: item[1]))
+
+
+def _case(field: str, similarities: Dict[Hashable, float]) -> models.Case:
+    return models.Case(
+        *[models.When(**{field: key}, then=models.Value(value)) for key, value in similarities.items()],
+        default=models.Value(0.0),
+        output_field=models.FloatField(),
+    )
@@ -0,0 +1,165 @@
+"""
+Helpers for importing large data files.
+
+JSONObjectReader reads the items of a JSON object one at a time, so that the
+memory used by an import does not grow with the size of the file, as long as
+each item is small. ImportStats measures the throughput and peak memory of an
+import, to report at the end. batches splits the records of an import into
+lists of a bounded size, to insert one at a time, and ordered_map parses
+files in a process pool while keeping them in order for a single writer.
+"""
+
+import json
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def batches(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split items into lists of at most the given size, without reading ahead."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def ordered_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    jobs: int,
+    lookahead: int = 4,
+    initializer: Optional[Callable[[], None]] = None,
+) -> Iterator[R]:
+    """
+    Apply func to each item in a pool of processes, yielding the results in the order of the items.
+
+    At most lookahead items per process are in flight, so the results do not
+    pile up in memory when the consumer is slower than the pool. func must be
+    picklable, so it must be defined at the top level of a module, and
+    initializer is run in each process before it starts. With a single job,
+    the items are processed in this process.
+    """
+    if jobs <= 1:
+        yield from map(func, items)
+        return
+
+    iterator = iter(items)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as executor:
+        pending: Deque[Future[R]] = deque(
+            executor.submit(func, item) for item in islice(iterator, jobs * lookahead)
+        )
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(iterator, 1):
+                pending.append(executor.submit(func, item))
+            yield result
+
+
+class JSONObjectReader:
+    """Iterate over the key and value of each item of a JSON object in a file, reading the file in chunks."""
+
+    def __init__(self, file: TextIO, *, chunk_size: int = CHUNK_SIZE) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                raise ValueError(f"Expecting a string key, got {key!r}")
+            self._expect(':')
+            yield key, self._decode()
+            if self._expect(',', '}') == '}':
+                return
+
+    def _read(self) -> bool:
+        """Read the next chunk of the file into the buffer, discarding what has been decoded."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        self._eof = not chunk
+        return bool(chunk)
+
+    def _peek(self) -> str:
+        """Skip whitespace, and return the next character, or an empty string at the end of the file."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._read():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def _expect(self, *chars: str) -> str:
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(f"Expecting {' or '.join(map(repr, chars))}, got {char or 'end of file'!r}")
+        self._pos += 1
+        return char
+
+    def _decode(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk.
+                if not self._read():
+                    raise
+                continue
+            # A number at the end of the buffer may also continue in the next chunk.
+            if end == len(self._buffer) and self._read():
+                continue
+            self._pos = end
+            return value
+
+
+class ImportStats:
+    """The number of records imported, and how quickly."""
+
+    def __init__(self) -> None:
+        self.records = 0
+        self._start = time.perf_counter()
+
+    @property
+    def peak_memory(self) -> int:
+        """Peak resident set size of the process, in bytes."""
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kibibytes, and macOS reports bytes.
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    def __str__(self) -> str:
+        elapsed = time.perf_counter() - self._start
+        return (
+            f"{self.records} records in {elapsed:.1f}s ({self.records / elapsed:.0f} records/s), "
+            f"peak memory {self.peak_memory / 2 ** 20:.0f} MiB"
+        )
@@ -0,0 +1,154 @@
+import time
+from typing import Any, Callable, List, Tuple, Type
+
+from django.contrib.auth.models import User
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import serializers
+
+from assets import reference_data
+from assets.fast_reads import AssetEventList, AssetList, FastList, NodeList
+from assets.models import (
+    Asset,
+    AssetCode,
+    AssetEvent,
+    AssetModel,
+    ChangeSet,
+    Manufacturer,
+    Node,
+)
+from assets.serializers import (
+    AssetEventWithAssetSerializer,
+    AssetWithNodeSerializer,
+    NodeSerializer,
+)
+
+ASSETS_PER_LOCATION = 50
+ASSETS_PER_CHANGESET = 100
+
+Endpoint = Tuple[str, Callable[[], QuerySet[Any]], Type[serializers.BaseSerializer], Type[FastList]]
+
+ENDPOINTS: List[Endpoint] = [
+    ('assets', lambda: Asset.objects.order_by('created_at', 'id'), AssetWithNodeSerializer, AssetList),
+    ('nodes', lambda: Node.objects.order_by('path'), NodeSerializer, NodeList),
+    (
+        'asset-events',
+        lambda: AssetEvent.objects.order_by('changeset__timestamp', 'id'),
+        AssetEventWithAssetSerializer,
+        AssetEventList,
+    ),
+]
+
+
+def build_inventory(count: int) -> None:
+    """Add an inventory of assets in containers in locations, each with a code and a history."""
+    manufacturer = Manufacturer.objects.create(name="Benchmark")
+    asset_models = [
+        AssetModel.objects.create(name=f"Benchmark {i}", manufacturer=manufacturer, is_container=i == 0)
+        for i in range(10)
+    ]
+    user = User.objects.create(username="benchmark", first_name="Bench", last_name="Mark", is_active=False)
+
+    assets = [Asset(asset_model=asset_models[i % len(asset_models)]) for i in range(count)]
+    Asset.objects.bulk_create(assets)
+    AssetCode.objects.bulk_create([
+        AssetCode(asset=asset, code=f"BENCH-{i}", code_type='A')
+        for i, asset in enumerate(assets)
+    ])
+
+    root = Node.add_root(node_type='L', name="Benchmark")
+    for start in range(0, count, ASSETS_PER_LOCATION):
+        location = root.add_child(node_type='L', name=f"Location {start // ASSETS_PER_LOCATION}")
+        batch = assets[start:start + ASSETS_PER_LOCATION]
+        # The first asset of each location is a container holding the rest.
+        Node.move_into(location, [Node(node_type='A', asset=batch[0])])
+        Node.move_into(Node.objects.get(asset=batch[0]), [Node(node_type='A', asset=asset) for asset in batch[1:]])
+        root.refresh_from_db()
+
+    for start in range(0, count, ASSETS_PER_CHANGESET):
+        changeset = ChangeSet.objects.create(user=user, timestamp=timezone.now(), comment="Benchmark")
+        AssetEvent.objects.bulk_create([
+            AssetEvent(changeset=changeset, asset=asset, event_type='CR', data={'location': ["Benchmark"]})
+            for asset in assets[start:start + ASSETS_PER_CHANGESET]
+        ])
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def count_queries(func: Callable[[], Any]) -> int:
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context)
+
+
+class Command(BaseCommand):
+
+    help = 'Compare rendering lists through the serializers and the fast read path'  # noqa: A003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--assets', type=int, default=2000, help="Number of assets in the generated inventory")
+        parser.add_argument('--page-size', type=int, default=100, help="Number of rows in each rendered page")
+        parser.add_argument('--repeat', type=int, default=5, help="Number of times to render each page")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['assets'] < 1 or options['page_size'] < 1 or options['repeat'] < 1:
+            raise CommandError("The number of assets, the page size and the repeat count must be positive.")
+        page_size: int = options['page_size']
+
+        # The inventory is only added for the benchmark, so it is rolled back afterwards.
+        with transaction.atomic():
+            self.stdout.write(f"Adding {options['assets']} assets...")
+            build_inventory(options['assets'])
+            reference_data.clear()
+            reference_data.check()
+
+            self.stdout.write(
+                f"{'endpoint':<14}{'path':<13}{'queries':>8}{'ms/page':>10}{'rows/s':>10}{'speedup':>9}",
+            )
+            for name, get_queryset, serializer_class, fast_list_class in ENDPOINTS:
+                self._benchmark(name, get_queryset(), serializer_class, fast_list_class, page_size, options['repeat'])
+
+            transaction.set_rollback(True)
+
+    def _benchmark(
+        self,
+        name: str,
+        queryset: QuerySet[Any],
+        serializer_class: Type[serializers.BaseSerializer],
+        fast_list_class: Type[FastList],
+        page_size: int,
+        repeat: int,
+    ) -> None:
+        def serialize() -> Any:
+            return serializer_class(list(queryset[:page_size]), many=True).data
+
+        fast_list = fast_list_class(serializer_class())
+
+        def read() -> Any:
+            return fast_list.render(list(fast_list.rows(queryset)[:page_size]))
+
+        if serialize() != read():
+            raise CommandError(f"The fast read path renders {name} differently from the serializer.")
+
+        serializer_time = best_time(serialize, repeat)
+        fast_time = best_time(read, repeat)
+        for path, func, elapsed in [('serializer', serialize, serializer_time), ('fast', read, fast_time)]:
+            speedup = f"{serializer_time / elapsed:.1f}x" if path == 'fast' else ""
+            self.stdout.write(
+                f"{name:<14}{path:<13}{count_queries(func):>8}{elapsed * 1000:>10.1f}"
+                f"{page_size / elapsed:>10.0f}{speedup:>9}",
+            )
@@ -0,0 +1,93 @@
+from functools import partial
+from typing import Any, Callable, Iterable, List, Tuple
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from assets import reference_data
+from assets.management.commands.benchmark_reads import (
+    best_time,
+    build_inventory,
+)
+from assets.models import Asset
+from assets.serializers import AssetWithNodeSerializer
+from pyinv.renderers import ORJSONRenderer
+from pyinv.streaming import BATCH_SIZE
+
+Renderer = Tuple[str, Callable[[Any], Iterable[bytes]]]
+
+
+def renderers() -> List[Renderer]:
+    drf, fast = JSONRenderer(), ORJSONRenderer()
+    return [
+        ('drf', lambda data: [drf.render(data)]),
+        ('orjson', lambda data: [fast.render(data)]),
+        ('orjson-chunks', lambda data: fast.render_chunks(data, BATCH_SIZE)),
+    ]
+
+
+def consume(render: Callable[[Any], Iterable[bytes]], data: Any) -> None:
+    for _ in render(data):
+        pass
+
+
+class Command(BaseCommand):
+
+    help = "Compare rendering pages of assets as JSON with DRF's renderer and with orjson"  # noqa: A003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--assets', type=int, default=5000, help="Number of assets in the generated inventory")
+        parser.add_argument('--repeat', type=int, default=5, help="Number of times to render each page")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['assets'] < 1 or options['repeat'] < 1:
+            raise CommandError("The number of assets and the repeat count must be positive.")
+
+        # The inventory is only added for the benchmark, so it is rolled back afterwards.
+        with transaction.atomic():
+            self.stdout.write(f"Adding {options['assets']} assets...")
+            build_inventory(options['assets'])
+            reference_data.clear()
+            assets = Asset.objects.order_by('created_at', 'id')
+            pages = [
+                # A page of serialized assets, in which the values are already strings.
+                ('serialized', {
+                    'count': len(assets),
+                    'next': None,
+                    'previous': None,
+                    'results': AssetWithNodeSerializer(assets, many=True).data,
+                }),
+                # Rows with UUIDs and datetimes, as encoded by the JSON encoder.
+                ('values', list(assets.values())),
+            ]
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'page':<12}{'renderer':<15}{'ms':>9}{'MB/s':>9}{'largest KB':>12}{'speedup':>9}",
+        )
+        for name, data in pages:
+            self._benchmark(name, data, options['repeat'])
+
+    def _benchmark(self, name: str, data: Any, repeat: int) -> None:
+        expected = b''
+        baseline = 0.0
+        for index, (renderer_name, render) in enumerate(renderers()):
+            chunks = list(render(data))
+            content = b''.join(chunks)
+            if index == 0:
+                expected = content
+            elif content != expected:
+                raise CommandError(f"The {renderer_name} renderer renders the {name} page differently.")
+
+            elapsed = best_time(partial(consume, render, data), repeat)
+            baseline = baseline or elapsed
+            speedup = f"{baseline / elapsed:.1f}x" if index else ""
+            self.stdout.write(
+                f"{name:<12}{renderer_name:<15}{elapsed * 1000:>9.1f}{len(content) / elapsed / 1e6:>9.0f}"
+                f"{max(map(len, chunks)) / 1024:>12.0f}{speedup:>9}",
+            )
@@ -0,0 +1,42 @@
+import csv
+import json
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from assets.asset_codes import AssetCodeType
+from assets.code_generation import reserve_codes
+
+
+class Command(BaseCommand):
+
+    help = 'Reserve new asset codes for printing labels'  # noqa: A003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('code_type', choices=[code_type.name.lower() for code_type in AssetCodeType])
+        parser.add_argument('count', type=int)
+        parser.add_argument('--prefix', help="Prefix of the codes, if not the default prefix")
+        parser.add_argument('--format', choices=['csv', 'json'], default='csv')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['count'] < 1:
+            raise CommandError("At least one code must be generated.")
+        try:
+            codes = reserve_codes(
+                AssetCodeType[options['code_type'].upper()],
+                options['count'],
+                prefix=options['prefix'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(codes, indent=2))
+        else:
+            writer = csv.writer(self.stdout, lineterminator='\n')
+            writer.writerow(['code'])
+            writer.writerows([code] for code in codes)
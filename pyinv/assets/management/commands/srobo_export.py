@@ -0,0 +1,24 @@
+from pathlib import Path
+from typing import Any, Optional
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from assets.exporting import srobo_export
+
+
+class Command(BaseCommand):
+
+    help = 'Export the inventory in Student Robotics JSON format'  # noqa: A003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('data_file', type=Path, nargs='?', help="File to write to, instead of stdout")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        data_file: Optional[Path] = options['data_file']
+        if data_file is None:
+            for chunk in srobo_export():
+                self.stdout.write(chunk, ending='')
+            self.stdout.write('')
+        else:
+            with data_file.open('w') as f:
+                f.writelines(srobo_export())
@@ -1,104 +1,312 @@
-import json
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
 
-from django.core.management.base import BaseCommand, CommandParser
+from django.core.exceptions import ValidationError
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import transaction
 
+from assets import code_resolution, fuzzy, reference_data, search
 from assets.asset_codes import AssetCodeType
-from assets.models import Asset, AssetCode, AssetModel, Manufacturer, Node
+from assets.importing import ImportStats, JSONObjectReader, batches
+from assets.models import (
+    Asset,
+    AssetCode,
+    AssetModel,
+    InventoryVersion,
+    Manufacturer,
+    Node,
+    NodeType,
+)
+
+BATCH_SIZE = 500
+
+# Assets are placed in the tree in up to this many passes over the inventory.
+# An asset is placed in the pass after its container, if it comes before its container in the inventory.
+MAX_PASSES = 30
+
+# Locations that are removed from the tree after importing. Assets in disposed-of are deleted.
+UNKNOWN_LOCATION = "unknown-location"
+DISPOSED_OF = "disposed-of"
+
+# A node in the imported tree: a location name, or an asset code.
+TreeKey = Tuple[NodeType, str]
+
+
+class AssetRecord(NamedTuple):
+    asset_type: str
+    location: str
 
 
 class Command(BaseCommand):
+    """
+    Import assets from Student Robotics JSON format.
+
+    The structure of the inventory is resolved in memory, so that every node
+    is created with its final path. The file is read as a stream twice: once
+    for the structure, and once to insert the assets with their data in
+    batches, so the whole file is never held in memory.
+    """
 
     help = 'Import assets from Student Robotics JSON format'  # noqa: A003
 
     def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument('data_file', type=Path)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report what would be imported, without saving any changes",
+        )
 
     def handle(self, *args: Any, **options: Any) -> None:
         data_file: Path = options['data_file']
         self.stdout.write(f"Importing from {data_file}")
+        stats = ImportStats()
 
-        data = json.loads(data_file.read_text())
+        locations: Dict[str, Optional[str]] = {}
+        assets: Dict[str, AssetRecord] = {}
+        with data_file.open() as f:
+            for _, obj in JSONObjectReader(f):
+                stats.records += 1
+                if obj["type"] == "asset":
+                    if obj["data"]["asset_code"] in assets:
+                        raise CommandError(f"Duplicate asset code {obj['data']['asset_code']}")
+                    assets[obj["data"]["asset_code"]] = AssetRecord(obj["data"]["asset_type"], obj["data"]["location"])
+                elif obj["type"] == "location":
+                    name, parent = obj["data"][:2]
+                    locations[name] = None if parent == "." else parent
+                else:
+                    raise ValueError(f"Unknown object type {obj['type']}")
 
-        self._default_manufacturer, _ = Manufacturer.objects.get_or_create(name="Unknown")
+        strategy = AssetCodeType.SROBO.get_strategy()
+        for code in assets:
+            try:
+                strategy.validate(code)
+            except ValidationError as e:
+                raise CommandError(f"Asset code {code} is not valid: {e}")
 
-        # First Pass
-        for obj in data.values():
-            if obj["type"] == "asset":
-                pass
-                self._add_asset(obj["data"])
-            elif obj["type"] == "location":
-                Node.add_root(instance=Node(node_type="L", name=obj["data"][0]))
-            else:
-                raise ValueError(f"Unknown object type {obj['type']}")
-
-        # Second Pass
-        for obj in data.values():
-            if obj["type"] == "asset":
-                pass
-            elif obj["type"] == "location":
-                node = Node.objects.get(name=obj["data"][0], node_type="L")
-                if obj["data"][1] != ".":
-                    parent = Node.objects.get(name=obj["data"][1], node_type="L")
-                    node.move(parent, pos="last-child")
-                    node.refresh_from_db()
+        roots, children = self._build_tree(locations, assets)
+        disposed = self._descendant_assets((NodeType.LOCATION, DISPOSED_OF), children)
+        containers = {
+            assets[code].asset_type
+            for node_type, code in children
+            if node_type == NodeType.ASSET and children[node_type, code]
+        }
+
+        with transaction.atomic():
+            asset_models = self._create_asset_models(assets, containers)
+
+            asset_ids: Dict[str, UUID] = {}
+            with data_file.open() as f:
+                asset_data = (
+                    obj["data"]
+                    for _, obj in JSONObjectReader(f)
+                    if obj["type"] == "asset" and obj["data"]["asset_code"] not in disposed
+                )
+                for batch in batches(asset_data, BATCH_SIZE):
+                    asset_objs = [
+                        Asset(asset_model=asset_models[data["asset_type"]], extra_data=data["data"])
+                        for data in batch
+                    ]
+                    Asset.objects.bulk_create(asset_objs)
+                    AssetCode.objects.bulk_create([
+                        AssetCode(
+                            asset=asset,
+                            code=data["asset_code"],
+                            normalised_code=strategy.normalise(data["asset_code"]),
+                            code_type=AssetCodeType.SROBO.value,
+                        )
+                        for data, asset in zip(batch, asset_objs)
+                    ])
+                    asset_ids.update((data["asset_code"], asset.pk) for data, asset in zip(batch, asset_objs))
+
+                    # Signals are not sent for bulk creation.
+                    search.refresh_assets(Asset.objects.filter(pk__in=[asset.pk for asset in asset_objs]))
+
+            placed = 0
+            for batch in batches(self._build_nodes(roots, children), BATCH_SIZE):
+                nodes = []
+                for (node_type, key), node in batch:
+                    if node_type == NodeType.ASSET:
+                        node.asset_id = asset_ids[key]
+                        placed += 1
+                    nodes.append(node)
+                Node.objects.bulk_create(nodes)
+                search.refresh_nodes(Node.objects.filter(pk__in=[node.pk for node in nodes]))
+
+            InventoryVersion.bump(reference=True)
+            transaction.on_commit(fuzzy.clear_indexes)
+            transaction.on_commit(code_resolution.cache.clear)
+            reference_data.changed()
+
+            if options['dry_run']:
+                transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'Would import' if options['dry_run'] else 'Imported'} {len(asset_ids)} assets, "
+            f"of which {len(asset_ids) - placed} are not in the tree. "
+            f"Skipped {len(disposed)} assets that were disposed of.",
+        )
+        self.stdout.write(f"Read {stats}")
+
+    def _build_tree(
+        self,
+        locations: Dict[str, Optional[str]],
+        assets: Dict[str, AssetRecord],
+    ) -> Tuple[List[TreeKey], Dict[TreeKey, List[TreeKey]]]:
+        """
+        Resolve the tree of locations and assets, with the children of each node in order.
+
+        Locations come first, in inventory order, followed by assets in the
+        order that they would be placed by passes over the inventory.
+        """
+        roots: List[TreeKey] = []
+        children: Dict[TreeKey, List[TreeKey]] = defaultdict(list)
+        for name, parent in locations.items():
+            if parent is None:
+                roots.append((NodeType.LOCATION, name))
+            elif parent in locations:
+                children[NodeType.LOCATION, parent].append((NodeType.LOCATION, name))
             else:
-                raise ValueError(f"Unknown object type {obj['type']}")
+                raise CommandError(f"Unknown location {parent}")
 
-        # nth pass
-        # Up to 30 levels deep.
-        for i in range(30):
-            if Asset.objects.filter(node__isnull=True).count() == 0:
-                print("Exit!")
-                break
+        for asset in assets.values():
+            location = asset.location
+            if location.startswith("sr"):
+                if location not in assets:
+                    self.stdout.write(f"WARNING: {location} is not a valid asset code")
+            elif location not in locations:
+                raise CommandError(f"Unknown location {location}")
 
-            print(f"Placing assets iteratively: pass {i}")
+        placed_in_pass = self._placement_passes(assets)
+        index = {code: i for i, code in enumerate(assets)}
+        for code in sorted(placed_in_pass, key=lambda code: (placed_in_pass[code], index[code])):
+            location = assets[code].location
+            parent_type = NodeType.ASSET if location.startswith("sr") else NodeType.LOCATION
+            children[parent_type, location].append((NodeType.ASSET, code))
+        return roots, children
 
-            for obj in data.values():
-                if obj["type"] == "asset":
-                    asset = Asset.objects.get(assetcode__code=obj["data"]["asset_code"])
-                    if Node.objects.filter(asset=asset).count() == 1:
+    def _placement_passes(self, assets: Dict[str, AssetRecord]) -> Dict[str, int]:
+        """
+        Find the pass over the inventory in which each asset would be placed in the tree.
+
+        Assets in locations are placed in the first pass. Assets in containers
+        are placed in the same pass as their container, if they come after it
+        in the inventory, and otherwise in the next pass. Assets that are not
+        placed within MAX_PASSES, or that are in containers that are not
+        placed, are left out of the tree.
+        """
+        index = {code: i for i, code in enumerate(assets)}
+        placed_in_pass: Dict[str, int] = {}
+        unplaced: Set[str] = set()
+        for code in assets:
+            # Follow the containers up to a placed or unplaceable asset, then place the chain top down.
+            chain: List[str] = []
+            current = code
+            while current not in placed_in_pass and current not in unplaced:
+                location = assets[current].location
+                if not location.startswith("sr"):
+                    placed_in_pass[current] = 0
+                elif location not in assets or location == current or location in chain:
+                    unplaced.add(current)
+                else:
+                    chain.append(current)
+                    current = location
+
+            for child in reversed(chain):
+                container = assets[child].location
+                if container in placed_in_pass:
+                    pass_number = placed_in_pass[container] + (0 if index[container] < index[child] else 1)
+                    if pass_number < MAX_PASSES:
+                        placed_in_pass[child] = pass_number
                         continue
+                unplaced.add(child)
+        return placed_in_pass
 
-                    if obj["data"]["location"].startswith("sr"):
-                        parent = AssetCode.objects.get(code=obj["data"]["location"]).asset
-                        if parent is not None:
-                            try:
-                                assert parent.node
-                                if parent.node.node_type == "A":
-                                    parent.node.asset.asset_model.is_container = True
-                                    parent.node.asset.asset_model.save()
-                                parent.node.add_child(node_type="A", asset=asset)
-                                parent.node.refresh_from_db()
-                            except Asset.node.RelatedObjectDoesNotExist:
-                                pass
-                        else:
-                            print(f"WARNING: {obj['data']['location']} is not a valid asset code")
-                    else:
-                        parent = Node.objects.get(name=obj["data"]["location"], node_type="L")
-                        parent.add_child(node_type="A", asset=asset)
-                        parent.refresh_from_db()
-
-        Node.objects.get(name="unknown-location").mark_out_of_tree(recursive=True)
-
-        # Delete everything in disposed-of
-        assets = []
-        for node in Node.objects.get(name="disposed-of").get_descendants():
-            if node.asset:
-                assets.append(node.asset)
-        Node.objects.get(name="disposed-of").mark_out_of_tree(recursive=True)
-        for asset in assets:
-            asset.delete()
-
-    def _add_asset(self, data: Dict[str, str]) -> None:
-        asset_model, _ = AssetModel.objects.get_or_create(
-            name=data["asset_type"],
-            manufacturer=self._default_manufacturer,
-        )
+    def _build_nodes(
+        self,
+        roots: List[TreeKey],
+        children: Dict[TreeKey, List[TreeKey]],
+    ) -> Iterator[Tuple[TreeKey, Node]]:
+        """
+        Create the nodes of the tree in memory, with their materialised paths, parents first.
 
-        asset = Asset.objects.create(
-            asset_model=asset_model,
-            extra_data=data["data"],
-        )
-        asset.add_asset_code(AssetCodeType.SROBO, data["asset_code"])
+        The unknown location and the disposed of location are left out, along
+        with everything in them.
+        """
+        last_root = Node.get_last_root_node()
+        start = last_root._get_lastpos_in_path() + 1 if last_root else 1
+
+        stack = [(key, Node._get_path(None, 1, start + i)) for i, key in reversed(list(enumerate(roots)))]
+        while stack:
+            key, path = stack.pop()
+            node_type, name = key
+            if key in {(NodeType.LOCATION, UNKNOWN_LOCATION), (NodeType.LOCATION, DISPOSED_OF)}:
+                continue
+
+            depth = len(path) // Node.steplen
+            yield key, Node(
+                node_type=node_type,
+                name=name if node_type == NodeType.LOCATION else None,
+                path=path,
+                depth=depth,
+                numchild=len(children[key]),
+            )
+            stack += [
+                (child, Node._get_path(path, depth + 1, i + 1))
+                for i, child in reversed(list(enumerate(children[key])))
+            ]
+
+    def _descendant_assets(self, key: TreeKey, children: Dict[TreeKey, List[TreeKey]]) -> Set[str]:
+        """Find the codes of all assets under a node."""
+        codes = set()
+        stack = list(children[key])
+        while stack:
+            node_type, name = child = stack.pop()
+            if node_type == NodeType.ASSET:
+                codes.add(name)
+            stack += children[child]
+        return codes
+
+    def _create_asset_models(self, assets: Dict[str, AssetRecord], containers: Set[str]) -> Dict[str, AssetModel]:
+        """
+        Get or create the asset model of each asset type, in inventory order.
+
+        Slugs are chosen as the slug field would choose them when creating the
+        models one at a time, as the field cannot tell apart the slugs of
+        models in the same bulk insert.
+        """
+        default_manufacturer, _ = Manufacturer.objects.get_or_create(name="Unknown")
+        asset_models = {
+            asset_model.name: asset_model
+            for asset_model in AssetModel.objects.filter(
+                manufacturer=default_manufacturer,
+                name__in={asset.asset_type for asset in assets.values()},
+            )
+        }
+
+        slug_field = AssetModel._meta.get_field('slug')
+        slugs = set(AssetModel.objects.values_list('slug', flat=True))
+        new_models = []
+        for asset in assets.values():
+            name = asset.asset_type
+            if name in asset_models:
+                continue
+            base_slug = slug = slug_field.slugify(name) or AssetModel._meta.model_name
+            suffix = 1
+            while slug in slugs:
+                suffix += 1
+                slug = f"{base_slug}-{suffix}"
+            slugs.add(slug)
+            asset_models[name] = AssetModel(name=name, slug=slug, manufacturer=default_manufacturer)
+            new_models.append(asset_models[name])
+
+        AssetModel.objects.bulk_create(new_models)
+        AssetModel.update_display_names(AssetModel.objects.filter(pk__in=[model.pk for model in new_models]))
+        AssetModel.objects.filter(pk__in=[asset_models[name].pk for name in containers]).update(is_container=True)
+        return asset_models
@@ -1,70 +1,223 @@
 import json
+import os
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, ContextManager, Dict, List, NamedTuple, Set, Tuple
+from uuid import UUID
 
+import django
 from django.contrib.auth.models import User
-from django.core.management.base import BaseCommand, CommandParser
-from django.db.models import Count
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import transaction
 from django.utils import timezone
 
-from assets.models import Asset, AssetEvent, ChangeSet
+from assets.importing import ImportStats, batches, ordered_map
+from assets.models import (
+    AssetCode,
+    AssetEvent,
+    ChangeSet,
+    ImportCheckpoint,
+    InventoryVersion,
+)
 
 CHANGE_TYPE_MAP = {
     'move': AssetEvent.AssetEventType.MOVE,
     'added': AssetEvent.AssetEventType.CREATE,
 }
 
+BATCH_SIZE = 500
+# Files imported in each transaction, after which the checkpoint is saved.
+CHECKPOINT_INTERVAL = 500
+
+
+class ChangesFile(NamedTuple):
+    name: str
+    author_email: str
+    message: str
+    timestamp: float
+    # The asset code, change type and data of each change.
+    changes: List[Tuple[str, str, Dict[str, Any]]]
+
+
+def parse_changes_file(file: Path) -> ChangesFile:
+    """
+    Read and normalise a file of changes.
+
+    This runs in a worker process, so it must not touch the database.
+
+    :raises django.core.management.base.CommandError: The file is not valid JSON, or is missing a field.
+    """
+    try:
+        with file.open() as f:
+            data = json.load(f)
+        changes = []
+        for change in data["changes"]:
+            code = change.pop("asset_code").strip()
+            change_type = change.pop("type")
+            changes.append((code, change_type, change))
+        return ChangesFile(file.name, data["author_email"], data["message"], data["dt"], changes)
+    except json.JSONDecodeError as e:
+        raise CommandError(f"{file.name} is not valid JSON: {e}")
+    except KeyError as e:
+        raise CommandError(f"{file.name} is missing the field {e}")
+
 
 class Command(BaseCommand):
+    """
+    Import asset history from Student Robotics JSON format.
+
+    Asset codes and users are looked up in memory, and changesets and events
+    are written in batches. A changeset is only written once it has an event,
+    so no empty changesets are created.
+
+    Files are parsed in a pool of processes, and the results are written in
+    the order of the files by this process, so that database writes stay
+    serialised and batched.
+
+    Files are imported in chunks, each in its own transaction, which also
+    records the last imported file. An import that fails can be continued
+    from there with --resume.
+    """
 
     help = 'Import asset history from Student Robotics JSON format'  # noqa: A003
 
     def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument('data_dir', type=Path)
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help="Continue a previous import of the directory from its last checkpoint",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report what would be imported, without saving any changes",
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes to parse files with, defaults to the number of CPUs",
+        )
 
     def handle(self, *args: Any, **options: Any) -> None:
         data_dir: Path = options['data_dir']
-        self.stdout.write(f"Importing history from {data_dir}")
-
-        # Delete all of the events before starting.
-        ChangeSet.objects.all().delete()
-        assert AssetEvent.objects.count() == 0
-
-        for file in sorted(data_dir.iterdir()):  # Sort by timestamp in filename
-            data = json.loads(file.read_text())
-            user, _ = User.objects.update_or_create(
-                username=data['author_email'],
-                email=data['author_email'],
-                is_active=False,
-            )
-
-            cs, _ = ChangeSet.objects.get_or_create(
-                user=user,
-                comment=data["message"],
-                timestamp=datetime.fromtimestamp(data["dt"], timezone.get_current_timezone())
-            )
-
-            for change in data["changes"]:
-                code = change.pop("asset_code").strip()
-                change_type = change.pop("type")
-                data = change
-
-                try:
-                    asset = Asset.objects.filter(assetcode__code=code).get()
-                except Asset.DoesNotExist:
-                    continue
-
-                # If the asset has been deleted and un-deleted, mark it as restored from lost.
-                if change_type == "added" and asset.assetevent_set.filter(event_type="CR").exists():
-                    change_type = "move"
-                    data = {
-                        "old": None,
-                        "new": change["location"]
-                    }
-
-                event_type = CHANGE_TYPE_MAP[change_type]
-                cs.assetevent_set.create(asset=asset, event_type=event_type, data=data)
-
-            # Delete empty changesets.
-            ChangeSet.objects.annotate(event_count=Count("assetevent__id")).filter(event_count=0).delete()
+        files = sorted(data_dir.iterdir())  # Sort by timestamp in filename
+        self._stats = ImportStats()
+
+        # A dry run is a single transaction that is rolled back, with a savepoint for each chunk.
+        dry_run: ContextManager[Any] = nullcontext()
+        if options['dry_run']:
+            dry_run = transaction.atomic()
+        with dry_run:
+            if options['resume']:
+                checkpoint = ImportCheckpoint.objects.filter(command=__name__, source=str(data_dir.resolve())).first()
+                if checkpoint is None:
+                    raise CommandError(f"There is no import of {data_dir} to resume")
+                files = [file for file in files if file.name > checkpoint.position]
+                self.stdout.write(f"Resuming history import from {len(files)} files in {data_dir}")
+            else:
+                self.stdout.write(f"Importing history from {len(files)} files in {data_dir}")
+                with transaction.atomic():
+                    # Delete all of the events before starting.
+                    ChangeSet.objects.all().delete()
+                    assert AssetEvent.objects.count() == 0
+                    checkpoint, _ = ImportCheckpoint.objects.update_or_create(
+                        command=__name__,
+                        source=str(data_dir.resolve()),
+                        defaults={'position': ""},
+                    )
+
+            self._asset_ids: Dict[str, UUID] = {
+                code: asset_id for code, asset_id in AssetCode.objects.values_list('code', 'asset_id') if asset_id
+            }
+            self._users: Dict[str, User] = {user.username: user for user in User.objects.all()}
+            # Changesets are merged by user, comment and timestamp, including those from before resuming.
+            self._changesets: Dict[Tuple[str, str, datetime], ChangeSet] = {
+                (changeset.user.username, changeset.comment, changeset.timestamp): changeset
+                for changeset in ChangeSet.objects.select_related('user')
+            }
+            # Assets that have been created, and the assets in each changeset.
+            created_events = AssetEvent.objects.filter(event_type=AssetEvent.AssetEventType.CREATE)
+            self._created: Set[UUID] = {
+                asset_id for asset_id in created_events.values_list('asset', flat=True) if asset_id
+            }
+            self._changed: Set[Tuple[UUID, UUID]] = set()
+            self._event_count = 0
+            self._changeset_count = 0
+
+            # Workers set up Django, so that they can unpickle the parser when processes are spawned.
+            parsed = ordered_map(parse_changes_file, files, jobs=options['jobs'], initializer=django.setup)
+            imported_files = 0
+            for chunk in batches(parsed, CHECKPOINT_INTERVAL):
+                with transaction.atomic():
+                    for batch in batches((event for file in chunk for event in self._read_changes(file)), BATCH_SIZE):
+                        self._write(batch)
+                    checkpoint.position = chunk[-1].name
+                    checkpoint.save(update_fields=['position', 'updated_at'])
+                imported_files += len(chunk)
+                self.stdout.write(f"Imported {imported_files} of {len(files)} files")
+
+            if options['dry_run']:
+                transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'Would import' if options['dry_run'] else 'Imported'} "
+            f"{self._event_count} events in {self._changeset_count} new changesets",
+        )
+        self.stdout.write(f"Read {self._stats}")
+
+    def _read_changes(self, file: ChangesFile) -> List[AssetEvent]:
+        """Turn the changes in a file into events, keeping the changeset and assets that they are for in memory."""
+        self._stats.records += len(file.changes)
+
+        email = file.author_email
+        if email not in self._users:
+            self._users[email] = User.objects.create(username=email, email=email, is_active=False)
+
+        timestamp = datetime.fromtimestamp(file.timestamp, timezone.get_current_timezone())
+        changeset = self._changesets.setdefault(
+            (email, file.message, timestamp),
+            ChangeSet(user=self._users[email], comment=file.message, timestamp=timestamp),
+        )
+
+        events = []
+        for code, change_type, change in file.changes:
+            event_data = change
+
+            asset_id = self._asset_ids.get(code)
+            if asset_id is None:
+                continue
+
+            # If the asset has been deleted and un-deleted, mark it as restored from lost.
+            if change_type == "added" and asset_id in self._created:
+                change_type = "move"
+                event_data = {
+                    "old": None,
+                    "new": change["location"]
+                }
+
+            event_type = CHANGE_TYPE_MAP[change_type]
+            if event_type == AssetEvent.AssetEventType.CREATE:
+                self._created.add(asset_id)
+
+            if (changeset.pk, asset_id) in self._changed:
+                raise CommandError(f"{file.name}: {code} is changed more than once in the changeset")
+            self._changed.add((changeset.pk, asset_id))
+
+            events.append(AssetEvent(changeset=changeset, asset_id=asset_id, event_type=event_type, data=event_data))
+        return events
+
+    def _write(self, events: List[AssetEvent]) -> None:
+        changesets = {event.changeset.pk: event.changeset for event in events if event.changeset._state.adding}
+        ChangeSet.objects.bulk_create(changesets.values())
+        AssetEvent.objects.bulk_create(events)
+        # Signals are not sent for bulk creation.
+        InventoryVersion.bump()
+        self._changeset_count += len(changesets)
+        self._event_count += len(events)
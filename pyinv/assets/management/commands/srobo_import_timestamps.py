@@ -1,37 +1,57 @@
 from datetime import datetime
-from typing import Any
-
-from django.core.management.base import BaseCommand
+from typing import Any, Optional
+from uuid import UUID
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db.models import DateTimeField, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from assets.models import Asset
+from assets import code_resolution
+from assets.models import Asset, AssetEvent, ChangeSet, InventoryVersion
 
 
 class Command(BaseCommand):
 
     help = 'Update asset timestamps based on history'  # noqa: A003
 
-    def handle(self, *args: Any, **options: Any) -> None:
-
-        unknown_date = datetime.fromtimestamp(0, timezone.get_current_timezone())
-
-        for asset in Asset.objects.all():
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--since',
+            type=UUID,
+            metavar='CHANGESET',
+            help="Only update assets changed in this changeset, or in later changesets",
+        )
 
-            # Disable auto_now temporarily
-            for field in asset._meta.fields:
-                if field.name == 'updated_at':
-                    field.auto_now = False  # type: ignore
-
-            if asset.assetevent_set.count() == 0:
-                # Not all assets have history, some history was destroyed in a rebase in 2014.
-                asset.created_at = unknown_date
-                asset.updated_at = unknown_date
-            else:
-                asset.created_at = asset.assetevent_set.order_by(  # type: ignore
-                    "changeset__timestamp",
-                ).first().changeset.timestamp
-                asset.updated_at = asset.assetevent_set.order_by(  # type: ignore
-                    "changeset__timestamp"
-                ).last().changeset.timestamp
-
-            asset.save(update_fields=["created_at", "updated_at"])
+    def handle(self, *args: Any, **options: Any) -> None:
+        since: Optional[UUID] = options['since']
+
+        # Not all assets have history, some history was destroyed in a rebase in 2014.
+        unknown_date = Value(datetime.fromtimestamp(0, timezone.get_current_timezone()), output_field=DateTimeField())
+
+        assets = Asset.objects.all()
+        if since is not None:
+            try:
+                changeset = ChangeSet.objects.get(pk=since)
+            except ChangeSet.DoesNotExist:
+                raise CommandError(f"Changeset {since} does not exist")
+            assets = assets.filter(
+                pk__in=AssetEvent.objects.filter(changeset__timestamp__gte=changeset.timestamp).values('asset'),
+            )
+
+        # Updating the queryset does not apply auto_now to updated_at.
+        events = AssetEvent.objects.filter(asset=OuterRef('pk')).order_by().values('asset')
+        first = events.annotate(timestamp=Min('changeset__timestamp')).values('timestamp')
+        last = events.annotate(timestamp=Max('changeset__timestamp')).values('timestamp')
+        count = assets.update(
+            created_at=Coalesce(Subquery(first), unknown_date),
+            updated_at=Coalesce(Subquery(last), unknown_date),
+        )
+        InventoryVersion.bump()
+        code_resolution.cache.clear()
+
+        self.stdout.write(f"Updated the timestamps of {count} assets")
@@ -0,0 +1,35 @@
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def populate_display_names(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    AssetModel = apps.get_model('assets', 'AssetModel')
+    shared_names = set(
+        AssetModel.objects.values('name').annotate(
+            count=models.Count('id'),
+        ).filter(count__gt=1).values_list('name', flat=True),
+    )
+    asset_models = list(AssetModel.objects.select_related('manufacturer'))
+    for asset_model in asset_models:
+        if asset_model.name in shared_names:
+            asset_model.display_name = f"{asset_model.manufacturer.name} {asset_model.name}"
+        else:
+            asset_model.display_name = asset_model.name
+    AssetModel.objects.bulk_update(asset_models, ['display_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0008_cascade_deletion_of_asset_onto_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetmodel',
+            name='display_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=61),
+        ),
+        migrations.RunPython(populate_display_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.14 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0009_add_asset_model_display_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['created_at', 'id'], name='assets_asse_created_6a835c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='changeset',
+            index=models.Index(fields=['timestamp', 'id'], name='assets_chan_timesta_c47e63_idx'),
+        ),
+    ]
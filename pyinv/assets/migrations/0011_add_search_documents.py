@@ -0,0 +1,94 @@
+# Generated by Django 3.2.14 on 2026-10-18 18:00
+
+from collections import defaultdict
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+SEARCH_MODELS = ['Asset', 'Node']
+
+
+def create_search_indexes(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    for model_name in SEARCH_MODELS:
+        model = apps.get_model('assets', model_name)
+        table = model._meta.db_table
+        if schema_editor.connection.vendor == 'postgresql':
+            from django.contrib.postgres.indexes import GinIndex
+            from django.contrib.postgres.search import SearchVector
+
+            schema_editor.add_index(
+                model,
+                GinIndex(SearchVector('search_document', config='simple'), name=f'{table}_search'),
+            )
+        elif schema_editor.connection.vendor == 'sqlite':
+            schema_editor.execute(f"CREATE VIRTUAL TABLE {table}_search USING fts5(object_id UNINDEXED, document)")
+
+
+def drop_search_indexes(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    for model_name in SEARCH_MODELS:
+        table = apps.get_model('assets', model_name)._meta.db_table
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search")
+        elif schema_editor.connection.vendor == 'sqlite':
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_search")
+
+
+def populate_search_documents(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    Asset = apps.get_model('assets', 'Asset')
+    AssetCode = apps.get_model('assets', 'AssetCode')
+    Node = apps.get_model('assets', 'Node')
+    connection = schema_editor.connection
+
+    codes = defaultdict(list)
+    for asset_id, code in AssetCode.objects.values_list('asset_id', 'code'):
+        codes[asset_id].append(code)
+
+    assets = []
+    for pk, *fields in Asset.objects.values_list(
+        'pk',
+        'asset_model__name',
+        'asset_model__slug',
+        'asset_model__manufacturer__name',
+        'asset_model__manufacturer__slug',
+        'node__name',
+    ):
+        document = ' '.join(part for part in [*fields, *codes[pk]] if part)
+        assets.append(Asset(pk=pk, search_document=document))
+    Asset.objects.bulk_update(assets, ['search_document'], batch_size=500)
+
+    nodes = []
+    for pk, name, asset_document in Node.objects.values_list('pk', 'name', 'asset__search_document'):
+        document = ' '.join(part for part in [name, asset_document] if part)
+        nodes.append(Node(pk=pk, search_document=document))
+    Node.objects.bulk_update(nodes, ['search_document'], batch_size=500)
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for model, objs in [(Asset, assets), (Node, nodes)]:
+                cursor.executemany(
+                    f"INSERT INTO {model._meta.db_table}_search (object_id, document) VALUES (%s, %s)",
+                    [(model._meta.pk.get_db_prep_value(obj.pk, connection), obj.search_document) for obj in objs],
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0010_add_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='search_document',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='node',
+            name='search_document',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.2.14 on 2026-10-18 18:20
+
+from django.apps.registry import Apps
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+TRIGRAM_INDEXES = [
+    ('AssetCode', 'code'),
+    ('AssetModel', 'name'),
+    ('Node', 'name'),
+]
+
+
+def create_trigram_indexes(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    from django.contrib.postgres.indexes import GinIndex
+
+    for model_name, field in TRIGRAM_INDEXES:
+        model = apps.get_model('assets', model_name)
+        schema_editor.add_index(
+            model,
+            GinIndex(fields=[field], opclasses=['gin_trgm_ops'], name=f'{model._meta.db_table}_{field}_trgm'),
+        )
+
+
+def drop_trigram_indexes(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for model_name, field in TRIGRAM_INDEXES:
+        table = apps.get_model('assets', model_name)._meta.db_table
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{field}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0011_add_search_documents'),
+    ]
+
+    operations = [
+        # This does nothing on databases other than PostgreSQL.
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
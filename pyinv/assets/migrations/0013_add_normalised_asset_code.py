@@ -0,0 +1,31 @@
+# Generated by Django 3.2.14 on 2026-10-18 18:06
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+from assets.asset_codes import AssetCodeType
+
+
+def populate_normalised_codes(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    AssetCode = apps.get_model('assets', 'AssetCode')
+    asset_codes = list(AssetCode.objects.all())
+    for asset_code in asset_codes:
+        asset_code.normalised_code = AssetCodeType(asset_code.code_type).normalise(asset_code.code)
+    AssetCode.objects.bulk_update(asset_codes, ['normalised_code'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0012_add_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetcode',
+            name='normalised_code',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=30),
+        ),
+        migrations.RunPython(populate_normalised_codes, migrations.RunPython.noop),
+    ]
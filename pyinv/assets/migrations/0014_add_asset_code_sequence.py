@@ -0,0 +1,29 @@
+# Generated by Django 3.2.14 on 2026-10-18 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0013_add_normalised_asset_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetCodeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code_type', models.CharField(
+                    choices=[('A', 'Arbitrary String'), ('D', 'Damm 32'), ('S', 'Student Robotics')],
+                    max_length=1,
+                )),
+                ('prefix', models.CharField(blank=True, max_length=30)),
+                ('position', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='assetcodesequence',
+            constraint=models.UniqueConstraint(fields=('code_type', 'prefix'), name='unique_asset_code_sequence'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.14 on 2026-10-18 19:11
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def create_inventory_version(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    InventoryVersion = apps.get_model('assets', 'InventoryVersion')
+    InventoryVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0015_add_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_inventory_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.14 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0016_add_inventory_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventoryversion',
+            name='reference_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -1,16 +1,22 @@
 from .asset import Asset
 from .asset_code import AssetCode
+from .asset_code_sequence import AssetCodeSequence
 from .asset_event import AssetEvent, ChangeSet
 from .asset_model import AssetModel
+from .import_checkpoint import ImportCheckpoint
+from .inventory_version import InventoryVersion
 from .manufacturer import Manufacturer
 from .node import Node, NodeType
 
 __all__ = [
     "Asset",
     "AssetCode",
+    "AssetCodeSequence",
     "AssetEvent",
     "AssetModel",
     "ChangeSet",
+    "ImportCheckpoint",
+    "InventoryVersion",
     "Manufacturer",
     "Node",
     "NodeType",
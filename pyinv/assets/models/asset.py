@@ -4,11 +4,12 @@ from typing import List, Optional
 from uuid import uuid4
 
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError, models, transaction
+from django.db import models, transaction
 
 from assets.asset_codes import AssetCodeType
 
 from .asset_code import AssetCode
+from .asset_code_sequence import AssetCodeSequence
 from .asset_model import AssetModel
 
 
@@ -21,6 +22,14 @@ class Asset(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     extra_data = models.JSONField(default=dict, blank=True)
+    # Maintained by assets.search
+    search_document = models.TextField(default="", editable=False)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination ordering
+            models.Index(fields=['created_at', 'id']),
+        ]
 
     @property
     def display_name(self) -> str:
@@ -35,7 +44,11 @@ class Asset(models.Model):
     @property
     def first_asset_code(self) -> str:
         """A usable asset code for the asset."""
-        code = self.assetcode_set.first()
+        if 'assetcode_set' in getattr(self, '_prefetched_objects_cache', {}):
+            # Match the ordering that QuerySet.first() uses for unordered querysets.
+            code = min(self.assetcode_set.all(), key=lambda c: c.pk, default=None)
+        else:
+            code = self.assetcode_set.first()
         if code is None:
             return str(self.id)
         else:
@@ -54,6 +67,7 @@ class Asset(models.Model):
         Add an asset code to an asset.
 
         :raises ValueError: Unable to generate code, or unrecognised code type.
+        :raises assets.asset_codes.AssetCodeSpaceExhausted: There are no unused codes left to generate.
         :raises django.db.IntegrityError: The specifed code already exists
         """
         strategy = AssetCodeType.get_strategy(code_type)
@@ -64,13 +78,6 @@ class Asset(models.Model):
             except ValidationError as e:
                 raise ValueError(f"Provided asset code is not valid: {e}")
 
-        # Generate and attempt to insert codes in a loop
-        while True:
-            try:
-                if (code := strategy.generate_new_code()) is None:
-                    raise ValueError("Unable to generate an asset code of that type.")
-
-                with transaction.atomic():
-                    return AssetCode.objects.create(asset=self, code=code, code_type=code_type.value)
-            except IntegrityError:
-                pass
+        with transaction.atomic():
+            code, = AssetCodeSequence.allocate(code_type, 1)
+            return AssetCode.objects.create(asset=self, code=code, code_type=code_type.value)
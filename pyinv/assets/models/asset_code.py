@@ -1,4 +1,5 @@
 import uuid
+from typing import Any
 
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -11,12 +12,20 @@ class AssetCode(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # noqa: A003
     code = models.CharField(max_length=30, unique=True)
+    # The code as normalised by the strategy of the code type, for resolving scanned codes.
+    normalised_code = models.CharField(max_length=30, db_index=True, editable=False, default="")
     code_type = models.CharField(max_length=1, choices=ASSET_CODE_TYPE_CHOICES)
     asset = models.ForeignKey('Asset', on_delete=models.CASCADE)
 
     def __str__(self) -> str:
         return self.code
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.normalised_code = AssetCodeType(self.code_type).normalise(self.code)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'normalised_code'}
+        super().save(*args, **kwargs)
+
     def clean(self) -> None:
         try:
             code_type = AssetCodeType(self.code_type).get_strategy()
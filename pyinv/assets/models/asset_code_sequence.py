@@ -0,0 +1,86 @@
+from typing import List, Optional
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Q
+
+from assets.asset_codes import (
+    ASSET_CODE_TYPE_CHOICES,
+    AssetCodeSpaceExhausted,
+    AssetCodeType,
+)
+
+from .asset_code import AssetCode
+
+
+class AssetCodeSequence(models.Model):
+    """The position of the next asset code to allocate for a code type and prefix."""
+
+    BATCH_SIZE = 500
+
+    code_type = models.CharField(max_length=1, choices=ASSET_CODE_TYPE_CHOICES)
+    prefix = models.CharField(max_length=30, blank=True)
+    position = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['code_type', 'prefix'], name='unique_asset_code_sequence'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_code_type_display()} {self.prefix}: {self.position}"
+
+    @classmethod
+    def allocate(cls, code_type: AssetCodeType, count: int, *, prefix: Optional[str] = None) -> List[str]:
+        """
+        Allocate unused asset codes.
+
+        Codes are taken in the allocation order of the strategy, skipping any
+        that are already in use. The sequence is locked until the end of the
+        transaction, so concurrent allocations never return the same code.
+        Either all of the codes are allocated, or none are.
+
+        :raises ValueError: Unable to generate codes of that type, or the prefix is not valid.
+        :raises assets.asset_codes.AssetCodeSpaceExhausted: Not enough unused codes remain.
+        """
+        strategy = code_type.get_strategy()
+        if not strategy.code_space:
+            raise ValueError("Unable to generate an asset code of that type.")
+        if prefix is None:
+            prefix = strategy.default_prefix
+        try:
+            strategy.validate_prefix(prefix)
+        except ValidationError as e:
+            raise ValueError(f"Provided prefix is not valid: {e}")
+
+        with transaction.atomic():
+            sequence, _ = cls.objects.get_or_create(code_type=code_type.value, prefix=prefix)
+            sequence = cls.objects.select_for_update().get(pk=sequence.pk)
+
+            codes: List[str] = []
+            while len(codes) < count:
+                remaining = strategy.code_space - sequence.position
+                if remaining <= 0:
+                    raise AssetCodeSpaceExhausted(
+                        f"Only {len(codes)} of {count} asset codes could be allocated with the prefix {prefix!r}.",
+                    )
+                end = sequence.position + min(count - len(codes), remaining, cls.BATCH_SIZE)
+                candidates = {
+                    strategy.normalise(code): code
+                    for code in (strategy.code_at(prefix, position) for position in range(sequence.position, end))
+                }
+                used = set()
+                for code, normalised_code in AssetCode.objects.filter(
+                    Q(code_type=code_type.value, normalised_code__in=candidates.keys())
+                    | Q(code__in=candidates.values()),
+                ).values_list('code', 'normalised_code'):
+                    used |= {code, normalised_code}
+                codes += [
+                    code
+                    for normalised, code in candidates.items()
+                    if normalised not in used and code not in used
+                ]
+                sequence.position = end
+
+            sequence.save(update_fields=['position'])
+        return codes
@@ -19,6 +19,12 @@ class ChangeSet(models.Model):
     comment = models.TextField()
     timestamp = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            # Keyset pagination ordering
+            models.Index(fields=['timestamp', 'id']),
+        ]
+
     def __str__(self) -> str:
         return self.display_name
 
@@ -39,6 +45,8 @@ class AssetEvent(models.Model):
     event_type = models.CharField(max_length=2, choices=AssetEventType.choices)
     changeset = models.ForeignKey(ChangeSet, on_delete=models.CASCADE)
     asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
+    # Moves have the `old` and `new` locations, as location names or asset codes.
+    # Moves made through the API also have the `old_node` and `new_node` IDs.
     data = models.JSONField()
 
     class Meta:
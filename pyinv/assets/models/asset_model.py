@@ -1,7 +1,9 @@
 import uuid
+from typing import Any, Dict, Tuple
 
 from autoslug import AutoSlugField
 from django.db import models
+from django.db.models.functions import Concat
 
 from .manufacturer import Manufacturer
 
@@ -18,16 +20,58 @@ class AssetModel(models.Model):
         editable=True,
         populate_from='name',
     )
+    # The name, qualified with the manufacturer name if another model shares the name.
+    display_name = models.CharField(max_length=61, editable=False, db_index=True, default="")
     is_container = models.BooleanField(default=False, verbose_name="Can contain assets")
     manufacturer = models.ForeignKey(Manufacturer, on_delete=models.PROTECT)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    @property
-    def display_name(self) -> str:
-        if AssetModel.objects.filter(name=self.name).count() == 1:
-            return self.name
-        return f"{self.manufacturer.name} {self.name}"
-
     def __str__(self) -> str:
         return self.display_name
+
+    @classmethod
+    def update_display_names(cls, asset_models: 'models.QuerySet[AssetModel]') -> None:
+        """
+        Recompute the stored display name of every asset model sharing a name with the given models.
+
+        This must be called after bulk operations that bypass AssetModel.save,
+        such as bulk_create, or QuerySet.update of names or manufacturers.
+        """
+        related = cls.objects.filter(name__in=asset_models.values('name'))
+        shared_names = related.order_by().values('name').annotate(
+            count=models.Count('id'),
+        ).filter(count__gt=1).values('name')
+        manufacturer_name = models.Subquery(
+            Manufacturer.objects.filter(pk=models.OuterRef('manufacturer')).values('name'),
+        )
+
+        related.exclude(name__in=shared_names).update(display_name=models.F('name'))
+        related.filter(name__in=shared_names).update(
+            display_name=Concat(manufacturer_name, models.Value(' '), 'name', output_field=models.CharField()),
+        )
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if self._state.adding:
+            previous_name = None
+        else:
+            previous_name = AssetModel.objects.filter(pk=self.pk).values_list('name', flat=True).first()
+
+        if AssetModel.objects.filter(name=self.name).exclude(pk=self.pk).exists():
+            self.display_name = f"{self.manufacturer.name} {self.name}"
+        else:
+            self.display_name = self.name
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'display_name'}
+
+        super().save(*args, **kwargs)
+
+        # Other models with the old or new name may need to be (un)qualified.
+        AssetModel.update_display_names(
+            AssetModel.objects.filter(name__in={self.name, previous_name}).exclude(pk=self.pk),
+        )
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, Dict[str, int]]:
+        deleted = super().delete(*args, **kwargs)
+        AssetModel.update_display_names(AssetModel.objects.filter(name=self.name))
+        return deleted
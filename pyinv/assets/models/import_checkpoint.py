@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class ImportCheckpoint(models.Model):
+    """How far a resumable import has got through its source."""
+
+    command = models.CharField(max_length=100)
+    source = models.CharField(max_length=255)
+    # The last part of the source that was imported, such as a file name.
+    position = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['command', 'source'], name='unique_import_checkpoint'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.command} {self.source}: {self.position}"
@@ -0,0 +1,51 @@
+from django.db import models
+
+
+class InventoryVersion(models.Model):
+    """
+    A counter that is increased by every change to the inventory.
+
+    There is a single row, which is only read and written by its primary key,
+    so the version can be checked without querying the inventory itself.
+    """
+
+    PK = 1
+
+    version = models.PositiveBigIntegerField(default=0)
+    # Only increased by changes to manufacturers and asset models, which are cached in each process.
+    reference_version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"Inventory version {self.version}"
+
+    @classmethod
+    def get(cls) -> 'InventoryVersion':
+        """The current versions, in a single query."""
+        return cls.objects.filter(pk=cls.PK).first() or cls(pk=cls.PK)
+
+    @classmethod
+    def current(cls) -> int:
+        """The current version of the inventory."""
+        version: int = cls.objects.filter(pk=cls.PK).values_list('version', flat=True).first() or 0
+        return version
+
+    @classmethod
+    def bump(cls, *, reference: bool = False) -> None:
+        """
+        Increase the version of the inventory.
+
+        This should be called in the transaction that changes the inventory,
+        so that the new version is not seen before the change.
+
+        :param reference: Manufacturers or asset models were changed, so the reference version is also increased.
+        """
+        changes = {'version': models.F('version') + 1}
+        if reference:
+            changes['reference_version'] = models.F('reference_version') + 1
+        if not cls.objects.filter(pk=cls.PK).update(**changes):
+            _, created = cls.objects.get_or_create(
+                pk=cls.PK,
+                defaults={'version': 1, 'reference_version': int(reference)},
+            )
+            if not created:
+                cls.objects.filter(pk=cls.PK).update(**changes)
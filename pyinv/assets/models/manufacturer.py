@@ -1,4 +1,5 @@
 import uuid
+from typing import Any
 
 from autoslug import AutoSlugField
 from django.db import models
@@ -21,3 +22,12 @@ class Manufacturer(models.Model):
 
     def __str__(self) -> str:
         return self.name
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            from .asset_model import AssetModel
+
+            # The display names of asset models may include the manufacturer name.
+            AssetModel.update_display_names(self.assetmodel_set.all())
@@ -1,10 +1,12 @@
 """Asset Tree Node."""
 
-from typing import List, Optional
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
 from uuid import uuid4
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from treebeard.exceptions import InvalidMoveToDescendant, PathOverflow
 from treebeard.mp_tree import MP_Node
 
 
@@ -22,6 +24,12 @@ class Node(MP_Node):
     name = models.CharField(max_length=100, blank=True, null=True)
     node_type = models.CharField(max_length=1, choices=NodeType.choices)
     asset = models.OneToOneField('Asset', on_delete=models.PROTECT, blank=True, null=True)
+    # Maintained by assets.search
+    search_document = models.TextField(default="", editable=False)
+
+    # Populated by prefetch_ancestors. treebeard caches the parent as _cached_parent_obj.
+    _cached_ancestors: List['Node']
+    _cached_parent_obj: 'Node'
 
     def clean(self) -> None:
         """Validate the node."""
@@ -50,12 +58,121 @@ class Node(MP_Node):
             )
         ]
 
+    @classmethod
+    def prefetch_ancestors(cls, nodes: Sequence['Node']) -> List['Node']:
+        """
+        Fetch the ancestors of many nodes in a single query.
+
+        The materialised path of a node starts with the path of each of its
+        ancestors, so the ancestors of every node can be found from the paths
+        alone. They are cached on each node for Node.parent and Node.ancestors.
+
+        :returns: The distinct ancestors of the nodes.
+        """
+        nodes = [node for node in nodes if not hasattr(node, '_cached_ancestors')]
+        paths = {
+            node.path[:end]
+            for node in nodes
+            for end in range(cls.steplen, len(node.path), cls.steplen)
+        }
+        ancestors: Dict[str, Node] = {}
+        if paths:
+            ancestors = {node.path: node for node in cls.objects.filter(path__in=paths)}
+
+        for node in nodes:
+            node._cached_ancestors = [
+                ancestors[node.path[:end]]
+                for end in range(cls.steplen, len(node.path), cls.steplen)
+            ]
+            if node._cached_ancestors:
+                node._cached_parent_obj = node._cached_ancestors[-1]
+        return list(ancestors.values())
+
+    @classmethod
+    def move_into(cls, target: 'Node', nodes: Sequence['Node']) -> None:
+        """
+        Move many nodes to be the last children of the target, in one bulk update.
+
+        Moving nodes one at a time rewrites the paths of each moved branch and
+        the child counts of its old and new parents in separate statements.
+        Instead, the new paths and child counts are computed in memory, and
+        written together. Unsaved nodes are added to the target in one insert.
+
+        This must be called in a transaction. Signals are not sent for the
+        moved or added nodes.
+
+        :raises treebeard.exceptions.InvalidMoveToDescendant: The target is in a moved branch.
+        :raises treebeard.exceptions.PathOverflow: The target has too many children, or is too deep.
+        """
+        target = cls.objects.select_for_update().get(pk=target.pk)
+        moving = [
+            node
+            for node in cls.objects.select_for_update().filter(
+                pk__in=[node.pk for node in nodes if not node._state.adding],
+            ).order_by('path')
+            if node.path[:-cls.steplen] != target.path  # Already a child of the target
+        ]
+        added = [node for node in nodes if node._state.adding]
+        for node in moving:
+            if target.path.startswith(node.path):
+                raise InvalidMoveToDescendant("Can't move node to a descendant.")
+
+        last_child = target.get_last_child()
+        start = last_child._get_lastpos_in_path() + 1 if last_child else 1
+        new_paths = [cls._get_path(target.path, target.depth + 1, start + i) for i in range(len(moving) + len(added))]
+        if new_paths and (
+            len(cls._int2str(start + len(new_paths) - 1)) > cls.steplen
+            or len(new_paths[-1]) > cls._meta.get_field('path').max_length
+        ):
+            raise PathOverflow("The target node has too many children, or is too deep in the tree.")
+
+        # Nodes to update, by their path before the move.
+        changed: Dict[str, Node] = {target.path: target}
+        target.numchild += len(new_paths)
+
+        if moving:
+            # Rewrite the path of every node in the moved branches, from its nearest moved ancestor.
+            moved_paths = {node.path: new_path for node, new_path in zip(moving, new_paths)}
+            branches = models.Q()
+            for node in moving:
+                branches |= models.Q(path__startswith=node.path)
+            for node in cls.objects.select_for_update().filter(branches):
+                end = next(end for end in range(len(node.path), 0, -cls.steplen) if node.path[:end] in moved_paths)
+                changed[node.path] = node
+                node.path = moved_paths[node.path[:end]] + node.path[end:]
+                node.depth = len(node.path) // cls.steplen
+
+            # Update the child counts of the old parents, which may themselves have moved.
+            moved_children = Counter(node.path[:-cls.steplen] for node in moving if node.depth > 1)
+            for parent in cls.objects.select_for_update().filter(path__in=moved_children):
+                changed.setdefault(parent.path, parent).numchild -= moved_children[parent.path]
+
+        cls.objects.bulk_update(changed.values(), ['path', 'depth', 'numchild'], batch_size=500)
+
+        for node, path in zip(added, new_paths[len(moving):]):
+            node.path = path
+            node.depth = target.depth + 1
+            node.numchild = 0
+        cls.objects.bulk_create(added, batch_size=500)
+
+        # Update the nodes that were passed in, which are otherwise stale.
+        updated = {node.pk: node for node in changed.values()}
+        for node in nodes:
+            if node.pk in updated:
+                node.path = updated[node.pk].path
+                node.depth = updated[node.pk].depth
+                node.numchild = updated[node.pk].numchild
+            node.__dict__.pop('_cached_parent_obj', None)
+            node.__dict__.pop('_cached_ancestors', None)
+
     @property
     def parent(self) -> Optional['Node']:
         return self.get_parent()
 
     @property
     def ancestors(self) -> List['Node']:
+        if hasattr(self, '_cached_ancestors'):
+            return self._cached_ancestors
         return self.get_ancestors().all()
 
     @property
@@ -0,0 +1,97 @@
+"""Moving nodes and assets around the tree."""
+
+from typing import Dict, Optional, Sequence
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+
+from assets import code_resolution, search
+from assets.models import (
+    Asset,
+    AssetEvent,
+    ChangeSet,
+    InventoryVersion,
+    Node,
+    NodeType,
+)
+
+
+def _location(node: Optional[Node]) -> Optional[str]:
+    """The location of a node as it appears in imported history, either its name or the code of its asset."""
+    if node is None:
+        return None
+    if node.asset is None:
+        return node.name
+    return node.asset.first_asset_code
+
+
+def _move_data(old: Optional[Node], new: Node) -> Dict[str, Optional[str]]:
+    return {
+        'old': _location(old),
+        'new': _location(new),
+        'old_node': str(old.pk) if old is not None else None,
+        'new_node': str(new.pk),
+    }
+
+
+def move_into(
+    target: Node,
+    *,
+    nodes: Sequence[Node] = (),
+    assets: Sequence[Asset] = (),
+    user: User,
+    comment: str = "",
+) -> ChangeSet:
+    """
+    Move nodes and assets into the target node, recording the moves in a single changeset.
+
+    Assets that are not in the tree are added to it. Nodes and assets that are
+    already in the target are left where they are.
+
+    The events have the same data as imported moves, with the `old` and `new`
+    locations of the asset, and also the IDs of those nodes as `old_node` and
+    `new_node`.
+
+    :returns: The changeset, with an event for each asset that was moved.
+    """
+    with transaction.atomic():
+        by_pk = {node.pk: node for node in nodes}
+        asset_nodes = {node.asset_id: node for node in Node.objects.filter(asset__in=[asset.pk for asset in assets])}
+        for node in asset_nodes.values():
+            by_pk.setdefault(node.pk, node)
+        added = [Node(node_type=NodeType.ASSET, asset=asset) for asset in assets if asset.pk not in asset_nodes]
+
+        moving = [node for node in by_pk.values() if node.path[:-Node.steplen] != target.path]
+        old_parents = {
+            parent.path: parent
+            for parent in Node.objects.filter(
+                path__in={node.path[:-Node.steplen] for node in moving},
+            ).prefetch_related('asset__assetcode_set')
+        }
+        old_parent = {node.pk: old_parents.get(node.path[:-Node.steplen]) for node in moving}
+        prefetch_related_objects([target], 'asset__assetcode_set')
+
+        Node.move_into(target, [*moving, *added])
+
+        changeset = ChangeSet.objects.create(user=user, comment=comment, timestamp=timezone.now())
+        AssetEvent.objects.bulk_create(
+            [
+                AssetEvent(
+                    changeset=changeset,
+                    asset_id=node.asset_id,
+                    event_type=AssetEvent.AssetEventType.MOVE,
+                    data=_move_data(old_parent.get(node.pk), target),
+                )
+                for node in [*moving, *added]
+                if node.asset_id is not None
+            ],
+            batch_size=500,
+        )
+
+        # Signals are not sent for bulk moves.
+        search.refresh_assets(Asset.objects.filter(pk__in=[node.asset_id for node in added]))
+        InventoryVersion.bump()
+        transaction.on_commit(code_resolution.cache.clear)
+    return changeset
@@ -0,0 +1,246 @@
+"""
+A cache in each process of the manufacturers and asset models.
+
+Manufacturers and asset models are few and rarely change, but almost every
+request reads them: to render the asset model of each asset and its display
+name, and to filter by slug. Both tables are kept in memory in each process,
+by ID and by slug, so they can be resolved without a query.
+
+The cache is checked against InventoryVersion.reference_version, which is
+shared by every process and increased by every change to either table. The
+version is checked at most once per request: views using InventoryETagMixin
+pass on the version that they read anyway, and otherwise it is read when the
+cache is first used in a request. The signal handlers in assets.signals call
+changed when this process changes either table, and code that changes them
+in bulk must call it as well as InventoryVersion.bump.
+
+The cache is cleared once a change is committed. Until then, the transaction
+making the change reads the tables again for itself, without caching them in
+the process: if it rolled back, its reference version could be reused by
+another process for different data.
+
+The cached objects are shared between requests, so they must not be changed.
+"""
+
+from threading import Lock, local
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Type,
+)
+from uuid import UUID
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models, transaction
+from django.db.models.constants import LOOKUP_SEP
+
+from assets.display_names import Lookup
+from assets.models import AssetModel, InventoryVersion, Manufacturer
+
+REFERENCE_MODELS = (AssetModel, Manufacturer)
+
+
+class ReferenceData(NamedTuple):
+    reference_version: int
+    asset_models: Dict[UUID, AssetModel]
+    asset_models_by_slug: Dict[str, AssetModel]
+    manufacturers: Dict[UUID, Manufacturer]
+    manufacturers_by_slug: Dict[str, Manufacturer]
+
+    @classmethod
+    def load(cls, reference_version: int) -> 'ReferenceData':
+        manufacturers = {manufacturer.pk: manufacturer for manufacturer in Manufacturer.objects.all()}
+        asset_models = {asset_model.pk: asset_model for asset_model in AssetModel.objects.all()}
+        for asset_model in asset_models.values():
+            AssetModel.manufacturer.field.set_cached_value(asset_model, manufacturers[asset_model.manufacturer_id])
+        return cls(
+            reference_version,
+            asset_models,
+            {str(asset_model.slug): asset_model for asset_model in asset_models.values()},
+            manufacturers,
+            {str(manufacturer.slug): manufacturer for manufacturer in manufacturers.values()},
+        )
+
+
+_lock = Lock()
+_data: Optional[ReferenceData] = None
+# Whether the cache has been checked against the reference version since the current request started.
+_checked = False
+# The reference data read by each thread in a transaction that has changed it.
+_uncommitted = local()
+
+
+def _has_pending_changes() -> bool:
+    """Whether the current transaction has changed the reference data, and is not committed yet."""
+    connection = transaction.get_connection()
+    return connection.in_atomic_block and any(entry[1] is _committed for entry in connection.run_on_commit)
+
+
+def check(reference_version: Optional[int] = None) -> ReferenceData:
+    """
+    Get the cached reference data, reloading it if the reference version has changed.
+
+    :param reference_version: The current reference version, if it has already been read.
+    """
+    global _data, _checked
+    if _has_pending_changes():
+        # The transaction reads its own changes, which are not cached in the process until they are committed.
+        if getattr(_uncommitted, 'data', None) is None:
+            _uncommitted.data = ReferenceData.load(InventoryVersion.get().reference_version)
+        data: ReferenceData = _uncommitted.data
+        return data
+
+    with _lock:
+        if _data is None or not _checked or (
+            reference_version is not None and reference_version != _data.reference_version
+        ):
+            if reference_version is None:
+                reference_version = InventoryVersion.get().reference_version
+            if _data is None or _data.reference_version != reference_version:
+                _data = ReferenceData.load(reference_version)
+            _checked = True
+        return _data
+
+
+def expire() -> None:
+    """Check the reference version again the next time that the cache is used, such as in a new request."""
+    global _checked
+    _checked = False
+
+
+def clear() -> None:
+    global _data
+    with _lock:
+        _data = None
+
+
+def changed() -> None:
+    """Note a change to the manufacturers or asset models, so that the cache is cleared once it is committed."""
+    _uncommitted.data = None
+    transaction.on_commit(_committed)
+
+
+def _committed() -> None:
+    _uncommitted.data = None
+    clear()
+
+
+def _reload() -> ReferenceData:
+    # An object is missing, so it was created since the cache was last checked.
+    _uncommitted.data = None
+    expire()
+    return check()
+
+
+def get_asset_model(pk: UUID) -> AssetModel:
+    """
+    Get an asset model by its ID.
+
+    :raises assets.models.AssetModel.DoesNotExist: There is no asset model with that ID.
+    """
+    data = check()
+    if pk not in data.asset_models:
+        data = _reload()
+    try:
+        return data.asset_models[pk]
+    except KeyError:
+        raise AssetModel.DoesNotExist(f"There is no asset model with ID {pk}")
+
+
+def get_manufacturer(pk: UUID) -> Manufacturer:
+    """
+    Get a manufacturer by its ID.
+
+    :raises assets.models.Manufacturer.DoesNotExist: There is no manufacturer with that ID.
+    """
+    data = check()
+    if pk not in data.manufacturers:
+        data = _reload()
+    try:
+        return data.manufacturers[pk]
+    except KeyError:
+        raise Manufacturer.DoesNotExist(f"There is no manufacturer with ID {pk}")
+
+
+def get_by_slug(model: Type[models.Model], slug: str) -> Optional[models.Model]:
+    """Get a manufacturer or asset model by its slug, or None if there is none with that slug."""
+    def by_slug(data: ReferenceData) -> Mapping[str, models.Model]:
+        if model is AssetModel:
+            return data.asset_models_by_slug
+        return data.manufacturers_by_slug
+
+    data = check()
+    if slug not in by_slug(data):
+        data = _reload()
+    return by_slug(data).get(slug)
+
+
+def _reference_field(model: Type[models.Model], lookup: str) -> Optional[models.ForeignKey]:
+    """The foreign key to a reference model at the end of a lookup, if it ends in one."""
+    field = None
+    related_model: Optional[Type[models.Model]] = model
+    for name in lookup.split(LOOKUP_SEP):
+        if related_model is None:
+            return None
+        try:
+            field = related_model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        related_model = field.related_model
+    if isinstance(field, models.ForeignKey) and field.related_model in REFERENCE_MODELS:
+        return field
+    return None
+
+
+def _follow(instances: Sequence[Any], lookup: str) -> List[Any]:
+    """The related objects at the end of a lookup, which must already have been fetched."""
+    objects = list(instances)
+    for name in lookup.split(LOOKUP_SEP):
+        related: List[Any] = []
+        for obj in objects:
+            # A missing reverse one-to-one relation raises a subclass of AttributeError.
+            value = getattr(obj, name, None)
+            if isinstance(value, models.Manager):
+                related += value.all()
+            elif value is not None:
+                related.append(value)
+        objects = related
+    return objects
+
+
+def prefetch_related_objects(instances: Sequence[models.Model], *lookups: Lookup) -> None:
+    """
+    Prefetch related objects, like Django's function of the same name, taking reference objects from the cache.
+
+    Lookups that end in a foreign key to a manufacturer or asset model are
+    resolved from the cache, once the objects before that key are fetched.
+    """
+    if not instances:
+        return
+
+    model = type(instances[0])
+    fetched: List[Lookup] = []
+    cached: Dict[str, models.ForeignKey] = {}
+    for lookup in lookups:
+        field = _reference_field(model, lookup) if isinstance(lookup, str) else None
+        if field is None or not isinstance(lookup, str):
+            fetched.append(lookup)
+            continue
+        cached[lookup] = field
+        if LOOKUP_SEP in lookup:
+            fetched.append(lookup.rsplit(LOOKUP_SEP, 1)[0])
+
+    models.prefetch_related_objects(instances, *dict.fromkeys(fetched))
+    for lookup, field in cached.items():
+        path, _, name = lookup.rpartition(LOOKUP_SEP)
+        objects = _follow(instances, path) if path else instances
+        get = get_asset_model if field.related_model is AssetModel else get_manufacturer
+        for obj in objects:
+            related_id = getattr(obj, field.attname)
+            if related_id is not None and not field.is_cached(obj):
+                field.set_cached_value(obj, get(related_id))
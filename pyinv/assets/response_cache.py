@@ -0,0 +1,134 @@
+"""
+A cache of rendered responses to GET requests, shared between processes.
+
+Responses are kept in the Django cache named by RESPONSE_CACHE_ALIAS, so
+that every process using a shared backend can answer from the same entries.
+They are keyed on the version of the inventory, the absolute URI of the
+request, which links to other pages are built from, the negotiated media
+type and the auth scope of the request. Entries
+are never invalidated directly: any change to the inventory increases the
+version, after which the old entries are no longer used, and they expire
+after RESPONSE_CACHE_TIMEOUT seconds.
+
+Authentication and permissions are checked before the cache is used, and
+the inventory is rendered the same for every user that may read it, so the
+auth scope only separates anonymous from authenticated requests. Only JSON
+responses are cached, as the browsable API renders the user and a CSRF token
+into each page. Streaming responses are not cached.
+
+The number of hits and misses, and the time spent building the responses
+that were served from the cache, are counted in the same cache.
+"""
+
+import hashlib
+import time
+from typing import Any, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from assets.etags import EarlyResponse, InventoryETagMixin
+
+KEY_PREFIX = 'response-cache'
+HITS_KEY = f'{KEY_PREFIX}:hits'
+MISSES_KEY = f'{KEY_PREFIX}:misses'
+# The time spent building the responses that were served from the cache, in microseconds.
+SAVED_KEY = f'{KEY_PREFIX}:saved-us'
+
+# The content type, the content, and the time taken to build the response in seconds.
+CachedResponse = Tuple[str, bytes, float]
+
+
+class ResponseCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    # The time spent building the responses that were served from the cache, in seconds.
+    time_saved: float
+
+    @property
+    def hit_ratio(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+def get_cache() -> BaseCache:
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_stats() -> ResponseCacheStats:
+    counts = get_cache().get_many([HITS_KEY, MISSES_KEY, SAVED_KEY])
+    return ResponseCacheStats(
+        hits=counts.get(HITS_KEY, 0),
+        misses=counts.get(MISSES_KEY, 0),
+        time_saved=counts.get(SAVED_KEY, 0) / 1_000_000,
+    )
+
+
+def _count(key: str, delta: int = 1) -> None:
+    cache = get_cache()
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # The counter does not exist yet, or has been evicted.
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+def response_cache_key(request: Request, version: int) -> str:
+    scope = 'user' if request.user and request.user.is_authenticated else 'anon'
+    key = f"{request.build_absolute_uri()}\n{request.accepted_media_type}\n{scope}"
+    return f"{KEY_PREFIX}:{version}:{hashlib.sha1(key.encode()).hexdigest()}"
+
+
+class CachedResponseMixin(InventoryETagMixin):
+    """Answer GET requests from the shared response cache, and cache the responses that are rendered."""
+
+    cache_key: Optional[str] = None
+    _started: float = 0.0
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        self.cache_key = None
+        if (
+            self.inventory_version is None
+            or request.method != 'GET'
+            or not settings.RESPONSE_CACHE_TIMEOUT
+            or not isinstance(request.accepted_renderer, JSONRenderer)
+        ):
+            return
+
+        key = response_cache_key(request, self.inventory_version)
+        cached: Optional[CachedResponse] = get_cache().get(key)
+        if cached is not None:
+            content_type, content, build_time = cached
+            _count(HITS_KEY)
+            _count(SAVED_KEY, round(build_time * 1_000_000))
+            response = Response()
+            response.content = content
+            response['Content-Type'] = content_type
+            raise EarlyResponse(response)
+
+        _count(MISSES_KEY)
+        self.cache_key = key
+        self._started = time.perf_counter()
+
+    def finalize_response(self, request: Request, response: Response, *args: Any, **kwargs: Any) -> Response:
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            self.cache_key is not None
+            and isinstance(response, Response)
+            and response.status_code == status.HTTP_200_OK
+            and not response.exception
+        ):
+            response.add_post_render_callback(self._store)
+        return response
+
+    def _store(self, response: HttpResponse) -> None:
+        build_time = time.perf_counter() - self._started
+        cached: CachedResponse = (response['Content-Type'], response.content, build_time)
+        get_cache().set(self.cache_key, cached, timeout=settings.RESPONSE_CACHE_TIMEOUT)
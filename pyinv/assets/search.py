@@ -0,0 +1,186 @@
+"""
+Full-text search over assets and nodes.
+
+Each asset and node stores a search document: the text that ``?search=``
+matches, gathered from its asset model, manufacturer, node name and asset
+codes. Searching the document avoids joining across all of those tables. The
+documents are refreshed by the signal handlers in assets.signals when any of
+their sources change. Bulk operations that bypass signals must call
+refresh_assets or refresh_nodes themselves.
+
+On PostgreSQL the documents are matched by a GIN index over their tsvector.
+SQLite has no tsvector, so the documents are mirrored into an FTS5 table.
+"""
+
+import re
+from collections import defaultdict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+from django.db import connections, models, router
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models.expressions import RawSQL
+from django.template import loader
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from assets.models import Asset, AssetCode, Node
+
+# Documents are names and codes rather than prose, so they are not stemmed.
+SEARCH_CONFIG = 'simple'
+BATCH_SIZE = 500
+
+TERM_REGEX = re.compile(r'[^\W_]+')
+
+T = TypeVar('T')
+
+
+def search_table(model: Type[models.Model]) -> str:
+    """The name of the SQLite FTS5 table for a model."""
+    return f"{model._meta.db_table}_search"
+
+
+def get_terms(query: str) -> List[str]:
+    """Split a search query into the words that must all be matched."""
+    return TERM_REGEX.findall(query.lower())
+
+
+def search(queryset: 'models.QuerySet[Any]', query: str) -> 'models.QuerySet[Any]':
+    """
+    Filter an asset or node queryset to those with a document matching every term in the query.
+
+    Terms match the start of words in the document, so a partial code or name
+    still matches.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return queryset
+
+    if connections[queryset.db].vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        # The expression must match the one in the GIN index for it to be used.
+        return queryset.annotate(
+            search_vector=SearchVector('search_document', config=SEARCH_CONFIG),
+        ).filter(
+            search_vector=SearchQuery(
+                ' & '.join(f"{term}:*" for term in terms),
+                config=SEARCH_CONFIG,
+                search_type='raw',
+            ),
+        )
+
+    table = search_table(queryset.model)
+    match = ' AND '.join(f'"{term}"*' for term in terms)
+    return queryset.filter(pk__in=RawSQL(f"SELECT object_id FROM {table} WHERE {table} MATCH %s", [match]))
+
+
+def refresh_assets(assets: 'models.QuerySet[Asset]') -> None:
+    """Refresh the search documents of the assets, and of their nodes."""
+    pks = list(assets.values_list('pk', flat=True))
+    for batch in _batches(pks):
+        rows = Asset.objects.filter(pk__in=batch).values_list(
+            'pk',
+            'asset_model__name',
+            'asset_model__slug',
+            'asset_model__manufacturer__name',
+            'asset_model__manufacturer__slug',
+            'node__name',
+        )
+        codes = defaultdict(list)
+        for asset_id, code in AssetCode.objects.filter(asset__in=batch).values_list('asset_id', 'code'):
+            codes[asset_id].append(code)
+
+        _write_documents(Asset, {pk: _join(*fields, *codes[pk]) for pk, *fields in rows})
+        refresh_nodes(Node.objects.filter(asset__in=batch))
+
+
+def refresh_nodes(nodes: 'models.QuerySet[Node]') -> None:
+    """Refresh the search documents of the nodes, from the documents of their assets."""
+    pks = list(nodes.values_list('pk', flat=True))
+    for batch in _batches(pks):
+        rows = Node.objects.filter(pk__in=batch).values_list('pk', 'name', 'asset__search_document')
+        _write_documents(Node, {pk: _join(name, asset_document) for pk, name, asset_document in rows})
+
+
+def remove_documents(model: Type[models.Model], pks: Sequence[Any]) -> None:
+    """Remove the search documents of deleted objects from the FTS5 table, if there is one."""
+    connection = connections[router.db_for_write(model)]
+    if connection.vendor != 'sqlite':
+        return
+    table = search_table(model)
+    with connection.cursor() as cursor:
+        for batch in _batches(_object_ids(model, pks, connection)):
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"DELETE FROM {table} WHERE object_id IN ({placeholders})", batch)
+
+
+def _write_documents(model: Type[models.Model], documents: Dict[Any, str]) -> None:
+    connection = connections[router.db_for_write(model)]
+    pk_field = model._meta.pk
+    assert pk_field is not None
+    object_ids = _object_ids(model, list(documents), connection)
+    with connection.cursor() as cursor:
+        # One prepared statement, rather than the CASE expression of bulk_update, which is slow for large batches.
+        cursor.executemany(
+            f"UPDATE {model._meta.db_table} SET search_document = %s WHERE {pk_field.column} = %s",
+            list(zip(documents.values(), object_ids)),
+        )
+
+    if connection.vendor == 'sqlite':
+        remove_documents(model, list(documents))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {search_table(model)} (object_id, document) VALUES (%s, %s)",
+                list(zip(object_ids, documents.values())),
+            )
+
+
+def _object_ids(model: Type[models.Model], pks: Sequence[Any], connection: BaseDatabaseWrapper) -> List[Any]:
+    # The FTS5 table stores primary keys as they are stored in the table of the model.
+    pk_field = model._meta.pk
+    assert pk_field is not None
+    return [pk_field.get_db_prep_value(pk, connection) for pk in pks]
+
+
+def _join(*parts: Optional[str]) -> str:
+    return ' '.join(part for part in parts if part)
+
+
+def _batches(items: List[T]) -> Iterator[List[T]]:
+    for i in range(0, len(items), BATCH_SIZE):
+        yield items[i:i + BATCH_SIZE]
+
+
+class SearchDocumentFilter(filters.SearchFilter):
+    """
+    Search the documents of assets or nodes with the ``?search=`` parameter.
+
+    Unlike SearchFilter, this does not use the search_fields of the view.
+    """
+
+    def filter_queryset(
+        self,
+        request: Request,
+        queryset: 'models.QuerySet[Any]',
+        view: APIView,
+    ) -> 'models.QuerySet[Any]':
+        return search(queryset, ' '.join(self.get_search_terms(request)))
+
+    def to_html(self, request: Request, queryset: Iterable[Any], view: APIView) -> str:
+        terms = self.get_search_terms(request)
+        context = {
+            'param': self.search_param,
+            'term': terms[0] if terms else '',
+        }
+        return loader.get_template(self.template).render(context)
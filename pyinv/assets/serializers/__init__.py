@@ -3,6 +3,11 @@ from .asset import (
     AssetSerializer,
     AssetWithNodeSerializer,
 )
+from .asset_code import (
+    AssetCodeGenerationSerializer,
+    GeneratedAssetCodeSerializer,
+    ResolvedAssetCodeSerializer,
+)
 from .asset_event import (
     AssetEventSerializer,
     AssetEventTimelineSerializer,
@@ -15,12 +20,15 @@ from .changeset import (
     ChangeSetSerializerWithCountSerializer,
 )
 from .manufacturer import ManufacturerLinkSerializer, ManufacturerSerializer
+from .metrics import ResponseCacheStatsSerializer
 from .node import NodeSerializer
 from .node_link import NodeLinkSerializer, NodeLinkWithParentSerializer
+from .node_move import NodeMoveSerializer
 
 __all__ = [
     "AssetSerializer",
     "AssetLinkSerializer",
+    "AssetCodeGenerationSerializer",
     "AssetEventSerializer",
     "AssetEventWithoutChangeSetSerializer",
     "AssetEventWithAssetSerializer",
@@ -30,11 +38,15 @@ __all__ = [
     "AssetModelSerializer",
     "ChangeSetSerializer",
     "ChangeSetSerializerWithCountSerializer",
+    "GeneratedAssetCodeSerializer",
     "ManufacturerLinkSerializer",
     "ManufacturerSerializer",
     "AssetNodeLinkSerializer",
     "AssetNodeParentLinkSerializer",
     "NodeLinkSerializer",
     "NodeLinkWithParentSerializer",
+    "NodeMoveSerializer",
     "NodeSerializer",
+    "ResolvedAssetCodeSerializer",
+    "ResponseCacheStatsSerializer",
 ]
@@ -1,24 +1,29 @@
 from rest_framework import serializers
 
+from assets.display_names import asset_lookups
 from assets.models import Asset
 
 from .asset_model import AssetModelLinkSerializer
 from .node_link import NodeLinkWithParentSerializer
+from .prefetch import PrefetchListSerializer, PrefetchModelSerializer
 
 
-class AssetLinkSerializer(serializers.ModelSerializer):
+class AssetLinkSerializer(PrefetchModelSerializer):
 
     id = serializers.UUIDField(read_only=True)  # noqa: A003
 
+    prefetch_lookups = {'display_name': asset_lookups()}
+
     class Meta:
         model = Asset
+        list_serializer_class = PrefetchListSerializer
         fields = (
             'id',
             'display_name',
         )
 
 
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(PrefetchModelSerializer):
     """Serializer for Asset objects."""
 
     id = serializers.UUIDField(read_only=True)  # noqa: A003
@@ -28,8 +33,16 @@ class AssetSerializer(serializers.ModelSerializer):
     updated_at = serializers.DateTimeField(read_only=True)
     extra_data = serializers.JSONField(default=dict, required=False)
 
+    prefetch_lookups = {
+        'display_name': asset_lookups(),
+        'asset_model': ['asset_model'],
+        'asset_codes': ['assetcode_set'],
+        'first_asset_code': ['assetcode_set'],
+    }
+
     class Meta:
         model = Asset
+        list_serializer_class = PrefetchListSerializer
         fields = (
             'id',
             'display_name',
@@ -49,6 +62,7 @@ class AssetWithNodeSerializer(AssetSerializer):
 
     class Meta:
         model = Asset
+        list_serializer_class = PrefetchListSerializer
         fields = AssetSerializer.Meta.fields + (
             'node',
         )
@@ -0,0 +1,57 @@
+from typing import Any, Dict
+
+from rest_framework import serializers
+
+from assets.asset_codes import ASSET_CODE_TYPE_CHOICES, AssetCodeType
+from assets.models import Asset
+
+from .asset import AssetWithNodeSerializer
+
+MAX_GENERATE_CODES = 10000
+
+
+class ResolvedAssetCodeSerializer(serializers.Serializer):
+    """A scanned asset code, and the asset that it resolved to."""
+
+    code = serializers.CharField(read_only=True)
+    asset = AssetWithNodeSerializer(read_only=True, allow_null=True)
+
+
+class AssetCodeGenerationSerializer(serializers.Serializer):
+    """
+    Asset codes to generate.
+
+    Either a count of codes to reserve without assigning them, or the assets to
+    generate a code for each of.
+    """
+
+    code_type = serializers.ChoiceField(choices=ASSET_CODE_TYPE_CHOICES)
+    prefix = serializers.CharField(required=False)
+    count = serializers.IntegerField(required=False, min_value=1, max_value=MAX_GENERATE_CODES)
+    assets = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        min_length=1,
+        max_length=MAX_GENERATE_CODES,
+    )
+
+    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch the assets in a single query."""
+        if ('count' in data) == ('assets' in data):
+            raise serializers.ValidationError("Exactly one of count and assets is required.")
+        data['code_type'] = AssetCodeType(data['code_type'])
+        if 'assets' in data:
+            assets = Asset.objects.in_bulk(data['assets'])
+            if len(assets) != len(set(data['assets'])):
+                raise serializers.ValidationError({'assets': "Some assets do not exist."})
+            if len(assets) != len(data['assets']):
+                raise serializers.ValidationError({'assets': "Assets must not be repeated."})
+            data['assets'] = [assets[pk] for pk in data['assets']]
+        return data
+
+
+class GeneratedAssetCodeSerializer(serializers.Serializer):
+    """A generated asset code, and the asset it was assigned to, if any."""
+
+    code = serializers.CharField(read_only=True)
+    asset = serializers.UUIDField(read_only=True, allow_null=True)
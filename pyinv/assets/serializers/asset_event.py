@@ -4,9 +4,10 @@ from assets.models import AssetEvent
 
 from .asset import AssetLinkSerializer
 from .changeset import ChangeSetSerializer
+from .prefetch import PrefetchListSerializer, PrefetchModelSerializer
 
 
-class AssetEventWithoutChangeSetSerializer(serializers.ModelSerializer):
+class AssetEventWithoutChangeSetSerializer(PrefetchModelSerializer):
 
     id = serializers.UUIDField(read_only=True)  # noqa: A003
     event_type = serializers.ChoiceField(AssetEvent.AssetEventType, read_only=True)
@@ -14,6 +15,7 @@ class AssetEventWithoutChangeSetSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = AssetEvent
+        list_serializer_class = PrefetchListSerializer
         fields = ('id', 'event_type', 'event_data')
 
 
@@ -23,6 +25,7 @@ class AssetEventTimelineSerializer(AssetEventWithoutChangeSetSerializer):
 
     class Meta:
         model = AssetEvent
+        list_serializer_class = PrefetchListSerializer
         fields = ('id', 'event_type', 'asset', 'event_data')
 
 
@@ -32,6 +35,7 @@ class AssetEventSerializer(AssetEventWithoutChangeSetSerializer):
 
     class Meta:
         model = AssetEvent
+        list_serializer_class = PrefetchListSerializer
         fields = ('id', 'changeset', 'event_type', 'event_data')
 
 
@@ -41,4 +45,5 @@ class AssetEventWithAssetSerializer(AssetEventSerializer):
 
     class Meta:
         model = AssetEvent
+        list_serializer_class = PrefetchListSerializer
         fields = ('id', 'changeset', 'event_type', 'asset', 'event_data')
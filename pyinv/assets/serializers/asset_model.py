@@ -6,9 +6,10 @@ from assets.models import AssetModel, Manufacturer, Node
 from pyinv.api_exceptions import UnableToChangeContainerState
 
 from .manufacturer import ManufacturerLinkSerializer
+from .sparse import SparseModelSerializer
 
 
-class AssetModelLinkSerializer(serializers.ModelSerializer):
+class AssetModelLinkSerializer(SparseModelSerializer):
     """Serializer with enough information to link to an asset model."""
 
     class Meta:
@@ -16,7 +17,7 @@ class AssetModelLinkSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class AssetModelSerializer(serializers.ModelSerializer):
+class AssetModelSerializer(SparseModelSerializer):
     """Serializer for AssetModel objects."""
     slug = serializers.CharField(allow_null=True, required=False)
     manufacturer = ManufacturerLinkSerializer(read_only=True)
@@ -3,16 +3,24 @@ from rest_framework import serializers
 
 from assets.models import ChangeSet
 
+from .prefetch import PrefetchListSerializer, PrefetchModelSerializer
 
-class ChangeSetSerializer(serializers.ModelSerializer):
+
+class ChangeSetSerializer(PrefetchModelSerializer):
 
     id = serializers.UUIDField(read_only=True)  # noqa: A003
     timestamp = serializers.DateTimeField(read_only=True)
     user = UserLinkSerializer(read_only=True)
     comment = serializers.CharField(read_only=True)
 
+    prefetch_lookups = {
+        'display_name': ['user'],
+        'user': ['user'],
+    }
+
     class Meta:
         model = ChangeSet
+        list_serializer_class = PrefetchListSerializer
         fields = ('id', 'timestamp', 'display_name', 'user', 'comment')
 
 
@@ -22,4 +30,5 @@ class ChangeSetSerializerWithCountSerializer(ChangeSetSerializer):
 
     class Meta:
         model = ChangeSet
+        list_serializer_class = PrefetchListSerializer
         fields = ('id', 'timestamp', 'display_name', 'user', 'comment', 'event_count')
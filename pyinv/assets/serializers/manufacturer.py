@@ -2,8 +2,10 @@ from rest_framework import serializers
 
 from assets.models import Manufacturer
 
+from .sparse import SparseModelSerializer
 
-class ManufacturerLinkSerializer(serializers.ModelSerializer):
+
+class ManufacturerLinkSerializer(SparseModelSerializer):
     """Serializer with enough information to display a link to a manufacturer."""
 
     slug = serializers.CharField(allow_null=True, required=False)
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+
+class ResponseCacheStatsSerializer(serializers.Serializer):
+    """How well the shared response cache is working."""
+
+    hits = serializers.IntegerField(read_only=True)
+    misses = serializers.IntegerField(read_only=True)
+    hit_ratio = serializers.FloatField(read_only=True)
+    time_saved = serializers.FloatField(
+        read_only=True,
+        help_text="The time spent building the responses that were served from the cache, in seconds.",
+    )
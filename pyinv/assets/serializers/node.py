@@ -1,9 +1,12 @@
+from typing import Any, Sequence
+
 from rest_framework import serializers
 
 from assets.models import Node
 
 from .asset import AssetSerializer
 from .node_link import NodeLinkSerializer
+from .prefetch import PrefetchListSerializer
 
 
 class NodeSerializer(NodeLinkSerializer):
@@ -15,8 +18,26 @@ class NodeSerializer(NodeLinkSerializer):
     ancestors = serializers.ListField(child=NodeLinkSerializer(), read_only=True)
     depth = serializers.IntegerField(read_only=True)
 
+    collapsed_fields = {
+        'asset': serializers.UUIDField(source='asset_id', read_only=True, allow_null=True),
+        'ancestors': serializers.PrimaryKeyRelatedField(
+            many=True,
+            read_only=True,
+            pk_field=serializers.UUIDField(),
+        ),
+    }
+
+    def prefetch(self, instances: Sequence[Any]) -> None:
+        if 'ancestors' in self.rendered_fields:
+            ancestors = Node.prefetch_ancestors(instances)
+            if self.selection.expands('ancestors'):
+                ancestor_serializer: NodeLinkSerializer = getattr(self.fields['ancestors'], 'child')
+                ancestor_serializer.prefetch(ancestors)
+        super().prefetch(instances)
+
     class Meta:
         model = Node
+        list_serializer_class = PrefetchListSerializer
         fields = NodeLinkSerializer.Meta.fields + (
             'name',
             'asset',
@@ -1,9 +1,14 @@
+from typing import Any, Sequence
+
 from rest_framework import serializers
 
+from assets.display_names import node_lookups
 from assets.models import Node, NodeType
 
+from .prefetch import PrefetchListSerializer, PrefetchModelSerializer
+
 
-class NodeLinkSerializer(serializers.ModelSerializer):
+class NodeLinkSerializer(PrefetchModelSerializer):
     """Serializer with enough information to link to a node."""
 
     id = serializers.UUIDField(read_only=True)  # noqa: A003
@@ -12,8 +17,14 @@ class NodeLinkSerializer(serializers.ModelSerializer):
     is_container = serializers.BooleanField(read_only=True)
     numchild = serializers.IntegerField(read_only=True)
 
+    prefetch_lookups = {
+        'display_name': node_lookups(),
+        'is_container': ['asset__asset_model'],
+    }
+
     class Meta:
         model = Node
+        list_serializer_class = PrefetchListSerializer
         fields = ('id', 'display_name', 'node_type', 'numchild', 'is_container')
 
 
@@ -21,8 +32,18 @@ class NodeLinkWithParentSerializer(NodeLinkSerializer):
 
     parent = NodeLinkSerializer(read_only=True)
 
+    collapsed_fields = {
+        'parent': serializers.UUIDField(source='parent.id', read_only=True, allow_null=True),
+    }
+
+    def prefetch(self, instances: Sequence[Any]) -> None:
+        if 'parent' in self.rendered_fields:
+            Node.prefetch_ancestors(instances)
+        super().prefetch(instances)
+
     class Meta:
         model = Node
+        list_serializer_class = PrefetchListSerializer
         fields = NodeLinkSerializer.Meta.fields + (
             'parent',
         )
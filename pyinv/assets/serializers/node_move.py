@@ -0,0 +1,50 @@
+from typing import Any, Dict
+
+from rest_framework import serializers
+
+from assets.models import Asset, Node
+
+MAX_MOVE_ITEMS = 1000
+
+
+class NodeMoveSerializer(serializers.Serializer):
+    """Nodes and assets to move into a target node."""
+
+    target = serializers.UUIDField()
+    nodes = serializers.ListField(child=serializers.UUIDField(), default=list, max_length=MAX_MOVE_ITEMS)
+    assets = serializers.ListField(child=serializers.UUIDField(), default=list, max_length=MAX_MOVE_ITEMS)
+    comment = serializers.CharField(default="", allow_blank=True)
+
+    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch the nodes and assets, each in a single query."""
+        target = Node.objects.select_related('asset__asset_model').filter(pk=data['target']).first()
+        if target is None:
+            raise serializers.ValidationError({'target': "Node does not exist."})
+        if not target.is_container:
+            raise serializers.ValidationError({'target': "Node cannot contain assets."})
+
+        nodes = Node.objects.in_bulk(data['nodes'])
+        assets = Asset.objects.in_bulk(data['assets'])
+        errors = {}
+        if len(nodes) != len(set(data['nodes'])):
+            errors['nodes'] = "Some nodes do not exist."
+        elif any(target.path.startswith(node.path) for node in nodes.values()):
+            errors['nodes'] = "Cannot move a node into itself or one of its descendants."
+        if len(assets) != len(set(data['assets'])):
+            errors['assets'] = "Some assets do not exist."
+        elif any(
+            target.path.startswith(path)
+            for path in Node.objects.filter(asset__in=list(assets)).values_list('path', flat=True)
+        ):
+            errors['assets'] = "Cannot move an asset into itself or one of its descendants."
+        if errors:
+            raise serializers.ValidationError(errors)
+        if not nodes and not assets:
+            raise serializers.ValidationError("There are no nodes or assets to move.")
+
+        return {
+            'target': target,
+            'nodes': list(nodes.values()),
+            'assets': list(assets.values()),
+            'comment': data['comment'],
+        }
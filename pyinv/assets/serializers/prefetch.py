@@ -0,0 +1,69 @@
+from typing import Any, List, Mapping, Sequence, Type
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+
+from assets import reference_data
+from assets.display_names import Lookup
+
+from .sparse import SparseModelSerializer
+
+
+class PrefetchListSerializer(serializers.ListSerializer):
+    """Serialize a list of objects, prefetching related objects for the whole list at once."""
+
+    child: 'PrefetchModelSerializer'
+
+    def to_representation(self, data: Any) -> List[Any]:
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        instances = list(iterable)
+        self.child.prefetch(instances)
+        return super().to_representation(instances)
+
+
+class PrefetchModelSerializer(SparseModelSerializer):
+    """
+    A model serializer that declares the related objects that it reads.
+
+    Serializers using this base should set ``list_serializer_class`` to
+    ``PrefetchListSerializer`` in their Meta, so that lists are rendered in a
+    constant number of queries.
+    """
+
+    # The lookups needed to render each field, so that fields which are not rendered are not prefetched.
+    prefetch_lookups: Mapping[str, Sequence[Lookup]] = {}
+
+    def prefetch(self, instances: Sequence[Any]) -> None:
+        """
+        Fetch the related objects needed to render the instances, including for nested serializers.
+
+        Subclasses that read data which cannot be prefetched by a lookup can
+        extend this to fetch it in bulk, before calling the parent method.
+        Only the rendered fields are prefetched, and manufacturers and asset
+        models are taken from the reference data cache.
+        """
+        fields = self.rendered_fields
+        nested = [field for field in self._readable_fields if isinstance(field, PrefetchModelSerializer)]
+        relations = [str(field.source) for field in nested if self._is_relation(str(field.source))]
+        lookups = [
+            lookup
+            for name, field_lookups in self.prefetch_lookups.items()
+            if name in fields
+            for lookup in field_lookups
+        ]
+        reference_data.prefetch_related_objects(instances, *dict.fromkeys(lookups), *relations)
+        for field in nested:
+            field.prefetch(self._get_related(instances, str(field.source)))
+
+    def _is_relation(self, name: str) -> bool:
+        try:
+            model: Type[models.Model] = self.Meta.model
+            return bool(model._meta.get_field(name).is_relation)
+        except FieldDoesNotExist:
+            return False
+
+    def _get_related(self, instances: Sequence[Any], source: str) -> List[Any]:
+        # A missing reverse one-to-one relation raises a subclass of AttributeError.
+        related = (getattr(instance, source, None) for instance in instances)
+        return [obj for obj in related if obj is not None]
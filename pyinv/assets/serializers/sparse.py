@@ -0,0 +1,187 @@
+"""
+Sparse fieldsets and expansion of nested objects.
+
+``?fields=`` lists the fields to include in a response, and ``?omit=`` lists
+fields to leave out. Both take comma separated names, with dotted names for
+the fields of nested objects, such as ``?omit=node.parent``. A nested object
+that is named in ``?fields=`` without any of its own fields is included whole.
+
+Related objects that are costly to render are collapsed to links by
+default, which are their IDs, and are only rendered in full when they are
+named in ``?expand=``, such as ``?expand=asset,ancestors`` for nodes.
+
+A field that is not rendered is never read, so the properties and related
+objects behind it are not fetched, and PrefetchModelSerializer only prefetches
+what the rendered fields and expanded objects need. Only the representation
+is affected, so the input accepted by writable serializers does not change.
+"""
+
+from copy import deepcopy
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+)
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import Field
+from rest_framework.request import Request
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+EXPAND_PARAM = 'expand'
+# Serializers given this in their context use it instead of reading the selection from the request.
+SELECTION_CONTEXT_KEY = 'field_selection'
+
+
+def _parse(value: Optional[str]) -> FrozenSet[str]:
+    return frozenset(name.strip() for name in (value or "").split(",") if name.strip())
+
+
+def _nested(names: Iterable[str], name: str) -> FrozenSet[str]:
+    prefix = f"{name}."
+    return frozenset(path[len(prefix):] for path in names if path.startswith(prefix))
+
+
+class FieldSelection(NamedTuple):
+    """The fields chosen for an object, as dotted paths relative to the object."""
+
+    # None selects all fields.
+    include: Optional[FrozenSet[str]] = None
+    omit: FrozenSet[str] = frozenset()
+    expand: FrozenSet[str] = frozenset()
+    # The path of the object in the response, for error messages.
+    prefix: str = ""
+
+    @classmethod
+    def from_request(cls, request: Request) -> 'FieldSelection':
+        return cls(
+            include=_parse(request.query_params.get(FIELDS_PARAM)) or None,
+            omit=_parse(request.query_params.get(OMIT_PARAM)),
+            expand=_parse(request.query_params.get(EXPAND_PARAM)),
+        )
+
+    def selects(self, name: str) -> bool:
+        """Whether the field with this name is rendered."""
+        if name in self.omit:
+            return False
+        return self.include is None or name in self.include or bool(_nested(self.include, name))
+
+    def expands(self, name: str) -> bool:
+        """Whether the field with this name is rendered in full, rather than as a link."""
+        return name in self.expand
+
+    def nested(self, name: str) -> 'FieldSelection':
+        """The selection of the fields of a nested object."""
+        include = None
+        if self.include is not None and name not in self.include:
+            include = _nested(self.include, name)
+        return FieldSelection(
+            include=include,
+            omit=_nested(self.omit, name),
+            expand=_nested(self.expand, name),
+            prefix=f"{self.prefix}{name}.",
+        )
+
+    def check(self, names: Iterable[str], expandable: Iterable[str] = ()) -> None:
+        """
+        Check that every field named at this level exists, and can be expanded if it is expanded.
+
+        :raises rest_framework.exceptions.ValidationError: A named field does not exist.
+        """
+        known = set(names)
+        errors: Dict[str, List[str]] = {}
+        for param, paths in [
+            (FIELDS_PARAM, self.include or frozenset()),
+            (OMIT_PARAM, self.omit),
+            (EXPAND_PARAM, self.expand),
+        ]:
+            for name in sorted({path.split(".")[0] for path in paths} - known):
+                errors.setdefault(param, []).append(f"Unknown field: {self.prefix}{name}")
+        for name in sorted((self.expand & known) - set(expandable)):
+            errors.setdefault(EXPAND_PARAM, []).append(f"Field cannot be expanded: {self.prefix}{name}")
+        if errors:
+            raise ValidationError(errors)
+
+
+# All fields, with no nested objects expanded.
+ALL_FIELDS = FieldSelection()
+
+
+def nested_serializer(field: Field) -> Optional[serializers.BaseSerializer]:
+    """The serializer that renders each value of a field, if it is rendered by a serializer."""
+    child = field.child if isinstance(field, (serializers.ListSerializer, serializers.ListField)) else field
+    return child if isinstance(child, serializers.BaseSerializer) else None
+
+
+class SparseModelSerializer(serializers.ModelSerializer):
+    """
+    A model serializer that only renders the fields chosen in the request.
+
+    The top level serializer of a response reads the selection from the
+    request, and passes the selection of the fields of each nested object on
+    to the nested serializer.
+    """
+
+    # Links to render in place of nested objects, unless the objects are expanded.
+    collapsed_fields: Mapping[str, Field] = {}
+
+    _selection: Optional[FieldSelection] = None
+
+    @property
+    def selection(self) -> FieldSelection:
+        if self._selection is None:
+            self.select(self._request_selection())
+        assert self._selection is not None
+        return self._selection
+
+    def select(self, selection: FieldSelection) -> None:
+        """
+        Choose the fields to render, and which nested objects to expand.
+
+        This must be called before the fields are built, for expansion to take effect.
+
+        :raises rest_framework.exceptions.ValidationError: A chosen field does not exist, or cannot be expanded.
+        """
+        self._selection = selection
+        fields: Dict[str, Field] = {str(field.field_name): field for field in super()._readable_fields}
+        selection.check(fields, self.collapsed_fields)
+        for name, field in fields.items():
+            nested = nested_serializer(field)
+            if isinstance(nested, SparseModelSerializer) and selection.selects(name):
+                nested.select(selection.nested(name))
+
+    def get_fields(self) -> Dict[str, Field]:
+        fields = super().get_fields()
+        selection = self._selection if self._selection is not None else self._request_selection()
+        for name, link in self.collapsed_fields.items():
+            if not selection.expands(name):
+                fields[name] = deepcopy(link)
+        return fields
+
+    @property
+    def rendered_fields(self) -> List[str]:
+        """The names of the fields that are rendered, in order."""
+        return [str(field.field_name) for field in self._readable_fields]
+
+    @property
+    def _readable_fields(self) -> List[Field]:
+        selection = self.selection
+        return [field for field in super()._readable_fields if selection.selects(str(field.field_name))]
+
+    def _request_selection(self) -> FieldSelection:
+        top_level = self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None
+        )
+        if not top_level:
+            return ALL_FIELDS
+        if SELECTION_CONTEXT_KEY in self.context:
+            selection: FieldSelection = self.context[SELECTION_CONTEXT_KEY]
+            return selection
+        request = self.context.get('request')
+        return ALL_FIELDS if request is None else FieldSelection.from_request(request)
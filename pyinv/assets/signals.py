@@ -0,0 +1,122 @@
+"""Keep denormalised data up to date when models change."""
+
+from typing import Any
+
+from django.core.signals import request_started
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from assets import code_resolution, fuzzy, reference_data, search
+from assets.models import (
+    Asset,
+    AssetCode,
+    AssetEvent,
+    AssetModel,
+    ChangeSet,
+    InventoryVersion,
+    Manufacturer,
+    Node,
+)
+
+
+@receiver(post_save, sender=Asset)
+def refresh_asset_search(sender: Any, instance: Asset, raw: bool = False, **kwargs: Any) -> None:
+    if not raw:
+        search.refresh_assets(Asset.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Asset)
+def remove_asset_search(sender: Any, instance: Asset, **kwargs: Any) -> None:
+    search.remove_documents(Asset, [instance.pk])
+
+
+@receiver(post_save, sender=AssetCode)
+@receiver(post_delete, sender=AssetCode)
+def refresh_asset_code_search(sender: Any, instance: AssetCode, raw: bool = False, **kwargs: Any) -> None:
+    if not raw:
+        search.refresh_assets(Asset.objects.filter(pk=instance.asset_id))
+
+
+@receiver(post_save, sender=AssetModel)
+def refresh_asset_model_search(sender: Any, instance: AssetModel, raw: bool = False, **kwargs: Any) -> None:
+    if not raw and not kwargs['created']:
+        search.refresh_assets(Asset.objects.filter(asset_model=instance))
+
+
+@receiver(post_save, sender=Manufacturer)
+def refresh_manufacturer_search(sender: Any, instance: Manufacturer, raw: bool = False, **kwargs: Any) -> None:
+    if not raw and not kwargs['created']:
+        search.refresh_assets(Asset.objects.filter(asset_model__manufacturer=instance))
+
+
+@receiver(post_save, sender=Node)
+def refresh_node_search(sender: Any, instance: Node, raw: bool = False, **kwargs: Any) -> None:
+    if raw:
+        return
+    if instance.asset_id is None:
+        search.refresh_nodes(Node.objects.filter(pk=instance.pk))
+    else:
+        # The document of the asset includes the node name, and is included in the document of the node.
+        search.refresh_assets(Asset.objects.filter(pk=instance.asset_id))
+
+
+@receiver(post_delete, sender=Node)
+def remove_node_search(sender: Any, instance: Node, **kwargs: Any) -> None:
+    search.remove_documents(Node, [instance.pk])
+    if instance.asset_id is not None:
+        search.refresh_assets(Asset.objects.filter(pk=instance.asset_id))
+
+
+@receiver(post_save, sender=AssetCode)
+@receiver(post_delete, sender=AssetCode)
+@receiver(post_save, sender=AssetModel)
+@receiver(post_delete, sender=AssetModel)
+@receiver(post_save, sender=Node)
+@receiver(post_delete, sender=Node)
+def clear_fuzzy_indexes(sender: Any, **kwargs: Any) -> None:
+    fuzzy.clear_indexes()
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+@receiver(post_save, sender=AssetCode)
+@receiver(post_delete, sender=AssetCode)
+@receiver(post_save, sender=AssetModel)
+@receiver(post_delete, sender=AssetModel)
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_delete, sender=Manufacturer)
+@receiver(post_save, sender=Node)
+@receiver(post_delete, sender=Node)
+def clear_code_resolution_cache(sender: Any, **kwargs: Any) -> None:
+    code_resolution.cache.clear()
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+@receiver(post_save, sender=AssetCode)
+@receiver(post_delete, sender=AssetCode)
+@receiver(post_save, sender=AssetModel)
+@receiver(post_delete, sender=AssetModel)
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_delete, sender=Manufacturer)
+@receiver(post_save, sender=Node)
+@receiver(post_delete, sender=Node)
+@receiver(post_save, sender=ChangeSet)
+@receiver(post_delete, sender=ChangeSet)
+@receiver(post_save, sender=AssetEvent)
+@receiver(post_delete, sender=AssetEvent)
+def bump_inventory_version(sender: Any, **kwargs: Any) -> None:
+    InventoryVersion.bump(reference=sender in reference_data.REFERENCE_MODELS)
+
+
+@receiver(post_save, sender=AssetModel)
+@receiver(post_delete, sender=AssetModel)
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_delete, sender=Manufacturer)
+def clear_reference_data(sender: Any, **kwargs: Any) -> None:
+    reference_data.changed()
+
+
+@receiver(request_started)
+def expire_reference_data(sender: Any, **kwargs: Any) -> None:
+    reference_data.expire()
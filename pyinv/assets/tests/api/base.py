@@ -1,9 +1,13 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 from uuid import UUID
 
 from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import dateparse
 
+from assets import reference_data
+
 
 class PermissionsMixin:
 
@@ -18,6 +22,13 @@ class PermissionsMixin:
 
 class APITestCase(PermissionsMixin):
 
+    def count_queries(self, func: Callable[[], Any]) -> int:
+        # The reference data is loaded once by each process, rather than by each request.
+        reference_data.check()
+        with CaptureQueriesContext(connection) as context:
+            func()
+        return len(context)
+
     def assert_like_asset(self, data: Dict[str, Any]) -> None:
         assert data.keys() == {
             'id', 'display_name', 'asset_model', 'asset_codes', 'first_asset_code',
@@ -97,12 +108,17 @@ class APITestCase(PermissionsMixin):
         assert isinstance(data["depth"], int)
         assert isinstance(data["ancestors"], list)
 
-        if data["asset"]:
+        # The asset and ancestors are links, unless they are expanded.
+        if isinstance(data["asset"], dict):
             self.assert_like_asset(data["asset"])
+        elif data["asset"]:
+            assert UUID(data["asset"])
 
-        if data["ancestors"]:
-            for ancestor in data["ancestors"]:
+        for ancestor in data["ancestors"]:
+            if isinstance(ancestor, dict):
                 self.assert_like_node_link(ancestor)
+            else:
+                assert UUID(ancestor)
 
         # Sanity checks
         assert data["asset"] or data["node_type"] == "L"
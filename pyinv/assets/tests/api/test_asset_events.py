@@ -1,9 +1,11 @@
+import csv
+from io import StringIO
 from typing import Any, Dict, Optional
 from uuid import UUID
 
 import pytest
 
-from assets.models import Asset, AssetEvent, ChangeSet
+from assets.models import Asset, AssetEvent, AssetModel, ChangeSet
 from pyinv.tests.client import Client
 
 from .base import APITestCase
@@ -54,6 +56,19 @@ class TestAssetEventListEndpoint(APITestCase):
         assert data["previous"] is None
         assert len(data["results"]) == 2
 
+    @pytest.mark.usefixtures("asset_event")
+    def test_query_count_does_not_grow_with_page_size(self, user_client: Client, changeset2: ChangeSet) -> None:
+        queries = self.count_queries(lambda: self._subject(user_client))
+
+        for asset in Asset.objects.all():
+            asset.assetcode_set.create(code_type="A", code=f"code-{asset.id}")
+        for asset_model in AssetModel.objects.all():
+            for _ in range(3):
+                asset = Asset.objects.create(asset_model=asset_model)
+                changeset2.assetevent_set.create(asset=asset, event_type="CR", data={})
+
+        assert self.count_queries(lambda: self._subject(user_client)) == queries
+
     @pytest.mark.usefixtures("asset_event", "asset_event2")
     def test_multiple_results_multiple_pages(self, user_client: Client) -> None:
         data = self._subject(user_client, params={"limit": "1"})
@@ -117,6 +132,26 @@ class TestAssetEventListEndpoint(APITestCase):
         assert [d["asset"]["display_name"].split(" ")[0] for d in data["results"]] == ["Bar", "Foo"]
 
 
+@pytest.mark.django_db
+class TestAssetEventStreamingExport(APITestCase):
+    """Test streaming the whole list of asset events as CSV."""
+
+    def test_no_auth(self, api_client: Client) -> None:
+        resp = api_client.get("/api/v1/asset-events/", {"format": "csv"})
+        assert resp.status_code == 403
+        assert resp.content.decode().splitlines() == ["detail", "Authentication credentials were not provided."]
+
+    @pytest.mark.usefixtures("asset_event", "asset_event2")
+    def test_csv(self, user_client: Client) -> None:
+        resp = user_client.get("/api/v1/asset-events/", {"format": "csv"})
+        assert resp.status_code == 200
+        assert resp["Content-Type"] == "text/csv; charset=utf-8"
+        rows = list(csv.DictReader(StringIO(resp.getvalue().decode())))
+        timestamps = [AssetEvent.objects.get(id=row["id"]).changeset.timestamp for row in rows]
+        assert len(rows) == 2
+        assert timestamps == sorted(timestamps)
+
+
 @pytest.mark.django_db
 class TestAssetEventGetIndividualEndpoint(APITestCase):
 
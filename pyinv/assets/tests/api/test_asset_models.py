@@ -85,6 +85,15 @@ class TestAssetModelListEndpoint(APITestCase):
 
         assert data["results"][0]["name"] == "Bar Model"
 
+    @pytest.mark.usefixtures("asset_model", "container_model")
+    def test_filter_by_manufacturer(self, api_client: Client) -> None:
+        data = self._subject(api_client, params={"manufacturer": "wasps"})
+        assert data["count"] == 1
+        assert data["results"][0]["name"] == "Bar Model"
+
+        data = self._subject(api_client, params={"manufacturer": "bees"}, expected_status=400)
+        assert "manufacturer" in data
+
     @pytest.mark.usefixtures("asset_model", "container_model")
     def test_search_by_name_no_results(self, api_client: Client) -> None:
         data = self._subject(api_client, params={"search": "bees"})
@@ -1,8 +1,22 @@
-from typing import Any, Dict, Optional, Union
+import json
+from typing import Any, Dict, List, Optional, Union
 
 import pytest
-
-from assets.models import Asset
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from assets import code_resolution, reference_data
+from assets.models import (
+    Asset,
+    AssetCode,
+    AssetModel,
+    InventoryVersion,
+    Manufacturer,
+    Node,
+)
+from assets.serializers.sparse import ALL_FIELDS
+from pyinv import streaming
 from pyinv.tests.client import Client
 
 from .base import APITestCase
@@ -145,6 +159,54 @@ class TestAssetListEndpoint(APITestCase):
 
         assert data["results"][0]["display_name"] == "node-name"
 
+    @pytest.mark.usefixtures("asset_with_code", "container")
+    def test_fuzzy(self, api_client: Client) -> None:
+        data = self._subject(api_client, params={"fuzzy": "assetcode"})
+        assert data["count"] == 1
+        assert data["results"][0]["display_name"] == "Foo Model (asset-code)"
+
+        data = self._subject(api_client, params={"fuzzy": "bar model"})
+        assert data["count"] == 2
+        assert data["results"][0]["asset_model"]["name"] == "Bar Model"
+
+    @pytest.mark.usefixtures("asset_with_code")
+    def test_query_count_does_not_grow_with_page_size(self, api_client: Client, asset_model: AssetModel) -> None:
+        queries = self.count_queries(lambda: self._subject(api_client))
+
+        for i in range(5):
+            Asset.objects.create(asset_model=asset_model).assetcode_set.create(code_type="A", code=f"code-{i}")
+
+        assert self.count_queries(lambda: self._subject(api_client)) == queries
+
+    @pytest.mark.usefixtures("without_response_cache")
+    def test_query_count_does_not_grow_with_node_depth(self, api_client: Client, container_model: AssetModel) -> None:
+        node = Node.add_root(node_type="L", name="location")
+        for _ in range(2):
+            node = node.add_child(node_type="A", asset=Asset.objects.create(asset_model=container_model))
+        queries = self.count_queries(lambda: self._subject(api_client))
+
+        for _ in range(5):
+            node = node.add_child(node_type="A", asset=Asset.objects.create(asset_model=container_model))
+
+        data = self._subject(api_client)
+        parents = {result["node"]["parent"] for result in data["results"]}
+        assert parents == {str(node.id) for node in Node.objects.filter(numchild__gt=0)}
+        assert self.count_queries(lambda: self._subject(api_client)) == queries
+
+    @pytest.mark.usefixtures("asset")
+    def test_filter_by_unknown_asset_model(self, api_client: Client) -> None:
+        data = self._subject(api_client, params={"asset_model": "bees"}, expected_status=400)
+        assert "asset_model" in data
+
+    @pytest.mark.usefixtures("asset", "without_response_cache")
+    def test_reference_data_not_queried(self, api_client: Client, asset_model: AssetModel) -> None:
+        reference_data.check()
+        with CaptureQueriesContext(connection) as context:
+            data = self._subject(api_client, params={"asset_model": "foo-model"})
+        assert data["results"][0]["asset_model"]["name"] == "Foo Model"
+        tables = (AssetModel._meta.db_table, Manufacturer._meta.db_table)
+        assert not any(table in query["sql"] for query in context.captured_queries for table in tables)
+
 
 @pytest.mark.django_db
 class TestAssetGetIndividualEndpoint(APITestCase):
@@ -162,3 +224,267 @@ class TestAssetGetIndividualEndpoint(APITestCase):
 
         result = resp.json()
         self.assert_like_asset_with_node(result)
+
+
+@pytest.mark.django_db
+class TestAssetResolveEndpoint(APITestCase):
+    """Test the endpoint for resolving asset codes to assets."""
+
+    def _subject(self, api_client: Client, codes: List[str], *, expected_status: int = 200) -> Any:
+        response = api_client.get("/api/v1/assets/resolve/", {"code": codes})
+        assert response.status_code == expected_status
+        return response.json()
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self) -> None:
+        code_resolution.cache.clear()
+
+    def test_resolve(self, api_client: Client, asset_with_code: Asset, asset: Asset) -> None:
+        data = self._subject(api_client, ["asset-code", "bees", str(asset.id)])
+        assert [result["code"] for result in data] == ["asset-code", "bees", str(asset.id)]
+        assert data[0]["asset"]["id"] == str(asset_with_code.id)
+        assert data[0]["asset"]["node"] is None
+        assert data[1]["asset"] is None
+        assert data[2]["asset"]["id"] == str(asset.id)
+
+    def test_normalised(self, api_client: Client, asset: Asset) -> None:
+        asset.assetcode_set.create(code_type="D", code="INV-DRE-XY2")
+        data = self._subject(api_client, ["invdrexy2", " INV-DRE-XY2 "])
+        assert [result["asset"]["id"] for result in data] == [str(asset.id)] * 2
+
+    def test_exact_match_preferred(self, api_client: Client, asset: Asset, container: Asset) -> None:
+        asset.assetcode_set.create(code_type="D", code="INV-DRE-XY2")
+        container.assetcode_set.create(code_type="A", code="INVDREXY2")
+        data = self._subject(api_client, ["INVDREXY2", "INV-DRE-XY2"])
+        assert [result["asset"]["id"] for result in data] == [str(container.id), str(asset.id)]
+
+    def test_cached(self, api_client: Client, asset_with_code: Asset) -> None:
+        self._subject(api_client, ["asset-code"])
+        # Only the inventory version is read.
+        assert self.count_queries(lambda: self._subject(api_client, ["asset-code"])) == 1
+
+    def test_cache_invalidated(self, api_client: Client, asset_with_code: Asset, location: Node) -> None:
+        assert self._subject(api_client, ["asset-code", "new-code"])[1]["asset"] is None
+
+        asset_with_code.assetcode_set.create(code_type="A", code="new-code")
+        location.add_child(node_type="A", asset=asset_with_code)
+        data = self._subject(api_client, ["asset-code", "new-code"])
+        assert data[0]["asset"]["node"]["parent"] == str(location.id)
+        assert data[1]["asset"]["id"] == str(asset_with_code.id)
+
+    def test_cache_invalidated_by_version(self, api_client: Client, asset_with_code: Asset, asset: Asset) -> None:
+        assert self._subject(api_client, ["asset-code"])[0]["asset"]["id"] == str(asset_with_code.id)
+
+        # As changed by another process, without signals in this one.
+        AssetCode.objects.filter(code="asset-code").update(asset=asset)
+        InventoryVersion.bump()
+        assert self._subject(api_client, ["asset-code"])[0]["asset"]["id"] == str(asset.id)
+
+    def test_stale_values_not_cached(self, asset_with_code: Asset) -> None:
+        code_resolution.cache.check(2)
+        code_resolution.cache.set_many({("asset-code", ALL_FIELDS): None}, version=1)
+        assert len(code_resolution.cache) == 0
+
+    def test_query_count_does_not_grow_with_codes(self, api_client: Client, asset_model: AssetModel) -> None:
+        codes = []
+        for i in range(5):
+            Asset.objects.create(asset_model=asset_model).assetcode_set.create(code_type="A", code=f"code-{i}")
+            codes.append(f"code-{i}")
+        queries = self.count_queries(lambda: self._subject(api_client, codes[:1]))
+        code_resolution.cache.clear()
+        assert self.count_queries(lambda: self._subject(api_client, codes)) == queries
+
+    def test_no_codes(self, api_client: Client) -> None:
+        self._subject(api_client, [], expected_status=400)
+
+    def test_too_many_codes(self, api_client: Client) -> None:
+        self._subject(api_client, ["code"] * 501, expected_status=400)
+
+
+@pytest.mark.django_db
+class TestAssetGenerateCodesEndpoint(APITestCase):
+    """Test the endpoint for generating asset codes in bulk."""
+
+    _subject = "/api/v1/assets/generate-codes/"
+    _permission = "add_assetcode"
+
+    def test_no_auth(self, api_client: Client) -> None:
+        resp = api_client.post(self._subject)
+        assert resp.status_code == 403
+        assert resp.json() == {'detail': 'Authentication credentials were not provided.'}
+
+    def test_no_perms(self, user_client: Client) -> None:
+        resp = user_client.post(self._subject)
+        assert resp.status_code == 403
+        assert resp.json() == {'detail': 'You do not have permission to perform this action.'}
+
+    def test_reserve(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, {"code_type": "D", "count": 3}, format="json")
+        assert resp.status_code == 201
+        data = resp.json()
+        assert len({row["code"] for row in data}) == 3
+        assert all(row["asset"] is None for row in data)
+        assert not AssetCode.objects.exists()
+
+        # Reserved codes are not generated again.
+        resp = user_client.post(self._subject, {"code_type": "D", "count": 3}, format="json")
+        assert not {row["code"] for row in data} & {row["code"] for row in resp.json()}
+
+    def test_assign(self, user_client: Client, user: User, asset: Asset, container: Asset) -> None:
+        self._set_permission(user)
+        resp = user_client.post(
+            self._subject,
+            {"code_type": "D", "assets": [str(container.id), str(asset.id)]},
+            format="json",
+        )
+        assert resp.status_code == 201
+        data = resp.json()
+        assert [row["asset"] for row in data] == [str(container.id), str(asset.id)]
+        asset_code = AssetCode.objects.get(asset=asset)
+        assert asset_code.code == data[1]["code"]
+        assert asset_code.normalised_code == asset_code.code.replace("-", "")
+        assert Asset.objects.filter(search_document__contains=asset_code.code).get() == asset
+
+    def test_csv(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        resp = user_client.post(f"{self._subject}?format=csv", {"code_type": "D", "count": 2}, format="json")
+        assert resp.status_code == 201
+        assert resp["Content-Type"] == "text/csv; charset=utf-8"
+        lines = resp.content.decode().splitlines()
+        assert lines[0] == "code,asset"
+        assert len(lines) == 3
+        assert all(line.startswith("INV-") and line.endswith(",") for line in lines[1:])
+
+    @pytest.mark.parametrize("body,error", [
+        ({"code_type": "D"}, {"non_field_errors": ["Exactly one of count and assets is required."]}),
+        ({"code_type": "S", "count": 1}, ["Unable to generate an asset code of that type."]),
+        (
+            {"code_type": "D", "count": 1, "prefix": "BEE"},
+            ["Provided prefix is not valid: ['Invalid asset code prefix: BEE']"],
+        ),
+    ])
+    def test_invalid(self, user_client: Client, user: User, body: Dict[str, Any], error: Any) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, body, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == error
+
+    def test_missing_assets(self, user_client: Client, user: User, asset_model: AssetModel) -> None:
+        self._set_permission(user)
+        resp = user_client.post(
+            self._subject,
+            {"code_type": "D", "assets": ["c7d6e2a8-0c4a-4d8e-9a4b-3b0b0e6e8f1a"]},
+            format="json",
+        )
+        assert resp.status_code == 400
+        assert resp.json() == {"assets": ["Some assets do not exist."]}
+
+    def test_query_count_does_not_grow_with_count(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        user_client.post(self._subject, {"code_type": "D", "count": 1}, format="json")
+        queries = self.count_queries(
+            lambda: user_client.post(self._subject, {"code_type": "D", "count": 1}, format="json"),
+        )
+        assert self.count_queries(
+            lambda: user_client.post(self._subject, {"code_type": "D", "count": 200}, format="json"),
+        ) == queries
+
+
+@pytest.mark.django_db
+class TestAssetStreamingExport(APITestCase):
+    """Test streaming the whole list of assets as CSV or NDJSON, and large pages of JSON."""
+
+    _subject = "/api/v1/assets/"
+    _header = "id,display_name,asset_model,asset_codes,first_asset_code,created_at,updated_at,extra_data,node"
+
+    def _stream(self, api_client: Client, params: Dict[str, Any]) -> str:
+        resp = api_client.get(self._subject, params)
+        assert resp.status_code == 200
+        assert resp.streaming
+        return resp.getvalue().decode()
+
+    def test_ndjson(self, api_client: Client, asset_with_code: Asset, container: Asset) -> None:
+        text = self._stream(api_client, {"format": "ndjson"})
+        rows = [json.loads(line) for line in text.splitlines()]
+        # The same rows as the list, in keyset order.
+        listed = api_client.get(self._subject, {"pagination": "cursor"}).json()["results"]
+        assert rows == listed
+        for row in rows:
+            self.assert_like_asset_with_node(row)
+
+    def test_csv(self, api_client: Client, asset_with_code: Asset) -> None:
+        text = self._stream(api_client, {"format": "csv"})
+        header, row = text.splitlines()
+        assert header == self._header
+        assert row.startswith(f"{asset_with_code.id},Foo Model (asset-code),")
+
+    def test_csv_empty(self, api_client: Client) -> None:
+        assert self._stream(api_client, {"format": "csv"}).splitlines() == [self._header]
+
+    def test_filters(self, api_client: Client, asset: Asset, container: Asset) -> None:
+        text = self._stream(api_client, {"format": "ndjson", "is_container": True})
+        assert [json.loads(line)["id"] for line in text.splitlines()] == [str(container.id)]
+
+    def test_no_count(self, api_client: Client, asset_model: AssetModel) -> None:
+        Asset.objects.bulk_create([Asset(asset_model=asset_model) for _ in range(3)])
+        queries = self.count_queries(lambda: self._stream(api_client, {"format": "ndjson"}))
+        Asset.objects.bulk_create([Asset(asset_model=asset_model) for _ in range(20)])
+        with CaptureQueriesContext(connection) as context:
+            text = self._stream(api_client, {"format": "ndjson"})
+        assert len(text.splitlines()) == 23
+        assert len(context) == queries
+        assert not any("COUNT(" in query["sql"] for query in context.captured_queries)
+
+    @pytest.mark.parametrize("params", [{}, {"pagination": "cursor"}])
+    @pytest.mark.usefixtures("without_response_cache")
+    def test_json_page(
+        self,
+        api_client: Client,
+        settings: Any,
+        monkeypatch: pytest.MonkeyPatch,
+        asset_model: AssetModel,
+        params: Dict[str, str],
+    ) -> None:
+        Asset.objects.bulk_create([Asset(asset_model=asset_model, extra_data={"n": i}) for i in range(5)])
+        settings.JSON_STREAMING_THRESHOLD = 0
+        expected = api_client.get(self._subject, params)
+        assert not expected.streaming
+
+        # Large pages are encoded in batches, to the same JSON.
+        settings.JSON_STREAMING_THRESHOLD = 3
+        monkeypatch.setattr(streaming, "BATCH_SIZE", 2)
+        resp = api_client.get(self._subject, params)
+        assert resp.status_code == 200
+        assert resp.streaming
+        assert resp["Content-Type"] == "application/json"
+        assert resp.getvalue() == expected.content
+
+        assert not api_client.get(self._subject, {**params, "limit": "2"}).streaming
+
+    def test_json_page_indented(self, api_client: Client, settings: Any, asset: Asset) -> None:
+        settings.JSON_STREAMING_THRESHOLD = 1
+        resp = api_client.get(self._subject, HTTP_ACCEPT="application/json; indent=4")
+        assert not resp.streaming
+        assert resp.content.startswith(b'{\n    "count": 1')
+
+
+@pytest.mark.django_db
+class TestAssetSroboExportEndpoint:
+    """Test the endpoint for exporting the inventory in Student Robotics format."""
+
+    _subject = "/api/v1/assets/srobo-export/"
+
+    def test_export(self, api_client: Client, asset_with_code: Asset) -> None:
+        Node.add_root(node_type="L", name="hq").add_child(node_type="A", asset=asset_with_code)
+        resp = api_client.get(self._subject)
+        assert resp.status_code == 200
+        assert resp["Content-Type"] == "application/json"
+        assert resp.streaming
+        assert json.loads(resp.getvalue()) == {
+            "0": {"type": "location", "data": ["unknown-location", "."]},
+            "1": {"type": "location", "data": ["hq", "."]},
+            "2": {"type": "asset", "data": {
+                "asset_code": "asset-code", "asset_type": "Foo Model", "data": {}, "location": "hq",
+            }},
+        }
@@ -0,0 +1,84 @@
+from typing import Any
+
+import pytest
+
+from assets.models import Asset, AssetEvent, AssetModel, ChangeSet, Node
+from pyinv.tests.client import Client
+
+from .base import APITestCase
+
+
+@pytest.mark.django_db
+class TestETags(APITestCase):
+    """Test conditional GET requests using the version of the inventory."""
+
+    @pytest.mark.usefixtures("location")
+    def test_not_modified(self, api_client: Client) -> None:
+        response = api_client.get("/api/v1/nodes/")
+        assert response.status_code == 200
+        etag = response["ETag"]
+
+        def conditional_get() -> None:
+            response = api_client.get("/api/v1/nodes/", HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304
+            assert response["ETag"] == etag
+            assert response.content == b""
+
+        # Only the inventory version is read.
+        assert self.count_queries(conditional_get) == 1
+
+    def test_changed_by_write(self, api_client: Client, location: Node, asset_model: AssetModel) -> None:
+        etag = api_client.get("/api/v1/nodes/")["ETag"]
+        location.add_child(node_type="A", asset=Asset.objects.create(asset_model=asset_model))
+
+        response = api_client.get("/api/v1/nodes/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert response.json()["count"] == 2
+
+    def test_changed_by_event(self, user_client: Client, asset: Asset, changeset: ChangeSet) -> None:
+        # Events can be added to an existing changeset, such as in the admin.
+        etag = user_client.get("/api/v1/asset-events/")["ETag"]
+        event = AssetEvent.objects.create(
+            changeset=changeset, asset=asset, event_type=AssetEvent.AssetEventType.CREATE, data={},
+        )
+
+        response = user_client.get("/api/v1/asset-events/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert response.json()["count"] == 1
+
+        etag = response["ETag"]
+        event.delete()
+        response = user_client.get("/api/v1/asset-events/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["count"] == 0
+
+    def test_depends_on_request(self, api_client: Client, location: Node) -> None:
+        etags = {
+            api_client.get("/api/v1/nodes/")["ETag"],
+            api_client.get("/api/v1/nodes/", {"parent": "root"})["ETag"],
+            api_client.get("/api/v1/nodes/", {"format": "csv"})["ETag"],
+            api_client.get(f"/api/v1/nodes/{location.id}/")["ETag"],
+        }
+        assert len(etags) == 4
+
+    def test_depends_on_host(self, api_client: Client, location: Node, settings: Any) -> None:
+        # Links to other pages are built from the scheme and host.
+        settings.ALLOWED_HOSTS = ["internal", "inventory.example.org"]
+        etags = {
+            api_client.get("/api/v1/nodes/", HTTP_HOST="internal:8000")["ETag"],
+            api_client.get("/api/v1/nodes/", HTTP_HOST="inventory.example.org")["ETag"],
+            api_client.get("/api/v1/nodes/", HTTP_HOST="inventory.example.org", secure=True)["ETag"],
+        }
+        assert len(etags) == 3
+
+    def test_detail(self, api_client: Client, asset: Asset) -> None:
+        etag = api_client.get(f"/api/v1/assets/{asset.id}/")["ETag"]
+        response = api_client.get(f"/api/v1/assets/{asset.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_not_found_untagged(self, api_client: Client) -> None:
+        response = api_client.get("/api/v1/assets/000/")
+        assert response.status_code == 404
+        assert "ETag" not in response
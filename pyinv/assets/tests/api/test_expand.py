@@ -0,0 +1,78 @@
+from typing import Any, Dict
+
+import pytest
+
+from assets import code_resolution
+from assets.models import Asset, AssetModel, Node
+from pyinv.tests.client import Client
+
+from .base import APITestCase
+
+
+@pytest.mark.django_db
+class TestExpand(APITestCase):
+    """Test expanding nested objects with ?expand=."""
+
+    def _get(self, api_client: Client, url: str, params: Dict[str, str], *, expected_status: int = 200) -> Any:
+        response = api_client.get(url, params)
+        assert response.status_code == expected_status
+        return response.json()
+
+    @pytest.fixture
+    def container(self, location: Node, container_model: AssetModel) -> Asset:
+        container = Asset.objects.create(asset_model=container_model)
+        container.assetcode_set.create(code_type="A", code="container-code")
+        location.add_child(node_type="A", asset=container)
+        return container
+
+    def test_nodes_collapsed(self, api_client: Client, location: Node, container: Asset) -> None:
+        data = self._get(api_client, "/api/v1/nodes/", {})
+        result = data["results"][1]
+        assert result["asset"] == str(container.id)
+        assert result["ancestors"] == [str(location.id)]
+        assert data["results"][0]["asset"] is None
+
+    def test_nodes_expanded(self, api_client: Client, location: Node, container: Asset) -> None:
+        data = self._get(api_client, "/api/v1/nodes/", {"expand": "asset,ancestors"})
+        result = data["results"][1]
+        self.assert_like_asset(result["asset"])
+        assert result["asset"]["id"] == str(container.id)
+        assert [ancestor["display_name"] for ancestor in result["ancestors"]] == ["location"]
+
+    def test_collapsed_ancestors_not_fetched(self, api_client: Client, container: Asset, asset: Asset) -> None:
+        container.node.add_child(node_type="A", asset=asset)
+        collapsed = self.count_queries(lambda: self._get(api_client, "/api/v1/nodes/", {}))
+        expanded = self.count_queries(lambda: self._get(api_client, "/api/v1/nodes/", {"expand": "ancestors"}))
+        assert collapsed < expanded
+
+    def test_nested_expansion(self, api_client: Client, location: Node, container: Asset) -> None:
+        data = self._get(api_client, f"/api/v1/assets/{container.id}/", {})
+        assert data["node"]["parent"] == str(location.id)
+
+        data = self._get(api_client, f"/api/v1/assets/{container.id}/", {"expand": "node.parent"})
+        self.assert_like_node_link(data["node"]["parent"])
+        assert data["node"]["parent"]["id"] == str(location.id)
+
+    def test_resolve(self, api_client: Client, location: Node, container: Asset) -> None:
+        code_resolution.cache.clear()
+        params = {"code": "container-code"}
+        data = self._get(api_client, "/api/v1/assets/resolve/", params)
+        assert data[0]["asset"]["node"]["parent"] == str(location.id)
+
+        # Assets are cached separately for each selection.
+        data = self._get(api_client, "/api/v1/assets/resolve/", {**params, "expand": "asset.node.parent"})
+        assert data[0]["asset"]["node"]["parent"]["display_name"] == "location"
+
+    @pytest.mark.parametrize("url,params,errors", [
+        ("/api/v1/nodes/", {"expand": "bees"}, {"expand": ["Unknown field: bees"]}),
+        ("/api/v1/nodes/", {"expand": "depth"}, {"expand": ["Field cannot be expanded: depth"]}),
+        ("/api/v1/assets/", {"expand": "node.wasps"}, {"expand": ["Unknown field: node.wasps"]}),
+        (
+            "/api/v1/assets/resolve/",
+            {"code": "container-code", "expand": "asset.node"},
+            {"expand": ["Field cannot be expanded: asset.node"]},
+        ),
+    ])
+    @pytest.mark.usefixtures("container")
+    def test_invalid(self, api_client: Client, url: str, params: Dict[str, str], errors: Dict[str, Any]) -> None:
+        assert self._get(api_client, url, params, expected_status=400) == errors
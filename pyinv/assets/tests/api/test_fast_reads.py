@@ -0,0 +1,169 @@
+from typing import Any, Dict, Tuple
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from assets.fast_reads import ASSET_COLUMNS, AssetReader, FastList
+from assets.models import (
+    Asset,
+    AssetEvent,
+    AssetModel,
+    ChangeSet,
+    Manufacturer,
+    Node,
+)
+from assets.serializers import AssetSerializer
+from pyinv.tests.client import Client
+
+from .base import APITestCase
+
+
+@pytest.fixture
+def inventory(
+    user: User,
+    manufacturer: Manufacturer,
+    asset_model: AssetModel,
+    container_model: AssetModel,
+) -> None:
+    """An inventory with nested locations and containers, and assets with and without nodes, names and codes."""
+    # Models that share a name have display names qualified with their manufacturer.
+    shared = AssetModel.objects.create(name="Bar Model", manufacturer=manufacturer, slug="shared")
+
+    location = Node.add_root(node_type="L", name="location")
+    shelf = location.add_child(node_type="L", name="shelf")
+    container = Asset.objects.create(asset_model=container_model, extra_data={"colour": "red", "sizes": [1, 2]})
+    container.assetcode_set.create(code_type="A", code="container-b")
+    container.assetcode_set.create(code_type="A", code="container-a")
+    container_node = shelf.add_child(node_type="A", asset=container)
+
+    named = Asset.objects.create(asset_model=asset_model)
+    named.assetcode_set.create(code_type="A", code="named-code")
+    container_node.add_child(node_type="A", asset=named, name="named")
+    container_node.refresh_from_db()
+    container_node.add_child(node_type="A", asset=Asset.objects.create(asset_model=shared))
+    Asset.objects.create(asset_model=asset_model).assetcode_set.create(code_type="A", code="no-node")
+
+    other = User.objects.create(username="other", first_name="Other", last_name="User")
+    for i, (changeset_user, assets) in enumerate([
+        (user, Asset.objects.all()),
+        (other, Asset.objects.filter(node__isnull=False)),
+    ]):
+        changeset = ChangeSet.objects.create(user=changeset_user, timestamp=timezone.now(), comment=f"changes {i}")
+        for asset in assets:
+            AssetEvent.objects.create(changeset=changeset, asset=asset, event_type="MV", data={"to": [i]})
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("inventory", "without_response_cache")
+class TestFastReads(APITestCase):
+    """Test that the fast read path renders the same responses as the serializers."""
+
+    def _get(self, client: Client, settings: Any, url: str, params: Dict[str, str], *, fast: bool) -> Tuple[int, bytes]:
+        settings.FAST_READS = fast
+        response = client.get(url, params)
+        content = response.getvalue() if response.streaming else response.content
+        return response.status_code, content
+
+    def _assert_same(self, client: Client, settings: Any, url: str, params: Dict[str, str]) -> None:
+        expected = self._get(client, settings, url, params, fast=False)
+        assert expected[0] in (200, 400)
+        assert self._get(client, settings, url, params, fast=True) == expected
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"expand": "node.parent"},
+        {"fields": "id,node.parent", "expand": "node.parent"},
+        {"fields": "asset_model,node.display_name"},
+        {"omit": "asset_model.slug,extra_data,node.parent"},
+        {"limit": "2", "offset": "1"},
+        {"pagination": "cursor", "limit": "2"},
+        {"ordering": "-created_at"},
+        {"asset_model": "foo-model"},
+        {"has_node": "false"},
+        {"format": "ndjson", "expand": "node.parent"},
+        {"format": "csv"},
+        {"expand": "bees"},
+        {"fields": "node.wasps"},
+    ])
+    def test_assets(self, api_client: Client, settings: Any, params: Dict[str, str]) -> None:
+        self._assert_same(api_client, settings, "/api/v1/assets/", params)
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"expand": "asset,ancestors"},
+        {"expand": "ancestors", "fields": "name,ancestors.display_name,ancestors.is_container"},
+        {"expand": "asset", "omit": "asset.asset_codes,asset.asset_model.name"},
+        {"fields": "parent"},
+        {"pagination": "cursor", "limit": "3"},
+        {"ordering": "-numchild"},
+        {"is_container": "true"},
+        {"format": "ndjson", "expand": "asset,ancestors"},
+        {"format": "csv"},
+        {"expand": "depth"},
+    ])
+    def test_nodes(self, api_client: Client, settings: Any, params: Dict[str, str]) -> None:
+        self._assert_same(api_client, settings, "/api/v1/nodes/", params)
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"omit": "changeset.user"},
+        {"fields": "asset,changeset.display_name,changeset.user.display_name"},
+        {"pagination": "cursor", "limit": "2"},
+        {"ordering": "-changeset__timestamp"},
+        {"search": "changes 1"},
+        {"format": "ndjson"},
+        {"format": "csv"},
+        {"omit": "bees"},
+    ])
+    def test_asset_events(self, user_client: Client, settings: Any, params: Dict[str, str]) -> None:
+        self._assert_same(user_client, settings, "/api/v1/asset-events/", params)
+
+    @pytest.mark.parametrize("url", ["/api/v1/assets/", "/api/v1/asset-events/"])
+    def test_time_zone(self, user_client: Client, settings: Any, url: str) -> None:
+        settings.TIME_ZONE = "America/New_York"
+        self._assert_same(user_client, settings, url, {})
+
+    def test_cursor_pages(self, api_client: Client, settings: Any) -> None:
+        url: Any = "/api/v1/assets/"
+        params = {"pagination": "cursor", "limit": "1"}
+        while url is not None:
+            expected = self._get(api_client, settings, url, params, fast=False)
+            assert self._get(api_client, settings, url, params, fast=True) == expected
+            url = api_client.get(url, params).json()["next"]
+            params = {}
+
+    @pytest.mark.parametrize("url,params", [
+        ("/api/v1/assets/", {"expand": "node.parent"}),
+        ("/api/v1/nodes/", {"expand": "asset,ancestors"}),
+        ("/api/v1/asset-events/", {}),
+    ])
+    def test_query_count_does_not_grow_with_page_size(
+        self,
+        user_client: Client,
+        settings: Any,
+        url: str,
+        params: Dict[str, str],
+        container_model: AssetModel,
+    ) -> None:
+        settings.FAST_READS = True
+        queries = self.count_queries(lambda: user_client.get(url, params))
+
+        node = Node.objects.get(name="shelf")
+        changeset = ChangeSet.objects.get(comment="changes 0")
+        for _ in range(3):
+            asset = Asset.objects.create(asset_model=container_model)
+            asset.assetcode_set.create(code_type="A", code=f"code-{asset.id}")
+            node = node.add_child(node_type="A", asset=asset)
+            AssetEvent.objects.create(changeset=changeset, asset=asset, event_type="CR", data={})
+
+        assert self.count_queries(lambda: user_client.get(url, params)) == queries
+
+
+def test_fast_list_requires_build() -> None:
+    class IncompleteList(FastList):
+        reader_class = AssetReader
+        columns = ASSET_COLUMNS
+
+    with pytest.raises(TypeError):
+        IncompleteList(AssetSerializer())  # type: ignore[abstract]
@@ -1,9 +1,11 @@
+import json
 from typing import Any, Dict, Optional, Union
 from uuid import UUID
 
 import pytest
+from django.contrib.auth.models import User
 
-from assets.models import Asset, Node
+from assets.models import Asset, AssetEvent, AssetModel, ChangeSet, Node
 from pyinv.tests.client import Client
 
 from .base import APITestCase
@@ -121,6 +123,70 @@ class TestNodeListEndpoint(APITestCase):
         assert data["previous"] is None
         assert len(data["results"]) == 0
 
+    @pytest.mark.usefixtures("location", "container_with_child")
+    def test_search_by_manufacturer(self, api_client: Client) -> None:
+        data = self._subject(api_client, params={"search": "bar", "expand": "asset"})
+        assert data["count"] == 1
+        assert data["results"][0]["asset"]["asset_model"]["name"] == "Bar Model"
+
+    @pytest.mark.usefixtures("location", "asset_with_code")
+    def test_search_by_asset_code(self, api_client: Client, location: Node, asset_with_code: Asset) -> None:
+        location.add_child(node_type="A", asset=asset_with_code)
+        data = self._subject(api_client, params={"search": "asset-co"})
+        assert data["count"] == 1
+        assert data["results"][0]["asset"] == str(asset_with_code.id)
+
+    @pytest.mark.parametrize("expand", ["", "asset,ancestors"])
+    @pytest.mark.usefixtures("without_response_cache")
+    def test_query_count_does_not_grow_with_page_size(
+        self,
+        api_client: Client,
+        container_model: AssetModel,
+        expand: str,
+    ) -> None:
+        def add_branch(depth: int) -> None:
+            node = Node.add_root(node_type="L", name=f"root-{Node.get_root_nodes().count()}")
+            for _ in range(depth):
+                asset = Asset.objects.create(asset_model=container_model)
+                asset.assetcode_set.create(code_type="A", code=f"code-{asset.id}")
+                node = node.add_child(node_type="A", asset=asset)
+
+        params: Dict[str, Union[str, bool, UUID]] = {"expand": expand}
+        add_branch(2)
+        queries = self.count_queries(lambda: self._subject(api_client, params=params))
+
+        add_branch(3)
+        add_branch(5)
+        data = self._subject(api_client, params=params)
+        assert data["count"] == 13
+        for result in data["results"]:
+            self.assert_like_node(result)
+        assert self.count_queries(lambda: self._subject(api_client, params=params)) == queries
+
+    @pytest.mark.usefixtures("container_with_child")
+    def test_ancestors_match_tree(self, api_client: Client) -> None:
+        data = self._subject(api_client)
+        for result in data["results"]:
+            node = Node.objects.get(id=result["id"])
+            assert result["ancestors"] == [str(a.id) for a in node.get_ancestors()]
+
+
+@pytest.mark.django_db
+class TestNodeStreamingExport(APITestCase):
+    """Test streaming the whole list of nodes as NDJSON."""
+
+    def test_ndjson(self, api_client: Client, location: Node, container_with_child: Asset) -> None:
+        resp = api_client.get("/api/v1/nodes/", {"format": "ndjson"})
+        assert resp.status_code == 200
+        assert resp["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in resp.getvalue().decode().splitlines()]
+        # Nodes are in tree order.
+        assert [row["id"] for row in rows] == [str(node.id) for node in Node.objects.order_by('path')]
+
+    def test_filters(self, api_client: Client, location: Node, container_with_child: Asset) -> None:
+        resp = api_client.get("/api/v1/nodes/", {"format": "ndjson", "node_type": "L"})
+        assert [json.loads(line)["id"] for line in resp.getvalue().decode().splitlines()] == [str(location.id)]
+
 
 @pytest.mark.django_db
 class TestAssetGetIndividualEndpoint(APITestCase):
@@ -138,3 +204,159 @@ class TestAssetGetIndividualEndpoint(APITestCase):
 
         result = resp.json()
         self.assert_like_node(result)
+
+
+@pytest.mark.django_db
+class TestNodeMoveEndpoint(APITestCase):
+
+    _subject = "/api/v1/nodes/move/"
+    _permission = "change_node"
+
+    @pytest.fixture
+    def van(self, container_model: AssetModel) -> Node:
+        return Node.add_root(node_type="A", asset=Asset.objects.create(asset_model=container_model), name="van")
+
+    def _crate(self, asset_model: AssetModel, size: int) -> Node:
+        crate = Node.add_root(node_type="L", name=f"crate-{size}")
+        for _ in range(size):
+            crate.add_child(node_type="A", asset=Asset.objects.create(asset_model=asset_model))
+        return crate
+
+    def test_move_no_auth(self, api_client: Client) -> None:
+        resp = api_client.post(self._subject)
+        assert resp.status_code == 403
+        assert resp.json() == {'detail': 'Authentication credentials were not provided.'}
+
+    def test_move_no_perms(self, user_client: Client) -> None:
+        resp = user_client.post(self._subject)
+        assert resp.status_code == 403
+        assert resp.json() == {'detail': 'You do not have permission to perform this action.'}
+
+    def test_move(
+        self,
+        user_client: Client,
+        user: User,
+        van: Node,
+        container_with_child: Asset,
+        asset: Asset,
+    ) -> None:
+        self._set_permission(user)
+        child = container_with_child.node.get_children().get()
+        container_with_child.assetcode_set.create(code_type="S", code="sr1VAE")
+        resp = user_client.post(self._subject, {
+            "target": str(van.id),
+            "nodes": [str(child.id)],
+            "assets": [str(container_with_child.id), str(asset.id)],
+            "comment": "Packing the van",
+        }, format="json")
+        assert resp.status_code == 201
+        data = resp.json()
+        self.assert_like_changeset_with_count(data)
+        assert data["event_count"] == 3
+        assert data["comment"] == "Packing the van"
+
+        van.refresh_from_db()
+        assert {node.asset_id for node in van.get_children()} == {child.asset_id, container_with_child.id, asset.id}
+        assert Node.find_problems() == ([], [], [], [], [])
+
+        changeset = ChangeSet.objects.get()
+        events = {event.asset_id: event for event in changeset.assetevent_set.all()}
+        assert events[child.asset_id].event_type == "MV"
+        # Locations are recorded as in imported history, with the code of an asset.
+        assert van.asset is not None
+        van_code = van.asset.first_asset_code
+        assert events[child.asset_id].data == {
+            "old": "sr1VAE",
+            "new": van_code,
+            "old_node": str(container_with_child.node.id),
+            "new_node": str(van.id),
+        }
+        assert events[asset.id].data == {"old": None, "new": van_code, "old_node": None, "new_node": str(van.id)}
+
+    def test_move_locations(self, user_client: Client, user: User, location: Node, asset: Asset) -> None:
+        self._set_permission(user)
+        node = location.add_child(node_type="A", asset=asset)
+        shelf = Node.add_root(node_type="L", name="shelf")
+        resp = user_client.post(self._subject, {"target": str(shelf.id), "nodes": [str(node.id)]}, format="json")
+        assert resp.status_code == 201
+        assert AssetEvent.objects.get().data == {
+            "old": location.name,
+            "new": "shelf",
+            "old_node": str(location.id),
+            "new_node": str(shelf.id),
+        }
+
+    def test_query_count_does_not_grow(
+        self,
+        user_client: Client,
+        user: User,
+        van: Node,
+        asset_model: AssetModel,
+    ) -> None:
+        self._set_permission(user)
+
+        def move(crate: Node) -> Any:
+            return user_client.post(self._subject, {
+                "target": str(van.id),
+                "nodes": [str(node.id) for node in crate.get_children()],
+            }, format="json")
+
+        # The first move into an empty target does not need to find its last child.
+        move(self._crate(asset_model, 1))
+        small, large = self._crate(asset_model, 2), self._crate(asset_model, 20)
+        queries = self.count_queries(lambda: move(small))
+        assert self.count_queries(lambda: move(large)) == queries
+        assert Node.objects.get(id=van.id).numchild == 23
+        assert Node.objects.get(id=large.id).numchild == 0
+
+    def test_move_into_non_container(self, user_client: Client, user: User, asset: Asset, location: Node) -> None:
+        self._set_permission(user)
+        target = location.add_child(node_type="A", asset=asset)
+        resp = user_client.post(self._subject, {"target": str(target.id), "nodes": []}, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == {"target": ["Node cannot contain assets."]}
+
+    def test_move_into_descendant(self, user_client: Client, user: User, container_with_child: Asset) -> None:
+        self._set_permission(user)
+        node = container_with_child.node
+        resp = user_client.post(self._subject, {"target": str(node.id), "nodes": [str(node.id)]}, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == {"nodes": ["Cannot move a node into itself or one of its descendants."]}
+
+    def test_move_asset_into_descendant(self, user_client: Client, user: User, container_with_child: Asset) -> None:
+        self._set_permission(user)
+        pocket = container_with_child.node.add_child(node_type="L", name="pocket")
+        resp = user_client.post(self._subject, {
+            "target": str(pocket.id),
+            "assets": [str(container_with_child.id)],
+        }, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == {"assets": ["Cannot move an asset into itself or one of its descendants."]}
+
+    def test_move_too_deep(self, user_client: Client, user: User, asset: Asset) -> None:
+        self._set_permission(user)
+        target = Node.add_root(node_type="L", name="0")
+        max_depth = Node._meta.get_field("path").max_length // Node.steplen
+        for depth in range(1, max_depth):
+            target = target.add_child(node_type="L", name=str(depth))
+        resp = user_client.post(self._subject, {"target": str(target.id), "assets": [str(asset.id)]}, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == ["The target node has too many children, or is too deep in the tree."]
+        assert not ChangeSet.objects.exists()
+
+    def test_move_missing(self, user_client: Client, user: User, location: Node) -> None:
+        self._set_permission(user)
+        missing = "00000000-0000-0000-0000-000000000000"
+        resp = user_client.post(self._subject, {
+            "target": str(location.id),
+            "nodes": [missing],
+            "assets": [missing],
+        }, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == {"nodes": ["Some nodes do not exist."], "assets": ["Some assets do not exist."]}
+
+    def test_move_nothing(self, user_client: Client, user: User, location: Node) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, {"target": str(location.id)}, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == {"non_field_errors": ["There are no nodes or assets to move."]}
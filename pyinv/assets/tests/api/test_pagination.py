@@ -0,0 +1,110 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from assets.models import Asset, AssetModel, ChangeSet, Node
+from pyinv.tests.client import Client
+
+from .base import APITestCase
+
+
+@pytest.mark.django_db
+class TestKeysetPagination(APITestCase):
+    """Test the opt-in keyset pagination mode."""
+
+    def _get(self, api_client: Client, url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        response = api_client.get(url, params)
+        assert response.status_code == 200
+        return response.json()
+
+    def _walk(self, api_client: Client, url: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Follow the next links from the first page, returning the pages."""
+        pages = [self._get(api_client, url, params)]
+        while pages[-1]["next"]:
+            pages.append(self._get(api_client, pages[-1]["next"]))
+        return pages
+
+    @pytest.fixture
+    def assets(self, asset_model: AssetModel) -> List[Asset]:
+        return [Asset.objects.create(asset_model=asset_model) for _ in range(5)]
+
+    @pytest.fixture
+    def events(self, user: User, asset_model: AssetModel) -> None:
+        # Events in the same changeset share a timestamp, so the id breaks ties.
+        timestamp = timezone.now()
+        for comment in ["first", "second"]:
+            changeset = ChangeSet.objects.create(user=user, comment=comment, timestamp=timestamp)
+            for _ in range(3):
+                asset = Asset.objects.create(asset_model=asset_model)
+                changeset.assetevent_set.create(asset=asset, event_type="CR", data={})
+
+    def test_walk_forwards(self, api_client: Client, assets: List[Asset]) -> None:
+        pages = self._walk(api_client, "/api/v1/assets/", {"pagination": "cursor", "limit": "2"})
+        assert [len(page["results"]) for page in pages] == [2, 2, 1]
+        assert "count" not in pages[0]
+        assert pages[0]["previous"] is None
+        assert all(page["previous"] for page in pages[1:])
+
+        ids = [result["id"] for page in pages for result in page["results"]]
+        expected = Asset.objects.order_by("created_at", "id").values_list("id", flat=True)
+        assert ids == [str(id_) for id_ in expected]
+
+    def test_walk_backwards(self, api_client: Client, assets: List[Asset]) -> None:
+        pages = self._walk(api_client, "/api/v1/assets/", {"pagination": "cursor", "limit": "2"})
+
+        previous = self._get(api_client, pages[2]["previous"])
+        assert previous["results"] == pages[1]["results"]
+        first = self._get(api_client, previous["previous"])
+        assert first["results"] == pages[0]["results"]
+        assert first["previous"] is None
+        assert first["next"] is not None
+
+    def test_ties_on_timestamp(self, user_client: Client, events: None) -> None:
+        pages = self._walk(user_client, "/api/v1/asset-events/", {"pagination": "cursor", "limit": "4"})
+        ids = [result["id"] for page in pages for result in page["results"]]
+        assert len(ids) == 6
+        assert len(set(ids)) == 6
+
+    def test_nodes_by_path(self, api_client: Client, container_with_child: Asset, location: Node) -> None:
+        pages = self._walk(api_client, "/api/v1/nodes/", {"pagination": "cursor", "limit": "1"})
+        ids = [result["id"] for page in pages for result in page["results"]]
+        assert ids == [str(node.id) for node in Node.objects.order_by("path")]
+
+    def test_changeset_events(self, user_client: Client, events: None) -> None:
+        changeset = ChangeSet.objects.get(comment="first")
+        pages = self._walk(
+            user_client,
+            f"/api/v1/changesets/{changeset.id}/events/",
+            {"pagination": "cursor", "limit": "2"},
+        )
+        ids = [result["id"] for page in pages for result in page["results"]]
+        assert ids == [str(id_) for id_ in changeset.assetevent_set.order_by("id").values_list("id", flat=True)]
+
+    @pytest.mark.parametrize("count", ["exact", "estimate"])
+    @pytest.mark.usefixtures("assets")
+    def test_count(self, api_client: Client, count: str) -> None:
+        data = self._get(api_client, "/api/v1/assets/", {"pagination": "cursor", "count": count})
+        assert data["count"] == 5
+
+    @pytest.mark.usefixtures("assets")
+    def test_estimated_count_with_offset(self, api_client: Client) -> None:
+        data = self._get(api_client, "/api/v1/assets/", {"count": "estimate", "limit": "2"})
+        assert data["count"] == 5
+        assert len(data["results"]) == 2
+
+    @pytest.mark.parametrize("cursor", [
+        "bees",
+        "eyJwb3NpdGlvbiI6IFtdfQ==",
+        "eyJwb3NpdGlvbiI6IFsiYmVlcyIsICJiZWVzIl0sICJyZXZlcnNlIjogZmFsc2V9",
+    ])
+    def test_invalid_cursor(self, api_client: Client, cursor: str) -> None:
+        response = api_client.get("/api/v1/assets/", {"cursor": cursor})
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Invalid cursor"}
+
+    def test_default_is_offset(self, api_client: Client, assets: List[Asset]) -> None:
+        data = self._get(api_client, "/api/v1/assets/", {"limit": "2"})
+        assert data["count"] == 5
+        assert "offset=2" in data["next"]
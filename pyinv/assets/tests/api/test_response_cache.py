@@ -0,0 +1,115 @@
+from typing import Any
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import override_settings
+
+from assets import response_cache
+from assets.models import Asset, AssetModel, Node
+from pyinv.tests.client import Client
+
+from .base import APITestCase
+
+
+@pytest.mark.django_db
+class TestResponseCache(APITestCase):
+    """Test answering GET requests from the shared response cache."""
+
+    @pytest.mark.usefixtures("location")
+    def test_hit(self, api_client: Client) -> None:
+        response = api_client.get("/api/v1/nodes/")
+        assert response.status_code == 200
+
+        def cached_get() -> None:
+            cached = api_client.get("/api/v1/nodes/")
+            assert cached.status_code == 200
+            assert cached.content == response.content
+            assert cached["Content-Type"] == response["Content-Type"]
+            assert cached["ETag"] == response["ETag"]
+
+        # Only the inventory version is read.
+        assert self.count_queries(cached_get) == 1
+        stats = response_cache.get_stats()
+        assert (stats.hits, stats.misses, stats.hit_ratio) == (1, 1, 0.5)
+        assert stats.time_saved > 0
+
+    def test_invalidated_by_write(self, api_client: Client, location: Node, asset_model: AssetModel) -> None:
+        assert api_client.get("/api/v1/nodes/").json()["count"] == 1
+        location.add_child(node_type="A", asset=Asset.objects.create(asset_model=asset_model))
+        assert api_client.get("/api/v1/nodes/").json()["count"] == 2
+        assert response_cache.get_stats().hits == 0
+
+    @pytest.mark.usefixtures("location")
+    def test_keyed_on_request(self, api_client: Client, user: User) -> None:
+        api_client.get("/api/v1/nodes/")
+        api_client.get("/api/v1/nodes/", {"parent": "root"})
+        api_client.get("/api/v1/nodes/", {"format": "csv"})
+        api_client.force_authenticate(user)
+        api_client.get("/api/v1/nodes/")
+        assert response_cache.get_stats().hits == 0
+
+    @pytest.mark.usefixtures("location")
+    def test_keyed_on_host(self, api_client: Client, settings: Any) -> None:
+        settings.ALLOWED_HOSTS = ["internal", "inventory.example.org"]
+        Node.add_root(node_type="L", name="other")
+        internal = api_client.get("/api/v1/nodes/", {"limit": "1"}, HTTP_HOST="internal:8000")
+        assert internal.json()["next"].startswith("http://internal:8000/")
+
+        public = api_client.get("/api/v1/nodes/", {"limit": "1"}, HTTP_HOST="inventory.example.org", secure=True)
+        assert public.json()["next"].startswith("https://inventory.example.org/")
+        assert response_cache.get_stats().hits == 0
+
+    @pytest.mark.usefixtures("location")
+    def test_browsable_api_not_cached(self, api_client: Client, user: User) -> None:
+        other = User.objects.create(username="other")
+        pages = []
+        for page_user in [user, other]:
+            api_client.force_authenticate(page_user)
+            response = api_client.get("/api/v1/nodes/", HTTP_ACCEPT="text/html")
+            assert response.status_code == 200
+            pages.append(response.content.decode())
+
+        assert "other" not in pages[0]
+        assert "other" in pages[1]
+        assert response_cache.get_stats() == (0, 0, 0.0)
+
+    @pytest.mark.usefixtures("location")
+    def test_streaming_not_cached(self, api_client: Client) -> None:
+        first = api_client.get("/api/v1/nodes/", {"format": "csv"})
+        second = api_client.get("/api/v1/nodes/", {"format": "csv"})
+        assert first.getvalue() == second.getvalue()
+        assert response_cache.get_stats().hits == 0
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    @pytest.mark.usefixtures("location")
+    def test_disabled(self, api_client: Client) -> None:
+        api_client.get("/api/v1/nodes/")
+        api_client.get("/api/v1/nodes/")
+        assert response_cache.get_stats() == (0, 0, 0.0)
+
+    def test_errors_not_cached(self, api_client: Client) -> None:
+        api_client.get("/api/v1/assets/000/")
+        assert api_client.get("/api/v1/assets/000/").status_code == 404
+        assert response_cache.get_stats().hits == 0
+
+
+@pytest.mark.django_db
+class TestResponseCacheMetricsEndpoint(APITestCase):
+    """Test the endpoint reporting the metrics of the response cache."""
+
+    def test_requires_staff(self, user_client: Client) -> None:
+        assert user_client.get("/api/v1/metrics/response-cache/").status_code == 403
+
+    @pytest.mark.usefixtures("location")
+    def test_metrics(self, api_client: Client, user: User) -> None:
+        api_client.get("/api/v1/nodes/")
+        api_client.get("/api/v1/nodes/")
+        api_client.get("/api/v1/nodes/")
+
+        user.is_staff = True
+        user.save()
+        api_client.force_authenticate(user)
+        data = api_client.get("/api/v1/metrics/response-cache/").json()
+        assert data.keys() == {"hits", "misses", "hit_ratio", "time_saved"}
+        assert (data["hits"], data["misses"]) == (2, 1)
+        assert data["hit_ratio"] == pytest.approx(2 / 3)
@@ -0,0 +1,122 @@
+from typing import Any, Dict
+
+import pytest
+from django.contrib.auth.models import User
+
+from assets import code_resolution
+from assets.models import Asset, AssetModel, Node
+from pyinv.tests.client import Client
+
+from .base import APITestCase
+
+
+@pytest.mark.django_db
+class TestSparseFields(APITestCase):
+    """Test choosing the fields of a response with ?fields= and ?omit=."""
+
+    def _get(self, api_client: Client, url: str, params: Dict[str, str], *, expected_status: int = 200) -> Any:
+        response = api_client.get(url, params)
+        assert response.status_code == expected_status
+        return response.json()
+
+    @pytest.fixture
+    def assets(self, location: Node, asset_model: AssetModel) -> None:
+        for i in range(5):
+            asset = Asset.objects.create(asset_model=asset_model)
+            asset.assetcode_set.create(code_type="A", code=f"code-{i}")
+            location.add_child(node_type="A", asset=asset)
+
+    @pytest.mark.usefixtures("assets")
+    def test_fields(self, api_client: Client) -> None:
+        data = self._get(api_client, "/api/v1/assets/", {"fields": "id,first_asset_code"})
+        assert len(data["results"]) == 5
+        for result in data["results"]:
+            assert result.keys() == {"id", "first_asset_code"}
+            assert result["first_asset_code"].startswith("code-")
+
+    @pytest.mark.usefixtures("assets")
+    def test_omit(self, api_client: Client) -> None:
+        data = self._get(api_client, "/api/v1/assets/", {"omit": "asset_codes,node.parent"})
+        for result in data["results"]:
+            assert "asset_codes" not in result
+            assert "parent" not in result["node"]
+            assert result["node"]["display_name"] == result["display_name"]
+
+    @pytest.mark.usefixtures("assets")
+    def test_nested_fields(self, api_client: Client, location: Node) -> None:
+        data = self._get(
+            api_client,
+            "/api/v1/assets/",
+            {"fields": "id,node.parent.id,asset_model", "expand": "node.parent"},
+        )
+        for result in data["results"]:
+            assert result.keys() == {"id", "node", "asset_model"}
+            assert result["node"] == {"parent": {"id": str(location.id)}}
+            # A nested object named without any of its fields is included whole.
+            assert result["asset_model"] == {"name": "Foo Model", "slug": "foo-model"}
+
+    @pytest.mark.usefixtures("assets")
+    def test_queries_pruned(self, api_client: Client) -> None:
+        full = self.count_queries(lambda: self._get(api_client, "/api/v1/assets/", {}))
+        # The inventory version, the assets, the count, and the asset codes.
+        sparse = self.count_queries(lambda: self._get(api_client, "/api/v1/assets/", {"fields": "id,first_asset_code"}))
+        assert sparse == 4
+        assert sparse < full
+
+    @pytest.mark.usefixtures("assets")
+    def test_node_ancestors_not_fetched(self, api_client: Client) -> None:
+        full = self.count_queries(lambda: self._get(api_client, "/api/v1/nodes/", {}))
+        omitted = self.count_queries(lambda: self._get(api_client, "/api/v1/nodes/", {"omit": "ancestors"}))
+        assert omitted < full
+
+    def test_detail(self, api_client: Client, asset: Asset) -> None:
+        data = self._get(api_client, f"/api/v1/assets/{asset.id}/", {"fields": "id"})
+        assert data == {"id": str(asset.id)}
+
+    def test_asset_models(self, api_client: Client, asset_model: AssetModel) -> None:
+        data = self._get(api_client, "/api/v1/asset-models/", {"fields": "name,manufacturer.name"})
+        assert data["results"] == [{"name": "Foo Model", "manufacturer": {"name": "Foo"}}]
+
+    def test_input_unchanged(self, user_client: Client, user: User, asset_model: AssetModel) -> None:
+        self._permission = "change_assetmodel"
+        self._set_permission(user)
+        response = user_client.patch(
+            f"/api/v1/asset-models/{asset_model.slug}/?fields=slug",
+            {"name": "New Name"},
+            format="json",
+        )
+        assert response.status_code == 200
+        assert response.json() == {"slug": asset_model.slug}
+        asset_model.refresh_from_db()
+        assert asset_model.name == "New Name"
+
+    @pytest.mark.parametrize("params,errors", [
+        ({"fields": "id,bees"}, {"fields": ["Unknown field: bees"]}),
+        ({"omit": "node.wasps"}, {"omit": ["Unknown field: node.wasps"]}),
+    ])
+    def test_unknown_field(
+        self,
+        api_client: Client,
+        asset: Asset,
+        params: Dict[str, str],
+        errors: Dict[str, Any],
+    ) -> None:
+        assert self._get(api_client, "/api/v1/assets/", params, expected_status=400) == errors
+
+    def test_resolve(self, api_client: Client, asset_with_code: Asset) -> None:
+        code_resolution.cache.clear()
+        data = self._get(
+            api_client,
+            "/api/v1/assets/resolve/",
+            {"code": "asset-code", "fields": "code,asset.id,asset.first_asset_code"},
+        )
+        assert data == [
+            {"code": "asset-code", "asset": {"id": str(asset_with_code.id), "first_asset_code": "asset-code"}},
+        ]
+
+    @pytest.mark.usefixtures("assets")
+    def test_streaming(self, api_client: Client) -> None:
+        response = api_client.get("/api/v1/assets/", {"format": "csv", "fields": "id,first_asset_code"})
+        header, *rows = response.getvalue().decode().splitlines()
+        assert header == "id,first_asset_code"
+        assert len(rows) == 5
@@ -1,7 +1,10 @@
+from typing import Any
+
 import pytest
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from assets import reference_data, response_cache
 from assets.models import (
     Asset,
     AssetEvent,
@@ -13,6 +16,24 @@ from assets.models import (
 from pyinv.tests.client import Client
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache() -> None:
+    # The inventory version is rolled back after each test, so a later test could see the same version.
+    response_cache.get_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_reference_data() -> None:
+    # The reference version is also rolled back, so the cache could otherwise hold another test's objects.
+    reference_data.clear()
+
+
+@pytest.fixture
+def without_response_cache(settings: Any) -> None:
+    """Disable the response cache, for tests that count the queries needed to render a response."""
+    settings.RESPONSE_CACHE_TIMEOUT = 0
+
+
 @pytest.fixture
 def user() -> User:
     return User.objects.create(username="user")
@@ -35,6 +35,16 @@ class TestAssetCodeModel(TestCase):
         code = AssetCode(code_type="A", code="foo", asset=self.asset)
         self.assertEqual(code.code, "foo")
 
+    def test_normalised_code(self) -> None:
+        """Test that the normalised code is stored when the code is saved."""
+        code = AssetCode.objects.create(code_type="D", code="inv-ase-sej", asset=self.asset)
+        self.assertEqual(code.normalised_code, "INVASESEJ")
+
+        code.code = "INV-ASE-SEJ "
+        code.save(update_fields=["code"])
+        code.refresh_from_db()
+        self.assertEqual(code.normalised_code, "INVASESEJ")
+
     def test_arbitrary_code_too_short(self) -> None:
         """Test that we cannot make a zero length asset code."""
         code = AssetCode.objects.create(code_type="A", code="", asset=self.asset)
@@ -0,0 +1,51 @@
+import pytest
+from django.test import override_settings
+
+from assets.asset_codes import AssetCodeSpaceExhausted, AssetCodeType
+from assets.models import Asset, AssetCodeSequence
+
+
+@pytest.mark.django_db
+class TestAssetCodeSequence:
+
+    def test_allocate(self) -> None:
+        strategy = AssetCodeType.DAMM32.get_strategy()
+        codes = AssetCodeSequence.allocate(AssetCodeType.DAMM32, 3)
+        assert codes == [strategy.code_at("INV", position) for position in range(3)]
+        assert AssetCodeSequence.allocate(AssetCodeType.DAMM32, 2) == [
+            strategy.code_at("INV", position) for position in range(3, 5)
+        ]
+        sequence = AssetCodeSequence.objects.get()
+        assert (sequence.code_type, sequence.prefix, sequence.position) == ("D", "INV", 5)
+
+    def test_allocate_block(self) -> None:
+        codes = AssetCodeSequence.allocate(AssetCodeType.DAMM32, 1200)
+        assert len(set(codes)) == 1200
+
+    def test_skips_used_codes(self, asset: Asset) -> None:
+        strategy = AssetCodeType.DAMM32.get_strategy()
+        asset.assetcode_set.create(code_type="D", code=strategy.code_at("INV", 1).lower())
+        asset.assetcode_set.create(code_type="A", code=strategy.code_at("INV", 2))
+        assert AssetCodeSequence.allocate(AssetCodeType.DAMM32, 2) == [
+            strategy.code_at("INV", 0),
+            strategy.code_at("INV", 3),
+        ]
+
+    @override_settings(DAMM32_ASSET_CODE_PREFIXES=["INV", "SRO"])
+    def test_prefixes(self) -> None:
+        code, = AssetCodeSequence.allocate(AssetCodeType.DAMM32, 1, prefix="SRO")
+        assert code.startswith("SRO-")
+        with pytest.raises(ValueError, match="Provided prefix is not valid"):
+            AssetCodeSequence.allocate(AssetCodeType.DAMM32, 1, prefix="BEE")
+
+    def test_exhausted(self) -> None:
+        AssetCodeSequence.objects.create(code_type="D", prefix="INV", position=2 ** 25 - 2)
+        with pytest.raises(AssetCodeSpaceExhausted, match="Only 2 of 3 asset codes could be allocated"):
+            AssetCodeSequence.allocate(AssetCodeType.DAMM32, 3)
+        # Nothing was allocated.
+        assert AssetCodeSequence.objects.get().position == 2 ** 25 - 2
+        assert len(AssetCodeSequence.allocate(AssetCodeType.DAMM32, 2)) == 2
+
+    def test_unable_to_allocate(self) -> None:
+        with pytest.raises(ValueError, match="Unable to generate an asset code of that type."):
+            AssetCodeSequence.allocate(AssetCodeType.SROBO, 1)
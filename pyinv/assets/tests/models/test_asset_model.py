@@ -32,3 +32,54 @@ class TestAssetModel(TestCase):
         """Test that deleting the manager does not casade."""
         with self.assertRaisesRegex(ProtectedError, "Hive"):
             self.manufacturer.delete()
+
+
+class TestAssetModelDisplayName(TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.manufacturer = Manufacturer.objects.create(name="BeeCorp")
+        self.manufacturer_alt = Manufacturer.objects.create(name="WaspCorp")
+        self.hive = AssetModel.objects.create(name="Hive", manufacturer=self.manufacturer)
+
+    def assertDisplayNames(self, *expected: str) -> None:
+        self.assertCountEqual(AssetModel.objects.values_list("display_name", flat=True), expected)
+
+    def test_unique_name(self) -> None:
+        self.assertEqual(self.hive.display_name, "Hive")
+        self.assertDisplayNames("Hive")
+
+    def test_create_shared_name(self) -> None:
+        other = AssetModel.objects.create(name="Hive", manufacturer=self.manufacturer_alt)
+        self.assertEqual(other.display_name, "WaspCorp Hive")
+        self.assertDisplayNames("BeeCorp Hive", "WaspCorp Hive")
+
+    def test_rename(self) -> None:
+        other = AssetModel.objects.create(name="Hive", manufacturer=self.manufacturer_alt)
+        other.name = "Nest"
+        other.save()
+        self.assertEqual(other.display_name, "Nest")
+        self.assertDisplayNames("Hive", "Nest")
+
+        other.name = "Hive"
+        other.save(update_fields=["name"])
+        self.assertDisplayNames("BeeCorp Hive", "WaspCorp Hive")
+
+    def test_delete(self) -> None:
+        other = AssetModel.objects.create(name="Hive", manufacturer=self.manufacturer_alt)
+        other.delete()
+        self.assertDisplayNames("Hive")
+
+    def test_rename_manufacturer(self) -> None:
+        AssetModel.objects.create(name="Hive", manufacturer=self.manufacturer_alt)
+        self.manufacturer_alt.name = "HornetCorp"
+        self.manufacturer_alt.save()
+        self.assertDisplayNames("BeeCorp Hive", "HornetCorp Hive")
+
+    def test_update_display_names_after_bulk_create(self) -> None:
+        AssetModel.objects.bulk_create([
+            AssetModel(name="Hive", manufacturer=self.manufacturer_alt),
+            AssetModel(name="Nest", manufacturer=self.manufacturer_alt),
+        ])
+        AssetModel.update_display_names(AssetModel.objects.filter(display_name=""))
+        self.assertDisplayNames("BeeCorp Hive", "WaspCorp Hive", "Nest")
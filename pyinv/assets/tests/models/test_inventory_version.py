@@ -0,0 +1,68 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from assets.asset_codes import AssetCodeType
+from assets.code_generation import assign_new_codes
+from assets.models import Asset, AssetModel, ChangeSet, InventoryVersion, Node
+from assets.moves import move_into
+
+
+@pytest.mark.django_db
+class TestInventoryVersion:
+
+    def test_bump(self) -> None:
+        version = InventoryVersion.current()
+        InventoryVersion.bump()
+        InventoryVersion.bump()
+        assert InventoryVersion.current() == version + 2
+
+    def test_bump_creates_row(self) -> None:
+        InventoryVersion.objects.all().delete()
+        assert InventoryVersion.current() == 0
+        InventoryVersion.bump()
+        assert InventoryVersion.current() == 1
+
+    def test_bumped_by_writes(self, asset_model: AssetModel, user: User) -> None:
+        version = InventoryVersion.current()
+        asset = Asset.objects.create(asset_model=asset_model)
+        assert InventoryVersion.current() > version
+
+        version = InventoryVersion.current()
+        asset_model.manufacturer.save()
+        assert InventoryVersion.current() > version
+
+        version = InventoryVersion.current()
+        ChangeSet.objects.create(user=user, timestamp=timezone.now())
+        assert InventoryVersion.current() > version
+
+        version = InventoryVersion.current()
+        asset.delete()
+        assert InventoryVersion.current() > version
+
+    def test_bumped_by_bulk_writes(self, asset: Asset, location: Node, user: User) -> None:
+        version = InventoryVersion.current()
+        assign_new_codes(AssetCodeType.DAMM32, [asset])
+        assert InventoryVersion.current() > version
+
+        version = InventoryVersion.current()
+        move_into(location, assets=[asset], user=user)
+        assert InventoryVersion.current() > version
+
+    def test_rolled_back_with_write(self, asset_model: AssetModel) -> None:
+        version = InventoryVersion.current()
+        with transaction.atomic():
+            Asset.objects.create(asset_model=asset_model)
+            transaction.set_rollback(True)
+        assert InventoryVersion.current() == version
+
+    def test_reference_version(self, asset_model: AssetModel, location: Node) -> None:
+        versions = InventoryVersion.get()
+        location.save()
+        assert InventoryVersion.get().reference_version == versions.reference_version
+
+        asset_model.save()
+        asset_model.manufacturer.save()
+        assert InventoryVersion.get().reference_version == versions.reference_version + 2
+        assert InventoryVersion.get().version > versions.version
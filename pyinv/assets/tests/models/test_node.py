@@ -1,5 +1,8 @@
+from typing import Dict, Optional
+
 from django.db import IntegrityError
 from django.test import TestCase
+from treebeard.exceptions import InvalidMoveToDescendant
 
 from assets.models import Asset, AssetModel, Manufacturer, Node
 
@@ -78,3 +81,82 @@ class TestNode(TestCase):
         """Test that a location cannot be linked to an asset."""
         with self.assertRaises(IntegrityError):
             Node.add_root(node_type="L", name="foo", asset=self.asset)
+
+    def test_prefetch_ancestors(self) -> None:
+        """Test that ancestors are fetched for many nodes at once."""
+        root = Node.add_root(node_type="L", name="foo")
+        child = root.add_child(node_type="L", name="bar")
+        grandchild = child.add_child(node_type="L", name="baz")
+        other = Node.add_root(node_type="L", name="other")
+
+        nodes = list(Node.objects.all())
+        with self.assertNumQueries(1):
+            ancestors = Node.prefetch_ancestors(nodes)
+        self.assertCountEqual(ancestors, [root, child])
+
+        with self.assertNumQueries(0):
+            chains = {node: (node.parent, list(node.ancestors)) for node in nodes}
+        self.assertEqual(chains[root], (None, []))
+        self.assertEqual(chains[child], (root, [root]))
+        self.assertEqual(chains[grandchild], (child, [root, child]))
+        self.assertEqual(chains[other], (None, []))
+
+    def _tree(self) -> Dict[str, Optional[str]]:
+        """The name of the parent of each node."""
+        return {node.name or "": node.parent.name if node.parent else None for node in Node.objects.all()}
+
+    def test_move_into(self) -> None:
+        """Test that many nodes are moved, with their descendants."""
+        van = Node.add_root(node_type="L", name="van")
+        van.add_child(node_type="L", name="seat")
+        shelf = Node.add_root(node_type="L", name="shelf")
+        crate = shelf.add_child(node_type="L", name="crate")
+        box = crate.add_child(node_type="L", name="box")
+        box.add_child(node_type="L", name="item")
+        loose = shelf.add_child(node_type="L", name="loose")
+        new = Node(node_type="A", asset=self.asset, name="new")
+
+        van.refresh_from_db()
+        crate.refresh_from_db()
+        box.refresh_from_db()
+        with self.assertNumQueries(7):
+            Node.move_into(van, [crate, box, loose, new])
+
+        self.assertEqual(Node.find_problems(), ([], [], [], [], []))
+        self.assertEqual(self._tree(), {
+            "van": None,
+            "seat": "van",
+            "shelf": None,
+            "crate": "van",
+            "box": "van",
+            "item": "box",
+            "loose": "van",
+            "new": "van",
+        })
+        self.assertEqual(Node.objects.get(name="van").numchild, 5)
+        self.assertEqual(Node.objects.get(name="shelf").numchild, 0)
+        self.assertEqual(Node.objects.get(name="crate").numchild, 0)
+        self.assertEqual(crate.path, Node.objects.get(name="crate").path)
+
+    def test_move_into_existing_parent(self) -> None:
+        """Test that nodes already in the target are not moved."""
+        root = Node.add_root(node_type="L", name="root")
+        first = root.add_child(node_type="L", name="first")
+        root.refresh_from_db()
+        root.add_child(node_type="L", name="second")
+
+        root.refresh_from_db()
+        Node.move_into(root, [first])
+        self.assertEqual(Node.objects.get(name="first").path, first.path)
+        self.assertEqual(Node.objects.get(name="root").numchild, 2)
+        self.assertEqual(Node.find_problems(), ([], [], [], [], []))
+
+    def test_move_into_descendant(self) -> None:
+        """Test that a node cannot be moved into its own branch."""
+        root = Node.add_root(node_type="L", name="root")
+        child = root.add_child(node_type="L", name="child")
+        root.refresh_from_db()
+        with self.assertRaises(InvalidMoveToDescendant):
+            Node.move_into(child, [root])
+        with self.assertRaises(InvalidMoveToDescendant):
+            Node.move_into(root, [root])
@@ -32,6 +32,22 @@ class TestDamm32AssetCode(unittest.TestCase):
             with self.assertRaises(ValidationError):
                 self.strategy.validate(code)
 
+    def test_normalise(self) -> None:
+        for code in ['INV-DRE-XY2', 'inv-dre-xy2', 'INVDREXY2', ' INV DRE XY2 ']:
+            self.assertEqual(self.strategy.normalise(code), 'INVDREXY2')
+
+    def test_code_at(self) -> None:
+        codes = [self.strategy.code_at("INV", position) for position in range(1000)]
+        self.assertEqual(len(set(codes)), 1000)
+        for code in codes:
+            self.strategy.validate(code)
+
+    def test_code_at_is_a_permutation(self) -> None:
+        # Every payload of a smaller space is reached once.
+        strategy = Damm32AssetCodeStrategy()
+        strategy.code_space = 2 ** 10
+        self.assertEqual(len({strategy._permute(value) for value in range(2 ** 10)}), 2 ** 10)
+
 
 class TestStudentRoboticsAssetCodes():
 
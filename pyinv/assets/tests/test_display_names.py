@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.db.models import Prefetch, prefetch_related_objects
+from django.test.utils import CaptureQueriesContext
+
+from assets.display_names import asset_lookups, node_lookups, prefix_lookups
+from assets.models import Asset, AssetModel, Manufacturer, Node
+
+
+@pytest.fixture
+def inventory(manufacturer: Manufacturer, manufacturer_alt: Manufacturer) -> None:
+    """A small inventory with a name collision between asset models."""
+    shared = AssetModel.objects.create(name="Shared", manufacturer=manufacturer)
+    shared_alt = AssetModel.objects.create(name="Shared", manufacturer=manufacturer_alt)
+    unique = AssetModel.objects.create(name="Unique", manufacturer=manufacturer)
+
+    location = Node.add_root(node_type="L", name="location")
+    for i, asset_model in enumerate([shared, shared_alt, unique]):
+        asset = Asset.objects.create(asset_model=asset_model)
+        asset.assetcode_set.create(code_type="A", code=f"code-{i}")
+        asset.assetcode_set.create(code_type="A", code=f"other-code-{i}")
+        location.refresh_from_db()
+        location.add_child(node_type="A", asset=asset, name="named" if i == 0 else None)
+    Asset.objects.create(asset_model=unique)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("inventory")
+class TestDisplayNames:
+
+    def test_asset_display_names_match(self) -> None:
+        expected = {a.id: a.display_name for a in Asset.objects.all()}
+        assets = list(Asset.objects.all())
+        prefetch_related_objects(assets, *asset_lookups())
+        with CaptureQueriesContext(connection) as ctx:
+            assert {a.id: a.display_name for a in assets} == expected
+            assert {a.id: str(a.asset_model) for a in assets}
+        assert len(ctx) == 0
+
+    def test_node_display_names_match(self) -> None:
+        expected = {n.id: n.display_name for n in Node.objects.all()}
+        nodes = list(Node.objects.all())
+        prefetch_related_objects(nodes, *node_lookups())
+        with CaptureQueriesContext(connection) as ctx:
+            assert {n.id: n.display_name for n in nodes} == expected
+        assert len(ctx) == 0
+
+    def test_queries_do_not_grow(self, asset_model: AssetModel) -> None:
+        with CaptureQueriesContext(connection) as before:
+            assets = list(Asset.objects.prefetch_related(*asset_lookups()))
+            [a.display_name for a in assets]
+
+        for i in range(10):
+            Asset.objects.create(asset_model=asset_model).assetcode_set.create(code_type="A", code=f"new-{i}")
+
+        with CaptureQueriesContext(connection) as after:
+            assets = list(Asset.objects.prefetch_related(*asset_lookups()))
+            [a.display_name for a in assets]
+        assert len(after) == len(before)
+
+
+def test_prefix_lookups() -> None:
+    prefetch = Prefetch("node", queryset=Node.objects.all())
+    lookups = prefix_lookups("asset", ["assetcode_set", prefetch])
+    assert lookups[0] == "asset__assetcode_set"
+    assert isinstance(lookups[1], Prefetch)
+    assert getattr(lookups[1], "prefetch_to") == "asset__node"
+    assert getattr(prefetch, "prefetch_to") == "node"
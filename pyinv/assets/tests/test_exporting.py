@@ -0,0 +1,62 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from assets import exporting
+from assets.exporting import srobo_export
+from assets.models import Asset, AssetModel, Node
+
+
+def _export() -> List[Dict[str, Any]]:
+    return list(json.loads("".join(srobo_export())).values())
+
+
+@pytest.mark.django_db
+class TestSroboExport:
+
+    def test_empty(self) -> None:
+        assert _export() == [{"type": "location", "data": ["unknown-location", "."]}]
+
+    def test_export(self, asset_model: AssetModel, container_model: AssetModel) -> None:
+        hq = Node.add_root(node_type="L", name="hq")
+        shelf = hq.add_child(node_type="L", name="shelf")
+        container = Asset.objects.create(asset_model=container_model, extra_data={"colour": "red"})
+        container.assetcode_set.create(code_type="A", code="container-code")
+        container.assetcode_set.create(code_type="S", code="sr100X")
+        container_node = shelf.add_child(node_type="A", asset=container)
+        asset = Asset.objects.create(asset_model=asset_model)
+        asset.assetcode_set.create(code_type="A", code="asset-code")
+        container_node.add_child(node_type="A", asset=asset)
+        container_node.add_child(node_type="L", name="bag")
+        unplaced = Asset.objects.create(asset_model=asset_model)
+
+        assert _export() == [
+            {"type": "location", "data": ["unknown-location", "."]},
+            {"type": "location", "data": ["hq", "."]},
+            {"type": "location", "data": ["shelf", "hq"]},
+            {"type": "asset", "data": {
+                "asset_code": "sr100X", "asset_type": "Bar Model", "data": {"colour": "red"}, "location": "shelf",
+            }},
+            {"type": "asset", "data": {
+                "asset_code": "asset-code", "asset_type": "Foo Model", "data": {}, "location": "sr100X",
+            }},
+            # Locations inside assets are in the nearest location.
+            {"type": "location", "data": ["bag", "shelf"]},
+            {"type": "asset", "data": {
+                "asset_code": str(unplaced.id), "asset_type": "Foo Model", "data": {}, "location": "unknown-location",
+            }},
+        ]
+
+    def test_asset_at_root(self, asset: Asset) -> None:
+        Node.add_root(node_type="A", asset=asset)
+        assert _export()[1]["data"]["location"] == "unknown-location"
+
+    def test_chunks(self, monkeypatch: pytest.MonkeyPatch, asset_model: AssetModel) -> None:
+        monkeypatch.setattr(exporting, "OUTPUT_CHUNK_SIZE", 100)
+        hq = Node.add_root(node_type="L", name="hq")
+        for _ in range(5):
+            hq.add_child(node_type="A", asset=Asset.objects.create(asset_model=asset_model))
+        chunks = list(srobo_export())
+        assert len(chunks) > 3
+        assert len(json.loads("".join(chunks))) == 7
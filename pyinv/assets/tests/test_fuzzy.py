@@ -0,0 +1,86 @@
+from typing import List
+
+import pytest
+
+from assets import fuzzy
+from assets.fuzzy import TrigramIndex, fuzzy_search, similarity, trigrams
+from assets.models import Asset, AssetCode, AssetModel, InventoryVersion, Node
+
+
+def fuzzy_assets(query: str) -> List[Asset]:
+    return list(fuzzy_search(Asset.objects.all(), query))
+
+
+def test_trigrams() -> None:
+    assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+    assert trigrams("a-b") == {"  a", " a ", "  b", " b "}
+    assert trigrams("--") == set()
+
+
+@pytest.mark.parametrize("a,b,expected", [
+    ("word", "two words", 4 / 11),  # The example in the pg_trgm documentation
+    ("SRABC", "SR-ABC", 4 / 9),
+    ("INV-12A", "INV-I2A", 5 / 10),
+    ("abc", "xyz", 0.0),
+    ("", "abc", 0.0),
+])
+def test_similarity(a: str, b: str, expected: float) -> None:
+    assert similarity(a, b) == pytest.approx(expected)
+
+
+def test_trigram_index() -> None:
+    index = TrigramIndex([("SR-ABC", 1), ("SR-XYZ", 2), ("INV-12A", 3), ("SRABC", 1)])
+    assert index.search("SRABC") == {1: 1.0}
+    assert index.search("INV-I2A") == {3: pytest.approx(0.5)}
+    assert index.search("SR-XY", threshold=0.1).keys() == {1, 2}
+
+
+@pytest.mark.django_db
+class TestFuzzySearch:
+
+    @pytest.fixture
+    def assets(self, asset_model: AssetModel, location: Node) -> List[Asset]:
+        assets = [Asset.objects.create(asset_model=asset_model) for _ in range(3)]
+        assets[0].assetcode_set.create(code_type="A", code="SR-ABC")
+        assets[1].assetcode_set.create(code_type="A", code="INV-12A")
+        location.add_child(node_type="A", asset=assets[2], name="Toolbox")
+        return assets
+
+    def test_by_code(self, assets: List[Asset]) -> None:
+        assert fuzzy_assets("SRABC") == [assets[0]]
+        assert fuzzy_assets("INV-I2A") == [assets[1]]
+
+    def test_by_node_name(self, assets: List[Asset]) -> None:
+        assert fuzzy_assets("tolbox") == [assets[2]]
+
+    def test_by_asset_model_name(self, assets: List[Asset], container: Asset) -> None:
+        results = fuzzy_assets("Bar Model")
+        assert results[0] == container
+        # The other assets share "Model", so are less similar candidates.
+        assert set(results[1:]) == set(assets)
+        assert getattr(results[0], "similarity") > getattr(results[1], "similarity")
+
+    def test_index_follows_changes(self, assets: List[Asset]) -> None:
+        assert fuzzy_assets("SR-DEF") == []
+        assets[1].assetcode_set.create(code_type="A", code="SR-DEF")
+        assert fuzzy_assets("SR-DEF") == [assets[1]]
+
+    @pytest.mark.usefixtures("assets")
+    def test_no_match(self) -> None:
+        assert fuzzy_assets("bees") == []
+
+    def test_index_checks_version(self, assets: List[Asset]) -> None:
+        assert fuzzy_assets("SR-ABC") == [assets[0]]
+        # As changed by another process, without signals in this one.
+        AssetCode.objects.filter(code="SR-ABC").update(code="SR-DEF")
+        InventoryVersion.bump()
+        assert fuzzy_assets("SR-ABC") == []
+        assert fuzzy_assets("SR-DEF") == [assets[0]]
+
+    def test_candidates_limited(self, monkeypatch: pytest.MonkeyPatch, asset_model: AssetModel) -> None:
+        monkeypatch.setattr(fuzzy, "MAX_CANDIDATES", 2)
+        assets = Asset.objects.bulk_create([Asset(asset_model=asset_model) for _ in range(4)])
+        for asset, code in zip(assets, ["SR-ABCD", "SR-ABC", "SR-ABCDE", "SR-AB"]):
+            asset.assetcode_set.create(code_type="A", code=code)
+        assert fuzzy_assets("SR-ABC")[:2] == [assets[1], assets[0]]
+        assert len(fuzzy_assets("SR-ABC")) == 2
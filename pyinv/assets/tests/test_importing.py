@@ -0,0 +1,66 @@
+import json
+from io import StringIO
+from typing import Any
+
+import pytest
+
+from assets.importing import (
+    ImportStats,
+    JSONObjectReader,
+    batches,
+    ordered_map,
+)
+
+DATA = {
+    "0": {"type": "location", "data": ["hq", "."]},
+    "1": {"type": "asset", "data": {"asset_code": "sr1VBC", "location": "hq", "data": {"weight": 12.5}}},
+    "2": 123456789,
+    "3": 'a string with "quotes", {braces} and \u00e9',
+    "4": [],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_object_reader(chunk_size: int, indent: Any) -> None:
+    text = json.dumps(DATA, indent=indent)
+    assert list(JSONObjectReader(StringIO(text), chunk_size=chunk_size)) == list(DATA.items())
+
+
+@pytest.mark.parametrize("text", ["{}", " { } "])
+def test_json_object_reader_empty(text: str) -> None:
+    assert list(JSONObjectReader(StringIO(text))) == []
+
+
+@pytest.mark.parametrize("text,error", [
+    ("[]", "Expecting '{', got '\\['"),
+    ('{"a": 1', "Expecting ',' or '}', got 'end of file'"),
+    ('{"a" 1}', "Expecting ':', got '1'"),
+    ('{1: 1}', "Expecting a string key, got 1"),
+    ('{"a": [1, }', "Expecting value"),
+])
+def test_json_object_reader_invalid(text: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        list(JSONObjectReader(StringIO(text), chunk_size=2))
+
+
+def test_batches() -> None:
+    assert list(batches(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(batches([], 3)) == []
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_ordered_map(jobs: int) -> None:
+    assert list(ordered_map(str, range(50), jobs=jobs, lookahead=2)) == [str(i) for i in range(50)]
+
+
+def test_ordered_map_error() -> None:
+    with pytest.raises(ValueError):
+        list(ordered_map(int, ["1", "a", "3"], jobs=2))
+
+
+def test_import_stats() -> None:
+    stats = ImportStats()
+    stats.records = 10
+    assert stats.peak_memory > 0
+    assert str(stats).startswith("10 records in ")
@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from assets import reference_data
+from assets.display_names import asset_lookups, node_lookups
+from assets.models import (
+    Asset,
+    AssetModel,
+    InventoryVersion,
+    Manufacturer,
+    Node,
+)
+
+
+# The changes made by each test are committed, as the cache is only cleared on commit.
+@pytest.mark.django_db(transaction=True)
+class TestReferenceData:
+
+    def test_get(self, asset_model: AssetModel) -> None:
+        assert reference_data.get_asset_model(asset_model.pk) == asset_model
+        assert reference_data.get_manufacturer(asset_model.manufacturer_id) == asset_model.manufacturer
+        assert reference_data.get_by_slug(AssetModel, "foo-model") == asset_model
+        assert reference_data.get_by_slug(Manufacturer, "foo") == asset_model.manufacturer
+        assert reference_data.get_by_slug(Manufacturer, "bees") is None
+
+    def test_get_missing(self, asset_model: AssetModel) -> None:
+        with pytest.raises(AssetModel.DoesNotExist):
+            reference_data.get_asset_model(asset_model.manufacturer_id)
+        with pytest.raises(Manufacturer.DoesNotExist):
+            reference_data.get_manufacturer(asset_model.pk)
+
+    def test_cached(self, asset_model: AssetModel) -> None:
+        reference_data.check()
+        with CaptureQueriesContext(connection) as ctx:
+            cached = reference_data.get_asset_model(asset_model.pk)
+            assert cached.manufacturer == asset_model.manufacturer
+            assert reference_data.get_by_slug(AssetModel, "foo-model") is cached
+        assert len(ctx) == 0
+
+    def test_checked_once(self, asset_model: AssetModel) -> None:
+        reference_data.check()
+        reference_data.expire()
+        with CaptureQueriesContext(connection) as ctx:
+            reference_data.get_asset_model(asset_model.pk)
+            reference_data.get_asset_model(asset_model.pk)
+        # Only the reference version is read, as it has not changed.
+        assert len(ctx) == 1
+
+    def test_cleared_by_writes(self, asset_model: AssetModel) -> None:
+        reference_data.check()
+        asset_model.name = "New Name"
+        asset_model.save()
+        assert reference_data.get_asset_model(asset_model.pk).name == "New Name"
+
+        asset_model.delete()
+        assert reference_data.get_by_slug(AssetModel, "foo-model") is None
+
+    def test_uncommitted_changes_not_cached(self, asset_model: AssetModel) -> None:
+        reference_data.check()
+        with transaction.atomic():
+            asset_model.name = "New Name"
+            asset_model.save()
+            assert reference_data.get_asset_model(asset_model.pk).name == "New Name"
+            transaction.set_rollback(True)
+        assert reference_data.get_asset_model(asset_model.pk).name == "Foo Model"
+
+        reference_data.expire()
+        assert reference_data.get_asset_model(asset_model.pk).name == "Foo Model"
+
+    def test_cleared_on_commit(self, asset_model: AssetModel) -> None:
+        reference_data.check()
+        with transaction.atomic():
+            asset_model.name = "New Name"
+            asset_model.save()
+            reference_data.check()
+        assert reference_data.get_asset_model(asset_model.pk).name == "New Name"
+
+    def test_reloaded_by_other_process(self, asset_model: AssetModel) -> None:
+        reference_data.check()
+        # Changes in another process only increase the shared reference version.
+        AssetModel.objects.filter(pk=asset_model.pk).update(name="New Name")
+        InventoryVersion.bump(reference=True)
+        assert reference_data.get_asset_model(asset_model.pk).name == "Foo Model"
+
+        reference_data.expire()
+        assert reference_data.get_asset_model(asset_model.pk).name == "New Name"
+
+    def test_reloaded_when_missing(self, manufacturer: Manufacturer) -> None:
+        reference_data.check()
+        asset_model = AssetModel(name="New Model", manufacturer=manufacturer)
+        AssetModel.objects.bulk_create([asset_model])
+        InventoryVersion.bump(reference=True)
+        assert reference_data.get_asset_model(asset_model.pk).name == "New Model"
+
+    def test_prefetch_related_objects(self, asset: Asset, container_with_child: Asset) -> None:
+        nodes = list(Node.objects.all())
+        assets = list(Asset.objects.all())
+        reference_data.check()
+        with CaptureQueriesContext(connection) as ctx:
+            reference_data.prefetch_related_objects(nodes, *node_lookups())
+            reference_data.prefetch_related_objects(assets, *asset_lookups(), 'asset_model__manufacturer')
+        # The nodes of the assets, and their codes, but not the asset models.
+        assert len(ctx) == 5
+
+        expected = {a.id: a.display_name for a in Asset.objects.all()}
+        with CaptureQueriesContext(connection) as ctx:
+            assert {a.id: a.display_name for a in assets} == expected
+            assert {n.id: n.display_name for n in nodes}
+            assert {a.id: a.asset_model.manufacturer.name for a in assets}
+        assert len(ctx) == 0
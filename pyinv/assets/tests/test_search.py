@@ -0,0 +1,88 @@
+from typing import List
+
+import pytest
+
+from assets.models import Asset, AssetModel, Manufacturer, Node
+from assets.search import get_terms, refresh_assets, search
+
+
+def search_assets(query: str) -> List[Asset]:
+    return list(search(Asset.objects.all(), query))
+
+
+def search_nodes(query: str) -> List[Node]:
+    return list(search(Node.objects.all(), query))
+
+
+@pytest.mark.django_db
+class TestSearch:
+
+    def test_document(self, asset_with_code: Asset) -> None:
+        asset_with_code.refresh_from_db()
+        assert asset_with_code.search_document == "Foo Model foo-model Foo foo asset-code"
+
+    @pytest.mark.usefixtures("asset_with_code", "container")
+    def test_terms_match_word_prefixes(self) -> None:
+        assert len(search_assets("foo")) == 1
+        assert len(search_assets("asset-co")) == 1
+        assert len(search_assets("fo mod")) == 1
+        assert len(search_assets("model")) == 2
+        assert len(search_assets("odel")) == 0
+
+    @pytest.mark.usefixtures("asset_with_code", "container")
+    def test_terms_must_all_match(self) -> None:
+        assert len(search_assets("bar model")) == 1
+        assert len(search_assets("bar asset-code")) == 0
+
+    @pytest.mark.usefixtures("asset_with_code")
+    def test_no_terms(self) -> None:
+        assert len(search_assets("")) == 1
+        assert len(search_assets('" * -')) == 1
+
+    def test_asset_code_changes(self, asset: Asset) -> None:
+        code = asset.assetcode_set.create(code_type="A", code="new-code")
+        assert search_assets("new-code") == [asset]
+
+        code.delete()
+        assert search_assets("new-code") == []
+
+    def test_asset_model_rename(self, asset: Asset, asset_model: AssetModel) -> None:
+        asset_model.name = "Renamed"
+        asset_model.save()
+        assert search_assets("renamed") == [asset]
+
+    def test_manufacturer_rename(self, asset: Asset, manufacturer: Manufacturer) -> None:
+        manufacturer.name = "Wasps"
+        manufacturer.save()
+        assert search_assets("wasps") == [asset]
+
+    def test_node_rename(self, container_with_child: Asset) -> None:
+        node = container_with_child.node
+        node.name = "Toolbox"
+        node.save()
+        assert search_assets("toolbox") == [container_with_child]
+        assert search_nodes("toolbox") == [node]
+
+    def test_node_delete(self, location: Node, asset: Asset) -> None:
+        node = location.add_child(node_type="A", asset=asset, name="Shelf")
+        assert search_nodes("shelf") == [node]
+        assert search_assets("shelf") == [asset]
+
+        node.delete()
+        assert search_nodes("shelf") == []
+        assert search_assets("shelf") == []
+
+    def test_asset_delete(self, asset_with_code: Asset) -> None:
+        asset_with_code.delete()
+        assert search_assets("asset-code") == []
+
+    def test_refresh_after_bulk_update(self, asset: Asset, asset_model: AssetModel) -> None:
+        AssetModel.objects.filter(pk=asset_model.pk).update(name="Bulk")
+        assert search_assets("bulk") == []
+
+        refresh_assets(Asset.objects.all())
+        assert search_assets("bulk") == [asset]
+
+
+def test_get_terms() -> None:
+    assert get_terms('Foo-Bar "baz"* qux_1') == ["foo", "bar", "baz", "qux", "1"]
@@ -0,0 +1,118 @@
+import json
+from io import StringIO
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from assets import search
+from assets.models import Asset, AssetCode, AssetModel, Node
+
+ITEMS: List[Dict[str, Any]] = [
+    {"type": "location", "data": ["hq", "."]},
+    {"type": "location", "data": ["shelf", "hq"]},
+    {"type": "location", "data": ["unknown-location", "."]},
+    {"type": "location", "data": ["disposed-of", "."]},
+    {"type": "asset", "data": {"asset_code": "sr1VAE", "asset_type": "Box", "location": "shelf", "data": {}}},
+    {"type": "asset", "data": {"asset_code": "sr1VBC", "asset_type": "Widget", "location": "sr1VAE", "data": {}}},
+    # Before its container, so it is placed in the second pass.
+    {"type": "asset", "data": {"asset_code": "sr1VCA", "asset_type": "Widget", "location": "sr1XAC", "data": {}}},
+    {"type": "asset", "data": {"asset_code": "sr1XAC", "asset_type": "Box", "location": "hq", "data": {}}},
+    {
+        "type": "asset",
+        "data": {"asset_code": "sr1VD8", "asset_type": "Gizmo", "location": "unknown-location", "data": {"n": 1}},
+    },
+    {"type": "asset", "data": {"asset_code": "sr1XBA", "asset_type": "Widget", "location": "disposed-of", "data": {}}},
+]
+
+
+def write_inventory(path: Path, items: List[Dict[str, Any]]) -> Path:
+    path.write_text(json.dumps({str(i): item for i, item in enumerate(items)}))
+    return path
+
+
+def srobo_import(data_file: Path, *args: str) -> str:
+    output = StringIO()
+    call_command("srobo_import", str(data_file), *args, stdout=output)
+    return output.getvalue()
+
+
+def tree() -> List[Tuple[int, str]]:
+    """The depth and label of each node, in path order."""
+    return [
+        (node.depth, node.name if node.asset_id is None else node.asset.assetcode_set.get().code)
+        for node in Node.objects.order_by("path").select_related("asset")
+    ]
+
+
+@pytest.mark.django_db
+class TestSroboImport:
+
+    @pytest.fixture
+    def data_file(self, tmp_path: Path) -> Path:
+        return write_inventory(tmp_path / "inventory.json", ITEMS)
+
+    def test_import(self, data_file: Path) -> None:
+        output = srobo_import(data_file)
+        assert "Imported 5 assets, of which 1 are not in the tree. Skipped 1 assets that were disposed of." in output
+
+        assert tree() == [
+            (1, "hq"),
+            (2, "shelf"),
+            (3, "sr1VAE"),
+            (4, "sr1VBC"),
+            (2, "sr1XAC"),
+            (3, "sr1VCA"),
+        ]
+        assert Node.find_problems() == ([], [], [], [], [])
+
+        assert set(AssetCode.objects.values_list("code", "normalised_code", "code_type")) == {
+            (code, code[2:].upper(), "S") for code in ["sr1VAE", "sr1VBC", "sr1VCA", "sr1XAC", "sr1VD8"]
+        }
+        assert Asset.objects.get(assetcode__code="sr1VD8").extra_data == {"n": 1}
+        assert not Node.objects.filter(asset__assetcode__code="sr1VD8").exists()
+
+        assert set(AssetModel.objects.values_list("name", "slug", "is_container", "manufacturer__name")) == {
+            ("Box", "box", True, "Unknown"),
+            ("Widget", "widget", False, "Unknown"),
+            ("Gizmo", "gizmo", False, "Unknown"),
+        }
+
+    def test_search_documents(self, data_file: Path) -> None:
+        srobo_import(data_file)
+        assert list(search.search(Asset.objects.all(), "sr1VBC")) == [Asset.objects.get(assetcode__code="sr1VBC")]
+        assert search.search(Asset.objects.all(), "widget unknown").count() == 2
+        assert [node.name for node in search.search(Node.objects.all(), "shelf")] == ["shelf"]
+        assert list(search.search(Node.objects.all(), "gizmo")) == []
+        assert [node.asset.asset_model.name for node in search.search(Node.objects.all(), "sr1VCA")] == ["Widget"]
+
+    def test_existing_models(self, data_file: Path) -> None:
+        srobo_import(data_file)
+        models = set(AssetModel.objects.values_list("pk", flat=True))
+        write_inventory(data_file, [
+            {"type": "location", "data": ["store", "."]},
+            {"type": "asset", "data": {"asset_code": "sr1XC8", "asset_type": "Box", "location": "store", "data": {}}},
+        ])
+        srobo_import(data_file)
+        assert set(AssetModel.objects.values_list("pk", flat=True)) == models
+        assert [label for _, label in tree()][-2:] == ["store", "sr1XC8"]
+
+    def test_dry_run(self, data_file: Path) -> None:
+        output = srobo_import(data_file, "--dry-run")
+        assert "Would import 5 assets" in output
+        assert not Asset.objects.exists()
+        assert not AssetCode.objects.exists()
+        assert not AssetModel.objects.exists()
+        assert not Node.objects.exists()
+        assert list(search.search(Asset.objects.all(), "sr1VBC")) == []
+
+    def test_invalid_code(self, tmp_path: Path) -> None:
+        data_file = write_inventory(tmp_path / "inventory.json", [
+            {"type": "location", "data": ["hq", "."]},
+            {"type": "asset", "data": {"asset_code": "sr1VAA", "asset_type": "Box", "location": "hq", "data": {}}},
+        ])
+        with pytest.raises(CommandError, match="Asset code sr1VAA is not valid"):
+            srobo_import(data_file)
+        assert not Asset.objects.exists()
@@ -0,0 +1,156 @@
+import json
+from io import StringIO
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from assets.management.commands import srobo_import_history
+from assets.models import (
+    Asset,
+    AssetEvent,
+    AssetModel,
+    ChangeSet,
+    ImportCheckpoint,
+)
+
+CODES = ["sr1VAE", "sr1VBC", "sr1VCA"]
+
+FILES: List[Dict[str, Any]] = [
+    {"author_email": "a@example.com", "message": "Add", "dt": 1000, "changes": [
+        {"asset_code": code, "type": "added", "location": "hq"} for code in CODES
+    ]},
+    {"author_email": "b@example.com", "message": "Move", "dt": 2000, "changes": [
+        {"asset_code": "sr1VAE", "type": "move", "old": "hq", "new": "shelf"},
+        {"asset_code": "srUNKNOWN", "type": "move", "old": "hq", "new": "shelf"},
+    ]},
+    # The same author, message and time as the previous file, so the changes are in the same changeset.
+    {"author_email": "b@example.com", "message": "Move", "dt": 2000, "changes": [
+        {"asset_code": " sr1VBC ", "type": "move", "old": "hq", "new": "shelf"},
+    ]},
+    {"author_email": "a@example.com", "message": "Restore", "dt": 3000, "changes": [
+        {"asset_code": "sr1VCA", "type": "added", "location": "shelf"},
+    ]},
+    {"author_email": "a@example.com", "message": "Move back", "dt": 4000, "changes": [
+        {"asset_code": "sr1VCA", "type": "move", "old": "shelf", "new": "hq"},
+    ]},
+]
+
+History = List[Tuple[str, str, float, str, str, str]]
+
+
+def write_changes(data_dir: Path, files: List[Dict[str, Any]]) -> Path:
+    data_dir.mkdir(exist_ok=True)
+    for i, data in enumerate(files):
+        (data_dir / f"{i:04}.json").write_text(json.dumps(data))
+    return data_dir
+
+
+def import_history(data_dir: Path, *args: str) -> str:
+    output = StringIO()
+    call_command("srobo_import_history", str(data_dir), "--jobs", "1", *args, stdout=output)
+    return output.getvalue()
+
+
+def history() -> History:
+    """The events of each changeset, with its user, comment and time."""
+    return sorted(
+        (
+            event.changeset.user.username,
+            event.changeset.comment,
+            event.changeset.timestamp.timestamp(),
+            event.asset.assetcode_set.get().code,
+            event.event_type,
+            json.dumps(event.data, sort_keys=True),
+        )
+        for event in AssetEvent.objects.select_related("changeset__user", "asset")
+    )
+
+
+@pytest.mark.django_db
+class TestSroboImportHistory:
+
+    @pytest.fixture(autouse=True)
+    def assets(self, asset_model: AssetModel) -> None:
+        for code in CODES:
+            Asset.objects.create(asset_model=asset_model).assetcode_set.create(code_type="S", code=code)
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(srobo_import_history, "BATCH_SIZE", 2)
+        monkeypatch.setattr(srobo_import_history, "CHECKPOINT_INTERVAL", 2)
+
+    @pytest.fixture
+    def data_dir(self, tmp_path: Path) -> Path:
+        return write_changes(tmp_path / "changes", FILES)
+
+    def test_import(self, data_dir: Path) -> None:
+        output = import_history(data_dir)
+        assert "Imported 7 events in 4 new changesets" in output
+
+        assert history() == sorted([
+            ("a@example.com", "Add", 1000.0, "sr1VAE", "CR", '{"location": "hq"}'),
+            ("a@example.com", "Add", 1000.0, "sr1VBC", "CR", '{"location": "hq"}'),
+            ("a@example.com", "Add", 1000.0, "sr1VCA", "CR", '{"location": "hq"}'),
+            ("b@example.com", "Move", 2000.0, "sr1VAE", "MV", '{"new": "shelf", "old": "hq"}'),
+            ("b@example.com", "Move", 2000.0, "sr1VBC", "MV", '{"new": "shelf", "old": "hq"}'),
+            # An asset that is added again is restored, as a move.
+            ("a@example.com", "Restore", 3000.0, "sr1VCA", "MV", '{"new": "shelf", "old": null}'),
+            ("a@example.com", "Move back", 4000.0, "sr1VCA", "MV", '{"new": "hq", "old": "shelf"}'),
+        ])
+        assert ChangeSet.objects.count() == 4
+        assert ImportCheckpoint.objects.get().position == "0004.json"
+
+    def test_import_again(self, data_dir: Path) -> None:
+        import_history(data_dir)
+        expected = history()
+        import_history(data_dir)
+        assert history() == expected
+        assert ChangeSet.objects.count() == 4
+
+    def test_resume(self, data_dir: Path) -> None:
+        import_history(data_dir)
+        expected = history()
+        ChangeSet.objects.all().delete()
+
+        (data_dir / "0003.json").write_text("{")
+        with pytest.raises(CommandError, match="0003.json is not valid JSON"):
+            import_history(data_dir)
+        # The first chunk of files was imported.
+        assert ImportCheckpoint.objects.get().position == "0001.json"
+        assert ChangeSet.objects.count() == 2
+
+        write_changes(data_dir, FILES)
+        output = import_history(data_dir, "--resume")
+        assert "Resuming history import from 3 files" in output
+        assert history() == expected
+        assert ChangeSet.objects.count() == 4
+        assert ImportCheckpoint.objects.get().position == "0004.json"
+
+    def test_resume_without_import(self, data_dir: Path) -> None:
+        with pytest.raises(CommandError, match="There is no import"):
+            import_history(data_dir, "--resume")
+
+    def test_dry_run(self, data_dir: Path) -> None:
+        import_history(data_dir)
+        expected = history()
+        write_changes(data_dir, [*FILES, {"author_email": "c@example.com", "message": "More", "dt": 5000, "changes": [
+            {"asset_code": "sr1VAE", "type": "move", "old": "shelf", "new": "hq"},
+        ]}])
+
+        output = import_history(data_dir, "--dry-run")
+        assert "Would import 8 events in 5 new changesets" in output
+        assert history() == expected
+        assert ImportCheckpoint.objects.get().position == "0004.json"
+
+    def test_missing_field(self, data_dir: Path) -> None:
+        (data_dir / "0002.json").write_text(json.dumps({"message": "Move", "dt": 2000, "changes": []}))
+        with pytest.raises(CommandError, match="0002.json is missing the field 'author_email'"):
+            import_history(data_dir)
+
+    def test_invalid_file_in_worker(self, data_dir: Path) -> None:
+        (data_dir / "0003.json").write_text("{")
+        with pytest.raises(CommandError, match="0003.json is not valid JSON"):
+            call_command("srobo_import_history", str(data_dir), "--jobs", "2", stdout=StringIO())
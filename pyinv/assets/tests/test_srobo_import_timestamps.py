@@ -0,0 +1,71 @@
+from datetime import datetime
+from io import StringIO
+from typing import Dict, Tuple
+from uuid import uuid4
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from assets.models import Asset, AssetEvent, AssetModel, ChangeSet
+
+UNKNOWN_DATE = datetime.fromtimestamp(0, timezone.utc)
+
+
+def at(hour: int) -> datetime:
+    return datetime(2014, 3, 1, hour, tzinfo=timezone.utc)
+
+
+def import_timestamps(*args: str) -> str:
+    output = StringIO()
+    call_command("srobo_import_timestamps", *args, stdout=output)
+    return output.getvalue()
+
+
+@pytest.mark.django_db
+class TestSroboImportTimestamps:
+
+    @pytest.fixture
+    def assets(self, asset_model: AssetModel) -> Dict[str, Asset]:
+        return {name: Asset.objects.create(asset_model=asset_model) for name in ["early", "late", "no-history"]}
+
+    @pytest.fixture
+    def changesets(self, user: User, assets: Dict[str, Asset]) -> Dict[int, ChangeSet]:
+        changesets = {hour: ChangeSet.objects.create(user=user, comment="", timestamp=at(hour)) for hour in [9, 10, 11]}
+        for hour, name, event_type in [
+            (9, "early", AssetEvent.AssetEventType.CREATE),
+            (10, "early", AssetEvent.AssetEventType.MOVE),
+            (10, "late", AssetEvent.AssetEventType.CREATE),
+            (11, "late", AssetEvent.AssetEventType.MOVE),
+        ]:
+            AssetEvent.objects.create(changeset=changesets[hour], asset=assets[name], event_type=event_type, data={})
+        return changesets
+
+    def timestamps(self, assets: Dict[str, Asset]) -> Dict[str, Tuple[datetime, datetime]]:
+        timestamps = {}
+        for name, asset in assets.items():
+            asset.refresh_from_db()
+            timestamps[name] = (asset.created_at, asset.updated_at)
+        return timestamps
+
+    @pytest.mark.usefixtures("changesets")
+    def test_update(self, assets: Dict[str, Asset]) -> None:
+        assert "Updated the timestamps of 3 assets" in import_timestamps()
+        assert self.timestamps(assets) == {
+            "early": (at(9), at(10)),
+            "late": (at(10), at(11)),
+            # Assets without any history get a fallback date.
+            "no-history": (UNKNOWN_DATE, UNKNOWN_DATE),
+        }
+
+    def test_since(self, assets: Dict[str, Asset], changesets: Dict[int, ChangeSet]) -> None:
+        before = self.timestamps(assets)
+        assert "Updated the timestamps of 1 assets" in import_timestamps("--since", str(changesets[11].pk))
+        assert self.timestamps(assets) == {**before, "late": (at(10), at(11))}
+
+    def test_since_unknown_changeset(self) -> None:
+        changeset = uuid4()
+        with pytest.raises(CommandError, match=f"Changeset {changeset} does not exist"):
+            import_timestamps("--since", str(changeset))
@@ -1,5 +1,6 @@
 """API URLs for assets."""
 
+from django.urls import path
 from rest_framework.routers import SimpleRouter
 
 from .views import (
@@ -8,6 +9,7 @@ from .views import (
     assets,
     changesets,
     manufacturers,
+    metrics,
     nodes,
 )
 
@@ -19,4 +21,10 @@ router.register('changesets', changesets.ChangeSetViewSet, basename='changesets'
 router.register('manufacturers', manufacturers.ManufacturerViewSet, basename='manufacturers')
 router.register('nodes', nodes.NodeViewSet, basename='nodes')
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path(
+        'metrics/response-cache/',
+        metrics.ResponseCacheMetricsView.as_view(),
+        name='response-cache-metrics',
+    ),
+]
@@ -1,12 +1,14 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, viewsets
 
+from assets.fast_reads import AssetEventList, FastListMixin
 from assets.filtersets import AssetEventFilterSet
 from assets.models import AssetEvent
+from assets.response_cache import CachedResponseMixin
 from assets.serializers import AssetEventWithAssetSerializer
 
 
-class AssetEventViewSet(viewsets.ReadOnlyModelViewSet):
+class AssetEventViewSet(CachedResponseMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """Fetch information about asset events."""
 
     # Require user to be logged in and have permissions, as this endpoint
@@ -15,9 +17,11 @@ class AssetEventViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = AssetEvent.objects.all()
     serializer_class = AssetEventWithAssetSerializer
+    fast_list_class = AssetEventList
     filterset_class = AssetEventFilterSet
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     ordering_fields = ['changeset__timestamp']
+    keyset_ordering = ['changeset__timestamp', 'id']
     search_fields = [
         'changeset__comment',
     ]
@@ -4,27 +4,36 @@ from rest_framework import filters, viewsets
 
 from assets.filtersets import AssetModelFilterSet
 from assets.models import AssetModel
+from assets.response_cache import CachedResponseMixin
 from assets.serializers import AssetModelSerializer
+from assets.serializers.sparse import SparseModelSerializer
 from pyinv.api_exceptions import UnableToDelete
 
 
-class AssetModelViewSet(viewsets.ModelViewSet):
+class AssetModelViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """Fetch information about asset models."""
 
     lookup_field = "slug"
     serializer_class = AssetModelSerializer
     filterset_class = AssetModelFilterSet
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    ordering_fields = ['name', 'asset_count', 'created_at', 'updated_at']
+    ordering_fields = ['name', 'display_name', 'asset_count', 'created_at', 'updated_at']
+    keyset_ordering = ['name', 'id']
     search_fields = [
         'name',
+        'display_name',
         'slug',
         'manufacturer__name',
         'manufacturer__slug',
     ]
 
     def get_queryset(self) -> query.QuerySet[AssetModel]:
-        return AssetModel.objects.annotate(asset_count=Count('asset')).all()
+        queryset = AssetModel.objects.annotate(asset_count=Count('asset')).all()
+        serializer = self.get_serializer()
+        assert isinstance(serializer, SparseModelSerializer)
+        if {'manufacturer', 'manufacturer_slug'} & set(serializer.rendered_fields):
+            queryset = queryset.select_related('manufacturer')
+        return queryset
 
     def perform_destroy(self, instance: AssetModel) -> None:
         try:
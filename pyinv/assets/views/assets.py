@@ -1,24 +1,131 @@
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, viewsets
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import (
+    filters,
+    permissions,
+    request,
+    response,
+    status,
+    views,
+    viewsets,
+)
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 
+from assets.code_generation import assign_new_codes, reserve_codes
+from assets.code_resolution import resolve_codes
+from assets.exporting import srobo_export
+from assets.fast_reads import AssetList, FastListMixin
 from assets.filtersets import AssetFilterSet
 from assets.models import Asset
-from assets.serializers import AssetWithNodeSerializer
+from assets.response_cache import CachedResponseMixin
+from assets.search import SearchDocumentFilter
+from assets.serializers import (
+    AssetCodeGenerationSerializer,
+    AssetWithNodeSerializer,
+    GeneratedAssetCodeSerializer,
+    ResolvedAssetCodeSerializer,
+)
+from assets.serializers.sparse import FieldSelection
 
+MAX_RESOLVE_CODES = 500
 
-class AssetViewSet(viewsets.ReadOnlyModelViewSet):
+
+class CanAddAssetCodes(permissions.BasePermission):
+    """Generating codes adds asset codes, rather than assets."""
+
+    def has_permission(self, request: request.Request, view: views.APIView) -> bool:
+        return request.user.is_authenticated and request.user.has_perm('assets.add_assetcode')
+
+
+class AssetViewSet(CachedResponseMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """Fetch information about assets."""
 
     queryset = Asset.objects.all()
     serializer_class = AssetWithNodeSerializer
+    fast_list_class = AssetList
     filterset_class = AssetFilterSet
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchDocumentFilter, filters.OrderingFilter]
     ordering_fields = ['created_at', 'updated_at']
-    search_fields = [
-        'asset_model__name',
-        'asset_model__slug',
-        'asset_model__manufacturer__name',
-        'asset_model__manufacturer__slug',
-        'node__name',
-        'assetcode__code',
-    ]
+    keyset_ordering = ['created_at', 'id']
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'code',
+                str,
+                many=True,
+                required=True,
+                description=f"An asset code or asset ID to resolve. Up to {MAX_RESOLVE_CODES} may be given.",
+            ),
+        ],
+        responses=ResolvedAssetCodeSerializer(many=True),
+        filters=False,
+    )
+    @action(detail=False, filter_backends=[], pagination_class=None)
+    def resolve(self, request: request.Request) -> response.Response:
+        """Resolve scanned asset codes to assets, in the order given."""
+        codes = request.query_params.getlist('code')
+        if not codes:
+            raise ValidationError({'code': "At least one code is required."})
+        if len(codes) > MAX_RESOLVE_CODES:
+            raise ValidationError({'code': f"At most {MAX_RESOLVE_CODES} codes can be resolved at once."})
+
+        selection = FieldSelection.from_request(request)
+        selection.check(['code', 'asset'])
+        resolved = resolve_codes(codes, selection.nested('asset'), self.inventory_version)
+        rows = [{'code': code, 'asset': resolved[code.strip()]} for code in codes]
+        return response.Response([{key: value for key, value in row.items() if selection.selects(key)} for row in rows])
+
+    @extend_schema(
+        request=AssetCodeGenerationSerializer,
+        responses={201: GeneratedAssetCodeSerializer(many=True)},
+        filters=False,
+    )
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='generate-codes',
+        permission_classes=[CanAddAssetCodes],
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def generate_codes(self, request: request.Request) -> response.Response:
+        """
+        Generate asset codes in bulk, for printing labels.
+
+        Codes are either assigned to the given assets, or reserved to be assigned later.
+        Use `?format=csv` for CSV.
+        """
+        serializer = AssetCodeGenerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            if 'assets' in data:
+                rows = [
+                    {'code': asset_code.code, 'asset': asset_code.asset_id}
+                    for asset_code in assign_new_codes(data['code_type'], data['assets'], prefix=data.get('prefix'))
+                ]
+            else:
+                rows = [
+                    {'code': code, 'asset': None}
+                    for code in reserve_codes(data['code_type'], data['count'], prefix=data.get('prefix'))
+                ]
+        except ValueError as e:
+            raise ValidationError(str(e))
+        return response.Response(
+            GeneratedAssetCodeSerializer(rows, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(responses={(200, 'application/json'): OpenApiTypes.OBJECT}, filters=False)
+    @action(detail=False, url_path='srobo-export', filter_backends=[], pagination_class=None)
+    def srobo_export(self, request: request.Request) -> StreamingHttpResponse:
+        """
+        Export the whole inventory in Student Robotics JSON format, as read by the srobo_import command.
+
+        The response is streamed, so it starts straight away, even for large inventories.
+        """
+        return StreamingHttpResponse(srobo_export(), content_type='application/json')
@@ -1,3 +1,5 @@
+from typing import List
+
 from django.db.models import Count, query
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, request, response, viewsets
@@ -5,13 +7,14 @@ from rest_framework.decorators import action
 
 from assets.filtersets import ChangeSetFilterSet
 from assets.models import ChangeSet
+from assets.response_cache import CachedResponseMixin
 from assets.serializers import (
     AssetEventTimelineSerializer,
     ChangeSetSerializerWithCountSerializer,
 )
 
 
-class ChangeSetViewSet(viewsets.ReadOnlyModelViewSet):
+class ChangeSetViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """Fetch information about asset events."""
 
     # Require user to be logged in and have permissions, as this endpoint
@@ -26,6 +29,12 @@ class ChangeSetViewSet(viewsets.ReadOnlyModelViewSet):
         'comment',
     ]
 
+    @property
+    def keyset_ordering(self) -> List[str]:
+        if self.action == 'events':
+            return ['id']
+        return ['timestamp', 'id']
+
     def get_queryset(self) -> query.QuerySet[ChangeSet]:
         """Enable sorting by event_count."""
         return ChangeSet.objects.annotate(event_count=Count('assetevent')).all()
@@ -2,11 +2,12 @@ from django.db.models import ProtectedError
 from rest_framework import filters, viewsets
 
 from assets.models import Manufacturer
+from assets.response_cache import CachedResponseMixin
 from assets.serializers import ManufacturerSerializer
 from pyinv.api_exceptions import UnableToDelete
 
 
-class ManufacturerViewSet(viewsets.ModelViewSet):
+class ManufacturerViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """Fetch information about manufacturers."""
 
     queryset = Manufacturer.objects.all()
@@ -14,6 +15,7 @@ class ManufacturerViewSet(viewsets.ModelViewSet):
     serializer_class = ManufacturerSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     ordering_fields = ["name", "slug", 'created_at', 'updated_at']
+    keyset_ordering = ['name', 'id']
     search_fields = ["name", "slug"]
 
     def perform_destroy(self, instance: Manufacturer) -> None:
@@ -0,0 +1,15 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions, request, response, views
+
+from assets import response_cache
+from assets.serializers import ResponseCacheStatsSerializer
+
+
+class ResponseCacheMetricsView(views.APIView):
+    """Report the hits, misses and time saved by the shared response cache."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(responses=ResponseCacheStatsSerializer)
+    def get(self, request: request.Request) -> response.Response:
+        return response.Response(ResponseCacheStatsSerializer(response_cache.get_stats()).data)
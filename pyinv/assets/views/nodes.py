@@ -1,24 +1,75 @@
+from django.contrib.auth.models import User
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, mixins, viewsets
+from drf_spectacular.utils import extend_schema
+from rest_framework import (
+    filters,
+    mixins,
+    permissions,
+    request,
+    response,
+    status,
+    viewsets,
+)
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from treebeard.exceptions import InvalidMoveToDescendant, PathOverflow
 
+from assets.fast_reads import FastListMixin, NodeList
 from assets.filtersets import NodeFilterSet
 from assets.models import Node
-from assets.serializers import NodeSerializer
+from assets.moves import move_into
+from assets.response_cache import CachedResponseMixin
+from assets.search import SearchDocumentFilter
+from assets.serializers import (
+    ChangeSetSerializerWithCountSerializer,
+    NodeMoveSerializer,
+    NodeSerializer,
+)
 
 
-class NodeViewSet(mixins.UpdateModelMixin, viewsets.ReadOnlyModelViewSet):
+class CanMoveNodes(permissions.DjangoModelPermissions):
+    """Moving nodes is a change to them, despite using POST."""
+
+    perms_map = {
+        **permissions.DjangoModelPermissions.perms_map,
+        'POST': ['%(app_label)s.change_%(model_name)s'],
+    }
+
+
+class NodeViewSet(CachedResponseMixin, FastListMixin, mixins.UpdateModelMixin, viewsets.ReadOnlyModelViewSet):
     """Fetch information about nodes."""
 
     queryset = Node.objects.all()
     serializer_class = NodeSerializer
+    fast_list_class = NodeList
     filterset_class = NodeFilterSet
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchDocumentFilter, filters.OrderingFilter]
     ordering_fields = ['name', 'created_at', 'updated_at', 'numchild', 'depth']
-    search_fields = [
-        'name',
-        'asset__asset_model__name',
-        'asset__asset_model__slug',
-        'asset__asset_model__manufacturer__name',
-        'asset__asset_model__manufacturer__slug',
-        'asset__assetcode__code',
-    ]
+    keyset_ordering = ['path']
+
+    @extend_schema(
+        request=NodeMoveSerializer,
+        responses={201: ChangeSetSerializerWithCountSerializer},
+        filters=False,
+    )
+    @action(
+        detail=False,
+        methods=['post'],
+        permission_classes=[CanMoveNodes],
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def move(self, request: request.Request) -> response.Response:
+        """Move nodes and assets into a node, recording the moves in a single changeset."""
+        serializer = NodeMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        assert isinstance(request.user, User)  # Anonymous users do not have permission
+        try:
+            changeset = move_into(user=request.user, **serializer.validated_data)
+        except (InvalidMoveToDescendant, PathOverflow) as e:
+            # The tree may have changed since the move was validated.
+            raise ValidationError(str(e))
+        return response.Response(
+            ChangeSetSerializerWithCountSerializer(changeset).data,
+            status=status.HTTP_201_CREATED,
+        )
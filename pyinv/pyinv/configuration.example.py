@@ -44,6 +44,17 @@ ADMINS: List[Tuple[str, str]] = [
     # ('John Doe', 'jdoe@example.com'),
 ]
 
+# Cache configuration. See the Django documentation for a complete list of available backends:
+#   https://docs.djangoproject.com/en/stable/topics/cache/
+# The default keeps a separate cache in each process. Use a shared backend, such as the file based cache or Redis, to
+# share cached API responses between processes.
+# CACHES = {
+#     'default': {
+#         'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#         'LOCATION': '/var/tmp/pyinv_cache',
+#     },
+# }
+
 # Base URL path if accessing PyInv within a directory. For example, if installed at https://example.com/pyinv/, set:
 # BASE_PATH = 'pyinv/'
 BASE_PATH = ''
@@ -85,3 +96,16 @@ SHORT_DATETIME_FORMAT = 'Y-m-d H:i'
 # Settings for Damm 32 Asset Codes
 DAMM32_ASSET_CODE_DEFAULT_PREFIX = 'INV'
 DAMM32_ASSET_CODE_PREFIXES = ['INV']
+
+# The number of scanned asset codes to keep resolved in memory, in each process
+ASSET_CODE_CACHE_SIZE = 4096
+
+# The cache to keep rendered API responses in, and for how many seconds. A timeout of 0 disables the response cache.
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Render the lists of assets, nodes and asset events from values() rows instead of the serializers.
+FAST_READS = False
+
+# Pages of JSON with at least this many results are streamed in batches, and not cached. 0 disables streaming.
+JSON_STREAMING_THRESHOLD = 1000
@@ -0,0 +1,213 @@
+"""
+Pagination for the API.
+
+Offset pagination is used by default. Its cost grows with the offset, and every
+page runs an exact COUNT over the filtered queryset, so clients walking large
+collections can opt in to keyset pagination for a request with
+``?pagination=cursor``. Keyset pages are found by filtering on the ordering key
+of the last row of the previous page, so every page costs the same.
+
+A view declares a stable, unique ordering for keyset pagination with the
+``keyset_ordering`` attribute. Any ``?ordering=`` is ignored in keyset mode.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Model, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+
+CURSOR = 'cursor'
+EXACT = 'exact'
+ESTIMATE = 'estimate'
+
+
+def estimate_count(queryset: QuerySet[Any]) -> int:
+    """
+    Estimate the number of rows in a queryset from the query planner.
+
+    Only PostgreSQL exposes a cheap estimate, other databases are counted exactly.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count()
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class PyInvPagination(LimitOffsetPagination):
+    """Limit / offset pagination, with opt-in keyset pagination and estimated counts."""
+
+    pagination_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet[Any],
+        request: Request,
+        view: Optional[APIView] = None,
+    ) -> Optional[List[Any]]:
+        self.count_mode = request.query_params.get(self.count_query_param)
+        self.use_keyset = (
+            request.query_params.get(self.pagination_query_param) == CURSOR
+            or self.cursor_query_param in request.query_params
+        )
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None  # pragma: nocover
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(getattr(view, 'keyset_ordering', ('pk',)))
+        self.count = self.get_count(queryset) if self.count_mode in (EXACT, ESTIMATE) else None
+
+        cursor = self._decode_cursor(request)
+        reverse = cursor is not None and cursor['reverse']
+        ordering = [self._reverse_field(f) for f in self.ordering] if reverse else list(self.ordering)
+
+        queryset = queryset.order_by(*ordering)
+        try:
+            if cursor is not None:
+                queryset = queryset.filter(self._after(ordering, cursor['position']))
+            results = list(queryset[:self.limit + 1])
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.first_position = self._get_position(results[0]) if results else None
+        self.last_position = self._get_position(results[-1]) if results else None
+        return results
+
+    def get_count(self, queryset: Union[QuerySet[Any], Sequence[Any]]) -> int:
+        if self.count_mode == ESTIMATE and not isinstance(queryset, Sequence):
+            return estimate_count(queryset)
+        return super().get_count(queryset)
+
+    def get_paginated_response(self, data: List[Any]) -> Response:
+        if not self.use_keyset:
+            return super().get_paginated_response(data)
+
+        response: 'OrderedDict[str, Any]' = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.count is not None:
+            response['count'] = self.count
+            response.move_to_end('count', last=False)
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        paginated_schema = super().get_paginated_response_schema(schema)
+        paginated_schema['properties']['count']['nullable'] = True
+        return paginated_schema
+
+    def get_schema_operation_parameters(self, view: APIView) -> List[Dict[str, Any]]:
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.pagination_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "cursor" to use keyset pagination.',
+                'schema': {'type': 'string', 'enum': [CURSOR]},
+            },
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': (
+                    'Set to "estimate" to use an estimated count. '
+                    'Keyset pages only include a count if this is "exact" or "estimate".'
+                ),
+                'schema': {'type': 'string', 'enum': [EXACT, ESTIMATE]},
+            },
+        ]
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.use_keyset:
+            return super().get_next_link()
+        if not self.has_next or self.last_position is None:
+            return None
+        return self._encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.use_keyset:
+            return super().get_previous_link()
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self._encode_cursor(self.first_position, reverse=True)
+
+    def _get_position(self, instance: Union[Model, Mapping[str, Any]]) -> List[Any]:
+        position = []
+        for field in self.ordering:
+            if isinstance(instance, Mapping):
+                # A row from values(), which has the ordering fields under their lookups.
+                position.append(instance[field.lstrip('-')])
+                continue
+            value: Any = instance
+            for attr in field.lstrip('-').split(LOOKUP_SEP):
+                value = getattr(value, attr)
+            position.append(value)
+        return position
+
+    def _after(self, ordering: Sequence[str], position: Sequence[Any]) -> Q:
+        """Build a filter for rows after the position, comparing the ordering fields in turn."""
+        condition = Q()
+        for i, field in reversed(list(enumerate(ordering))):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            after = Q(**{f"{name}__{lookup}": position[i]})
+            if i < len(ordering) - 1:
+                after |= Q(**{name: position[i]}) & condition
+            condition = after
+        return condition
+
+    def _reverse_field(self, field: str) -> str:
+        return field[1:] if field.startswith('-') else f"-{field}"
+
+    def _encode_cursor(self, position: List[Any], *, reverse: bool) -> str:
+        # str() keeps full precision for timestamps, unlike DjangoJSONEncoder.
+        cursor = json.dumps({'position': position, 'reverse': reverse}, default=str)
+        encoded = urlsafe_b64encode(cursor.encode()).decode()
+        url = remove_query_param(self.base_url, self.pagination_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _decode_cursor(self, request: Request) -> Optional[Dict[str, Any]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode()))
+            if len(cursor['position']) != len(self.ordering) or not isinstance(cursor['reverse'], bool):
+                raise ValueError()
+        except (BinasciiError, TypeError, KeyError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return dict(cursor)
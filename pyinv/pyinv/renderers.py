@@ -0,0 +1,173 @@
+"""Additional renderers for the API."""
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from io import StringIO
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+_default = JSONEncoder().default
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Encode data as compact UTF-8 JSON, as DRF's JSONEncoder would.
+
+    UUIDs and datetimes are encoded by orjson itself, and the other types
+    that DRF supports, such as decimals and lazy strings, by its encoder.
+    Data that orjson cannot encode, such as integers over 64 bits, is
+    encoded by the json module instead.
+    """
+    try:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class StreamingRenderer(BaseRenderer, ABC):
+    """A renderer that can also render rows as they are read, for streaming responses."""
+
+    @abstractmethod
+    def render_stream(self, fieldnames: Sequence[str], batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+        """Render batches of rows with the given fields, yielding the output as it is ready."""
+        raise NotImplementedError  # pragma: nocover
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Render JSON with orjson, in the same compact form as DRF's JSONRenderer.
+
+    Indented JSON, as asked for by the browsable API, is rendered by DRF's
+    renderer, as orjson can only indent by two spaces.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return self._escape(dumps(data))
+
+    def render_chunks(self, data: Any, batch_size: int) -> Iterator[bytes]:
+        """
+        Render data as render would, yielding the output in pieces.
+
+        Lists, at the top level or as the values of a top level object such as
+        a page of results, are encoded batch_size items at a time.
+        """
+        if not isinstance(data, dict):
+            yield from self._render_value(data, batch_size)
+            return
+        if not data:
+            yield b'{}'
+            return
+        for index, (key, value) in enumerate(data.items()):
+            yield (b',' if index else b'{') + self._escape(dumps(str(key))) + b':'
+            yield from self._render_value(value, batch_size)
+        yield b'}'
+
+    def _render_value(self, value: Any, batch_size: int) -> Iterator[bytes]:
+        if not isinstance(value, list) or not value:
+            yield self._escape(dumps(value))
+            return
+        items = iter(value)
+        separator = b'['
+        while batch := list(islice(items, batch_size)):
+            # Each batch is encoded as a list, then joined to the others without its brackets.
+            yield separator + self._escape(dumps(batch))[1:-1]
+            separator = b','
+        yield b']'
+
+    def _escape(self, content: bytes) -> bytes:
+        # As in DRF's renderer, these separators are escaped so the JSON is also valid JavaScript.
+        return content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    Render a list of flat objects as CSV, with a header row of their keys.
+
+    Nested values are written as JSON. A single object, such as an error, is
+    written as one row.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'  # noqa: A003
+    charset = 'utf-8'
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        if data is None:
+            return b''
+        rows: List[Dict[str, Any]] = data if isinstance(data, list) else [data]
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        return self._write(fieldnames, rows, header=True)
+
+    def render_stream(self, fieldnames: Sequence[str], batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+        # The header is sent before the first row is read.
+        yield self._write(fieldnames, [], header=True)
+        for rows in batches:
+            yield self._write(fieldnames, rows, header=False)
+
+    def _write(self, fieldnames: Sequence[str], rows: List[Dict[str, Any]], *, header: bool) -> bytes:
+        output = StringIO()
+        writer = csv.DictWriter(output, fieldnames, lineterminator='\n')
+        if header:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow({key: self._cell(value) for key, value in row.items()})
+        return output.getvalue().encode(self.charset)
+
+    def _cell(self, value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return value
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Render a list of objects as newline delimited JSON, one object per line."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'  # noqa: A003
+    charset = None
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        if data is None:
+            return b''
+        return self._write(data if isinstance(data, list) else [data])
+
+    def render_stream(self, fieldnames: Sequence[str], batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+        for rows in batches:
+            yield self._write(rows)
+
+    def _write(self, rows: List[Any]) -> bytes:
+        return b''.join(dumps(row) + b'\n' for row in rows)
@@ -78,6 +78,17 @@ DATABASES = {
 }
 
 
+#
+# Caching
+#
+
+CACHES = getattr(configuration, 'CACHES', {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+})
+
+
 #
 # Email
 #
@@ -107,6 +118,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third Party
     "corsheaders",
@@ -207,8 +219,12 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': [
+        'pyinv.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'pyinv.pagination.PyInvPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
 }
@@ -228,3 +244,16 @@ SIMPLE_JWT = {
 
 DAMM32_ASSET_CODE_DEFAULT_PREFIX = getattr(configuration, 'DAMM32_ASSET_CODE_DEFAULT_PREFIX', 'INV')
 DAMM32_ASSET_CODE_PREFIXES = getattr(configuration, 'DAMM32_ASSET_CODE_PREFIXES', ['INV'])
+
+# The number of scanned asset codes to keep resolved in memory, in each process
+ASSET_CODE_CACHE_SIZE = getattr(configuration, 'ASSET_CODE_CACHE_SIZE', 4096)
+
+# The cache to keep rendered API responses in, and for how many seconds. A timeout of 0 disables the response cache.
+RESPONSE_CACHE_ALIAS = getattr(configuration, 'RESPONSE_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TIMEOUT = getattr(configuration, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+# Render the lists of assets, nodes and asset events from values() rows instead of the serializers.
+FAST_READS = getattr(configuration, 'FAST_READS', False)
+
+# Pages of JSON with at least this many results are streamed in batches, and not cached. 0 disables streaming.
+JSON_STREAMING_THRESHOLD = getattr(configuration, 'JSON_STREAMING_THRESHOLD', 1000)
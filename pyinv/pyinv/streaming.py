@@ -0,0 +1,93 @@
+"""
+Streaming exports of API lists.
+
+Reporting tools that want a whole collection can ask for ``?format=csv`` or
+``?format=ndjson`` on the list endpoints of views using StreamingListMixin.
+The filtered queryset is then read with a server-side cursor and streamed as
+it is read, without pagination or a count, so the first byte is sent
+straight away. Rows are serialized in batches, so that each batch is
+prefetched in a constant number of queries.
+
+Rows are ordered by the ``keyset_ordering`` of the view, unless the request
+gives an ``?ordering=``.
+
+Pages of JSON with at least JSON_STREAMING_THRESHOLD results are also
+streamed, encoded BATCH_SIZE results at a time, so that a large ``?limit=``
+is not held in memory as one body as well as the rows.
+"""
+
+from itertools import islice
+from typing import Any, Dict, Iterator, List
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework import generics, mixins, serializers
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from pyinv.renderers import (
+    CSVRenderer,
+    NDJSONRenderer,
+    ORJSONRenderer,
+    StreamingRenderer,
+)
+
+BATCH_SIZE = 500
+
+
+class StreamingListMixin(mixins.ListModelMixin, generics.GenericAPIView):
+    """List the objects in a view as a stream of CSV or NDJSON rows, if either format is requested."""
+
+    def get_renderers(self) -> List[BaseRenderer]:
+        return [*super().get_renderers(), CSVRenderer(), NDJSONRenderer()]
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:  # noqa: A003
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, StreamingRenderer):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.ordered:
+            queryset = queryset.order_by(*getattr(self, 'keyset_ordering', ['pk']))
+        serializer = self.get_serializer()
+        assert isinstance(serializer, serializers.Serializer)  # Lists are of objects with fields
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f"; charset={renderer.charset}"
+        response = StreamingHttpResponse(
+            renderer.render_stream(
+                [str(field.field_name) for field in serializer._readable_fields],
+                self._serialize_batches(queryset),
+            ),
+            content_type=content_type,
+        )
+        # The response is not a DRF response, as it is not rendered in one go.
+        return response  # type: ignore[return-value]
+
+    def get_paginated_response(self, data: List[Any]) -> Response:
+        response = super().get_paginated_response(data)
+        renderer = self.request.accepted_renderer
+        threshold = settings.JSON_STREAMING_THRESHOLD
+        if (
+            not threshold
+            or len(data) < threshold
+            or not isinstance(renderer, ORJSONRenderer)
+            or renderer.get_indent(self.request.accepted_media_type, self.get_renderer_context())
+        ):
+            return response
+
+        streaming_response = StreamingHttpResponse(
+            renderer.render_chunks(response.data, BATCH_SIZE),
+            status=response.status_code,
+            content_type=renderer.media_type,
+        )
+        # The response is not a DRF response, as it is not rendered in one go.
+        return streaming_response  # type: ignore[return-value]
+
+    def _serialize_batches(self, queryset: QuerySet[Any]) -> Iterator[List[Dict[str, Any]]]:
+        rows = queryset.iterator(chunk_size=BATCH_SIZE)
+        while batch := list(islice(rows, BATCH_SIZE)):
+            yield self.get_serializer(batch, many=True).data
@@ -0,0 +1,90 @@
+import json
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from pyinv.renderers import (
+    NDJSONRenderer,
+    ORJSONRenderer,
+    StreamingRenderer,
+    dumps,
+)
+
+DATA = [
+    OrderedDict([
+        ("id", UUID("0a1b2c3d-0000-4000-8000-000000000000")),
+        ("utc", datetime(2022, 7, 1, 12, 30, 15, 250, tzinfo=timezone.utc)),
+        ("offset", datetime(2022, 7, 1, 12, 30, tzinfo=timezone(timedelta(hours=-4)))),
+        ("naive", datetime(2022, 7, 1, 12, 30)),
+        ("date", date(2022, 7, 1)),
+        ("duration", timedelta(minutes=90)),
+        ("price", Decimal("12.50")),
+        ("lazy", gettext_lazy("Asset")),
+        ("text", "café \u2028 \u2029 \"quoted\""),
+        ("nested", {"list": [1, 2.5, None, True], 3: "three"}),
+    ]),
+    {},
+    [],
+]
+
+
+class TestORJSONRenderer:
+
+    # orjson cannot encode integers over 64 bits, so they are encoded by the json module.
+    @pytest.mark.parametrize("data", [DATA, DATA[0], "text", None, {}, [], {"large": 2 ** 70}])
+    def test_same_as_drf(self, data: Any) -> None:
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent(self) -> None:
+        content = ORJSONRenderer().render(DATA, "application/json; indent=4")
+        assert content == JSONRenderer().render(DATA, "application/json; indent=4")
+        assert content.startswith(b'[\n    {\n        "id"')
+
+    @pytest.mark.parametrize("data", [
+        OrderedDict([("count", 5), ("next", None), ("results", list(range(5))), ("extra", [])]),
+        list(range(5)),
+        [],
+        {},
+        5,
+        DATA,
+        {"text": "\u2028", "results": DATA},
+    ])
+    @pytest.mark.parametrize("batch_size", [1, 2, 10])
+    def test_render_chunks(self, data: Any, batch_size: int) -> None:
+        renderer = ORJSONRenderer()
+        chunks = list(renderer.render_chunks(data, batch_size))
+        assert b"".join(chunks) == renderer.render(data)
+
+    def test_render_chunks_batches(self) -> None:
+        chunks = list(ORJSONRenderer().render_chunks({"results": list(range(5))}, 2))
+        assert chunks == [b'{"results":', b'[0,1', b',2,3', b',4', b']', b'}']
+
+
+class TestDumps:
+
+    def test_unsupported_type(self) -> None:
+        with pytest.raises(TypeError):
+            dumps({"object": object()})
+
+    def test_ndjson(self) -> None:
+        assert NDJSONRenderer().render(DATA).decode().split("\n") == [
+            *(json.dumps(row, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")) for row in DATA),
+            "",
+        ]
+
+
+class TestStreamingRenderer:
+
+    def test_requires_render_stream(self) -> None:
+        class IncompleteRenderer(StreamingRenderer):
+            media_type = "text/plain"
+
+        with pytest.raises(TypeError):
+            IncompleteRenderer()  # type: ignore[abstract]